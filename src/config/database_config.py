@@ -15,6 +15,7 @@ class DatabaseConfig:
         'database': 'sample_mflix',
         'username': '',
         'password': '',
+        'max_pool_size': 10,  # Sockets in the shared client's connection pool
     }
     RDF_CONFIG = {
     'endpoint': 'http://localhost:3030',
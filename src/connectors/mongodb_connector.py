@@ -5,16 +5,18 @@ Designed for use with sample_mflix database
 """
 
 from pymongo import MongoClient, ASCENDING, DESCENDING
+from pymongo.write_concern import WriteConcern
 from pymongo.errors import (
     ConnectionFailure, 
     ServerSelectionTimeoutError,
     OperationFailure,
     DuplicateKeyError
 )
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator
 from bson import ObjectId
 import sys
 import os
+import threading
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -22,21 +24,67 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import setup_logger
 from config.database_config import DatabaseConfig
 
+# One MongoClient per connection string, shared by every connector in the
+# process (each client has its own pool and monitor threads), with a count of
+# connectors using it so the last disconnect closes it
+_CLIENTS: Dict[str, MongoClient] = {}
+_CLIENT_REFS: Dict[str, int] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+def _acquire_client(connection_string: str, max_pool_size: int = 10) -> MongoClient:
+    """Get the shared client for connection_string, creating it on first use"""
+    with _CLIENTS_LOCK:
+        client = _CLIENTS.get(connection_string)
+        if client is None:
+            client = MongoClient(
+                connection_string,
+                maxPoolSize=max_pool_size,
+                minPoolSize=2,
+                maxIdleTimeMS=30000,
+                retryReads=True,
+                serverSelectionTimeoutMS=5000,  # 5 second timeout
+                connectTimeoutMS=10000,
+                socketTimeoutMS=10000
+            )
+            _CLIENTS[connection_string] = client
+            _CLIENT_REFS[connection_string] = 0
+        _CLIENT_REFS[connection_string] += 1
+        return client
+
+def _release_client(connection_string: str) -> bool:
+    """Drop one reference to the shared client, closing it after the last; True if closed"""
+    with _CLIENTS_LOCK:
+        if connection_string not in _CLIENTS:
+            return False
+        _CLIENT_REFS[connection_string] -= 1
+        if _CLIENT_REFS[connection_string] > 0:
+            return False
+        client = _CLIENTS.pop(connection_string)
+        del _CLIENT_REFS[connection_string]
+    client.close()
+    return True
+
 class MongoDBConnector:
     """MongoDB connection and operations handler"""
     
-    def __init__(self, connection_string: Optional[str] = None, database_name: Optional[str] = None):
+    def __init__(self, connection_string: Optional[str] = None, database_name: Optional[str] = None,
+                 fast_writes: bool = False):
         """
         Initialize MongoDB connector
         
         Args:
             connection_string: MongoDB URI (optional, uses config if not provided)
             database_name: Database name (optional, uses config if not provided)
+            fast_writes: Acknowledge writes from the primary only, without
+                waiting for the journal (for scratch/test data)
         """
         self.connection_string = connection_string or DatabaseConfig.get_mongodb_connection_string()
         self.database_name = database_name or DatabaseConfig.MONGODB_CONFIG['database']
+        # Size of the shared client's pool; the first connector for a URI sets it
+        self.max_pool_size = DatabaseConfig.get_mongodb_config().get('max_pool_size', 10)
         self.client = None
         self.db = None
+        self.fast_writes = fast_writes
         self.logger = setup_logger(__name__)
         
     def connect(self) -> bool:
@@ -49,13 +97,9 @@ class MongoDBConnector:
         try:
             self.logger.info(f"Connecting to MongoDB...")
             
-            # Create client with timeout
-            self.client = MongoClient(
-                self.connection_string,
-                serverSelectionTimeoutMS=5000,  # 5 second timeout
-                connectTimeoutMS=10000,
-                socketTimeoutMS=10000
-            )
+            # Reuse the process-wide client for this URI
+            if self.client is None:
+                self.client = _acquire_client(self.connection_string, self.max_pool_size)
             
             # Test connection with ping
             self.client.admin.command('ping')
@@ -68,20 +112,25 @@ class MongoDBConnector:
             
         except ConnectionFailure as e:
             self.logger.error(f"✗ Connection failed: {e}")
+            self.disconnect()
             return False
         except ServerSelectionTimeoutError as e:
             self.logger.error(f"✗ Server not reachable: {e}")
             self.logger.error("Make sure MongoDB Docker container is running!")
+            self.disconnect()
             return False
         except Exception as e:
             self.logger.error(f"✗ Unexpected error: {e}")
+            self.disconnect()
             return False
     
     def disconnect(self):
-        """Close MongoDB connection"""
+        """Release MongoDB connection (the shared client closes with its last user)"""
         if self.client:
-            self.client.close()
-            self.logger.info("MongoDB connection closed")
+            self.client = None
+            self.db = None
+            if _release_client(self.connection_string):
+                self.logger.info("MongoDB connection closed")
     
     def test_connection(self) -> bool:
         """
@@ -173,6 +222,12 @@ class MongoDBConnector:
     
     # ========== CRUD Operations ==========
     
+    def _write_collection(self, collection_name: str):
+        """Collection handle for writes, with w=1/j=False when fast_writes is on"""
+        if self.fast_writes:
+            return self.db.get_collection(collection_name, write_concern=WriteConcern(w=1, j=False))
+        return self.db[collection_name]
+    
     def insert_one(self, collection_name: str, document: Dict) -> Optional[str]:
         """
         Insert a single document
@@ -185,7 +240,7 @@ class MongoDBConnector:
             Inserted document ID as string, or None if failed
         """
         try:
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.insert_one(document)
             self.logger.info(f"✓ Inserted document with ID: {result.inserted_id}")
             return str(result.inserted_id)
@@ -212,7 +267,7 @@ class MongoDBConnector:
                 self.logger.warning("No documents to insert")
                 return 0
             
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.insert_many(documents, ordered=False)
             count = len(result.inserted_ids)
             self.logger.info(f"✓ Inserted {count} documents into '{collection_name}'")
@@ -254,7 +309,8 @@ class MongoDBConnector:
     
     def find_many(self, collection_name: str, query: Optional[Dict] = None, 
                   projection: Optional[Dict] = None, limit: int = 100,
-                  sort: Optional[List[tuple]] = None) -> List[Dict]:
+                  sort: Optional[List[tuple]] = None,
+                  batch_size: Optional[int] = None) -> List[Dict]:
         """
         Find multiple documents
         
@@ -264,6 +320,7 @@ class MongoDBConnector:
             projection: Fields to include/exclude
             limit: Maximum number of documents to return
             sort: Sort order as list of (field, direction) tuples
+            batch_size: Optional number of documents per server batch
         
         Returns:
             List of found documents
@@ -278,6 +335,9 @@ class MongoDBConnector:
             if sort:
                 cursor = cursor.sort(sort)
             
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+            
             documents = []
             for doc in cursor:
                 doc = self._convert_objectid(doc)
@@ -290,6 +350,46 @@ class MongoDBConnector:
             self.logger.error(f"Error finding documents: {e}")
             return []
     
+    def iter_many(self, collection_name: str, query: Optional[Dict] = None, 
+                  projection: Optional[Dict] = None, limit: int = 0,
+                  sort: Optional[List[tuple]] = None,
+                  batch_size: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Find multiple documents and yield them one at a time
+        
+        Documents are converted the same way as find_many, but are read
+        from the cursor batch by batch instead of being collected into a
+        list, so large results can be consumed with bounded memory.
+        
+        Args:
+            collection_name: Collection to search
+            query: Query filter (default: {})
+            projection: Fields to include/exclude
+            limit: Maximum number of documents to return (default: 0, no limit)
+            sort: Sort order as list of (field, direction) tuples
+            batch_size: Optional number of documents per server batch
+        
+        Returns:
+            Iterator over found documents
+        """
+        try:
+            collection = self.db[collection_name]
+            query = query or {}
+            
+            cursor = collection.find(query, projection).limit(limit)
+            
+            if sort:
+                cursor = cursor.sort(sort)
+            
+            if batch_size:
+                cursor = cursor.batch_size(batch_size)
+            
+            for doc in cursor:
+                yield self._convert_objectid(doc)
+                
+        except Exception as e:
+            self.logger.error(f"Error finding documents: {e}")
+    
     def find_by_id(self, collection_name: str, document_id: str) -> Optional[Dict]:
         """
         Find a document by its _id
@@ -324,7 +424,7 @@ class MongoDBConnector:
             Number of documents modified
         """
         try:
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.update_one(query, update, upsert=upsert)
             
             if result.modified_count > 0:
@@ -354,7 +454,7 @@ class MongoDBConnector:
             Number of documents modified
         """
         try:
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.update_many(query, update, upsert=upsert)
             self.logger.info(f"✓ Modified {result.modified_count} document(s)")
             return result.modified_count
@@ -374,7 +474,7 @@ class MongoDBConnector:
             Number of documents deleted
         """
         try:
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.delete_one(query)
             self.logger.info(f"✓ Deleted {result.deleted_count} document")
             return result.deleted_count
@@ -394,7 +494,7 @@ class MongoDBConnector:
             Number of documents deleted
         """
         try:
-            collection = self.db[collection_name]
+            collection = self._write_collection(collection_name)
             result = collection.delete_many(query)
             self.logger.info(f"✓ Deleted {result.deleted_count} document(s)")
             return result.deleted_count
@@ -422,22 +522,44 @@ class MongoDBConnector:
             self.logger.error(f"Error counting documents: {e}")
             return 0
     
+    def estimated_count(self, collection_name: str) -> int:
+        """
+        Get the total document count from collection metadata
+        
+        Unlike count_documents, this does not scan the collection, but it
+        cannot take a filter and may be off after an unclean shutdown.
+        
+        Args:
+            collection_name: Collection name
+        
+        Returns:
+            Estimated number of documents
+        """
+        try:
+            return self.db[collection_name].estimated_document_count()
+        except Exception as e:
+            self.logger.error(f"Error estimating document count: {e}")
+            return 0
+    
     # ========== Aggregation Operations ==========
     
-    def aggregate(self, collection_name: str, pipeline: List[Dict]) -> List[Dict]:
+    def aggregate(self, collection_name: str, pipeline: List[Dict],
+                  batch_size: Optional[int] = None) -> List[Dict]:
         """
         Execute an aggregation pipeline
         
         Args:
             collection_name: Collection name
             pipeline: Aggregation pipeline stages
+            batch_size: Optional number of documents per server batch
         
         Returns:
             List of aggregation results
         """
         try:
             collection = self.db[collection_name]
-            results = list(collection.aggregate(pipeline))
+            options = {'batchSize': batch_size} if batch_size else {}
+            results = list(collection.aggregate(pipeline, **options))
             
             # Convert ObjectIds in results
             results = [self._convert_objectid(doc) for doc in results]
@@ -454,6 +576,10 @@ class MongoDBConnector:
         """
         Get statistics about a collection
         
+        The document count comes from the storage stats metadata rather
+        than counting documents, so it may be slightly off after unclean
+        shutdowns or with orphaned documents on sharded clusters.
+        
         Args:
             collection_name: Collection name
         
@@ -463,27 +589,35 @@ class MongoDBConnector:
         try:
             collection = self.db[collection_name]
             
-            # Get document count
-            count = collection.count_documents({})
-            
             # Get sample document to infer schema
             sample = collection.find_one()
             fields = list(sample.keys()) if sample else []
             
-            # Get collection size info
-            stats_command = self.db.command('collStats', collection_name)
-            
-            # FIX: Convert cursor to list before getting length
-            indexes = list(collection.list_indexes())
-            index_count = len(indexes)
+            # Get document count, size and index count from the storage stats,
+            # projected on the server so only these scalars are returned
+            # (the full collStats reply also carries per-index and storage
+            # engine details). One document per shard: counts and sizes are
+            # summed, while every shard holds the same indexes.
+            storage_stats = list(collection.aggregate([
+                {'$collStats': {'storageStats': {}}},
+                {'$project': {
+                    '_id': 0,
+                    'count': '$storageStats.count',
+                    'size': '$storageStats.size',
+                    'nindexes': '$storageStats.nindexes'
+                }}
+            ]))
+            count = sum(shard.get('count', 0) for shard in storage_stats)
+            size = sum(shard.get('size', 0) for shard in storage_stats)
+            index_count = max((shard.get('nindexes', 0) for shard in storage_stats), default=0)
             
             stats = {
                 'collection': collection_name,
                 'document_count': count,
-                'size_bytes': stats_command.get('size', 0),
-                'avg_doc_size_bytes': stats_command.get('avgObjSize', 0),
+                'size_bytes': size,
+                'avg_doc_size_bytes': size // count if count else 0,
                 'fields': fields,
-                'indexes': index_count,  # Fixed
+                'indexes': index_count,
                 'sample_document': self._convert_objectid(sample) if sample else None
             }
             
@@ -524,6 +658,48 @@ class MongoDBConnector:
             self.logger.error(f"Error getting distinct values: {e}")
             return []
     
+    def get_distinct_aggregated(self, collection_name: str, field: str,
+                                limit: Optional[int] = None,
+                                query: Optional[Dict] = None,
+                                batch_size: int = 1000) -> List[Any]:
+        """
+        Get sorted distinct values for a field with an aggregation pipeline
+        
+        Unlike get_distinct_values (the distinct command), the result is not
+        bound by the 16MB document limit, array fields are unwound on the
+        server and, with a limit, only the first values are returned.
+        
+        Args:
+            collection_name: Collection name
+            field: Field name
+            limit: Optional maximum number of values to return
+            query: Optional filter query
+            batch_size: Number of values per server batch
+        
+        Returns:
+            List of distinct values in ascending order
+        """
+        try:
+            collection = self.db[collection_name]
+            pipeline = []
+            if query:
+                pipeline.append({'$match': query})
+            pipeline += [
+                {'$unwind': f'${field}'},
+                {'$group': {'_id': f'${field}'}},
+                {'$sort': {'_id': 1}}
+            ]
+            if limit:
+                pipeline.append({'$limit': limit})
+            
+            cursor = collection.aggregate(pipeline, allowDiskUse=True, batchSize=batch_size)
+            values = [doc['_id'] for doc in cursor]
+            self.logger.info(f"✓ Found {len(values)} distinct values for '{field}'")
+            return values
+        except Exception as e:
+            self.logger.error(f"Error getting distinct values: {e}")
+            return []
+    
     def create_index(self, collection_name: str, field: str, 
                      unique: bool = False) -> bool:
         """
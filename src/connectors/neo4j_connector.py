@@ -5,7 +5,7 @@ Handles all Neo4j operations including connection, node/relationship operations
 
 from neo4j import GraphDatabase, Result
 from neo4j.exceptions import ServiceUnavailable, AuthError, Neo4jError
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator, Tuple
 import sys
 import os
 
@@ -15,6 +15,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import setup_logger
 from config.database_config import DatabaseConfig
 
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a label or property name for Cypher"""
+    return "`" + name.replace("`", "``") + "`"
+
 class Neo4jConnector:
     """Neo4j connection and operations handler"""
     
@@ -109,6 +113,66 @@ class Neo4jConnector:
     
     # ========== Database Operations ==========
     
+    def _convert_value(self, obj: Any) -> Any:
+        """Recursively convert Neo4j objects to dictionaries"""
+        if hasattr(obj, 'properties'):
+            # Node or Relationship
+            try:
+                result = dict(obj.properties)
+                if hasattr(obj, 'labels'):
+                    result['_labels'] = list(obj.labels)
+                if hasattr(obj, 'type'):
+                    result['_type'] = obj.type
+                if hasattr(obj, 'element_id'):
+                    result['_id'] = obj.element_id
+                elif hasattr(obj, 'id'):
+                    result['_id'] = obj.id
+                return result
+            except Exception as e:
+                self.logger.warning(f"Failed to convert Neo4j object: {e}")
+                return str(obj)
+        elif hasattr(obj, 'keys') and callable(getattr(obj, 'keys', None)):
+            # Record or dict-like object
+            try:
+                result = {}
+                for key in obj.keys():
+                    value = obj[key]
+                    result[key] = self._convert_value(value)
+                return result
+            except Exception:
+                # Not a real dict-like, treat as single object
+                return str(obj)
+        elif isinstance(obj, (list, tuple)):
+            return [self._convert_value(item) for item in obj]
+        elif isinstance(obj, dict):
+            return {key: self._convert_value(value) for key, value in obj.items()}
+        else:
+            return obj
+    
+    def _convert_record(self, record) -> Dict:
+        """Convert a driver record into a plain dictionary"""
+        # Convert record values and create a simple dict
+        record_dict = {}
+        try:
+            # Get all values from the record
+            for key in record.keys():
+                value = record[key]
+                record_dict[key] = self._convert_value(value)
+        except Exception as e:
+            self.logger.warning(f"Failed to process record keys: {e}")
+            # Fallback: try to iterate through record as sequence
+            try:
+                for i, value in enumerate(record):
+                    record_dict[f'col_{i}'] = self._convert_value(value)
+            except Exception as e2:
+                self.logger.warning(f"Failed to process record as sequence: {e2}")
+                record_dict['error'] = f'Could not process record: {str(record)}'
+        
+        # If the record has only one key and it's a dict, flatten it
+        if len(record_dict) == 1 and isinstance(list(record_dict.values())[0], dict):
+            return list(record_dict.values())[0]
+        return record_dict
+    
     def execute_query(self, query: str, parameters: Optional[Dict] = None) -> List[Dict]:
         """
         Execute a Cypher query and return results
@@ -122,70 +186,10 @@ class Neo4jConnector:
         """
         parameters = parameters or {}
         
-        def convert_neo4j_object(obj):
-            """Recursively convert Neo4j objects to dictionaries"""
-            if hasattr(obj, 'properties'):
-                # Node or Relationship
-                try:
-                    result = dict(obj.properties)
-                    if hasattr(obj, 'labels'):
-                        result['_labels'] = list(obj.labels)
-                    if hasattr(obj, 'type'):
-                        result['_type'] = obj.type
-                    if hasattr(obj, 'element_id'):
-                        result['_id'] = obj.element_id
-                    elif hasattr(obj, 'id'):
-                        result['_id'] = obj.id
-                    return result
-                except Exception as e:
-                    self.logger.warning(f"Failed to convert Neo4j object: {e}")
-                    return str(obj)
-            elif hasattr(obj, 'keys') and callable(getattr(obj, 'keys', None)):
-                # Record or dict-like object
-                try:
-                    result = {}
-                    for key in obj.keys():
-                        value = obj[key]
-                        result[key] = convert_neo4j_object(value)
-                    return result
-                except Exception:
-                    # Not a real dict-like, treat as single object
-                    return str(obj)
-            elif isinstance(obj, (list, tuple)):
-                return [convert_neo4j_object(item) for item in obj]
-            elif isinstance(obj, dict):
-                return {key: convert_neo4j_object(value) for key, value in obj.items()}
-            else:
-                return obj
-        
         try:
             with self.driver.session(database=self.database) as session:
                 result = session.run(query, parameters)
-                records = []
-                for record in result:
-                    # Convert record values and create a simple dict
-                    record_dict = {}
-                    try:
-                        # Get all values from the record
-                        for key in record.keys():
-                            value = record[key]
-                            record_dict[key] = convert_neo4j_object(value)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to process record keys: {e}")
-                        # Fallback: try to iterate through record as sequence
-                        try:
-                            for i, value in enumerate(record):
-                                record_dict[f'col_{i}'] = convert_neo4j_object(value)
-                        except Exception as e2:
-                            self.logger.warning(f"Failed to process record as sequence: {e2}")
-                            record_dict['error'] = f'Could not process record: {str(record)}'
-                    
-                    # If the record has only one key and it's a dict, flatten it
-                    if len(record_dict) == 1 and isinstance(list(record_dict.values())[0], dict):
-                        records.append(list(record_dict.values())[0])
-                    else:
-                        records.append(record_dict)
-                        
+                records = [self._convert_record(record) for record in result]
                 self.logger.info(f"✓ Query executed, returned {len(records)} records")
                 return records
         except Neo4jError as e:
@@ -195,6 +199,60 @@ class Neo4jConnector:
             self.logger.error(f"Unexpected error: {e}")
             return []
     
+    def execute_queries(self, queries: List[Tuple[str, Optional[Dict]]]) -> List[List[Dict]]:
+        """
+        Execute several read queries in a single read transaction
+        
+        Args:
+            queries: List of (Cypher query string, parameters) pairs
+        
+        Returns:
+            One list of result records per query, in order
+        """
+        def run_all(tx) -> List[List[Dict]]:
+            return [
+                [self._convert_record(record) for record in tx.run(query, parameters or {})]
+                for query, parameters in queries
+            ]
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                results = session.execute_read(run_all)
+                self.logger.info(f"✓ {len(results)} queries executed in one transaction")
+                return results
+        except Neo4jError as e:
+            self.logger.error(f"Query execution error: {e}")
+            return [[] for _ in queries]
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {e}")
+            return [[] for _ in queries]
+    
+    def stream_query(self, query: str, parameters: Optional[Dict] = None) -> Iterator[Dict]:
+        """
+        Execute a Cypher query and yield results one record at a time
+        
+        Records are converted the same way as execute_query, but are not
+        collected into a list, so large results can be consumed with
+        bounded memory.
+        
+        Args:
+            query: Cypher query string
+            parameters: Query parameters (default: {})
+        
+        Returns:
+            Iterator over result records as dictionaries
+        """
+        parameters = parameters or {}
+        
+        try:
+            with self.driver.session(database=self.database) as session:
+                for record in session.run(query, parameters):
+                    yield self._convert_record(record)
+        except Neo4jError as e:
+            self.logger.error(f"Query execution error: {e}")
+        except Exception as e:
+            self.logger.error(f"Unexpected error: {e}")
+    
     def execute_write(self, query: str, parameters: Optional[Dict] = None) -> Dict[str, Any]:
         """
         Execute a write query (CREATE, UPDATE, DELETE)
@@ -325,6 +383,44 @@ class Neo4jConnector:
             self.logger.error(f"Error finding nodes: {e}")
             return []
     
+    def find_nodes_projected(self, label: str, fields: List[str],
+                             limit: int = 100) -> List[Dict]:
+        """
+        Find nodes by label, returning only the given properties
+        
+        Only the requested properties are sent back, instead of every
+        property of each node.
+        
+        Args:
+            label: Node label
+            fields: Property names to return
+            limit: Maximum number of nodes to return
+        
+        Returns:
+            List of dictionaries with the requested properties the nodes have
+        """
+        try:
+            columns = ', '.join([
+                f"n.{_quote_identifier(field)} AS {_quote_identifier(field)}" for field in fields
+            ])
+            query = f"""
+            MATCH (n:{_quote_identifier(label)})
+            RETURN {columns}
+            LIMIT $limit
+            """
+            
+            result = self.execute_query(query, {'limit': limit})
+            # Neo4j has no null properties, so a None column is a missing one;
+            # leave it out like find_nodes does
+            nodes = [{key: value for key, value in record.items() if value is not None}
+                     for record in result]
+            self.logger.info(f"✓ Found {len(nodes)} {label} nodes")
+            return nodes
+            
+        except Exception as e:
+            self.logger.error(f"Error finding nodes: {e}")
+            return []
+    
     def update_node(self, label: str, match_properties: Dict, 
                     update_properties: Dict) -> int:
         """
@@ -521,6 +617,65 @@ class Neo4jConnector:
             self.logger.error(f"Error counting relationships: {e}")
             return 0
     
+    def count_nodes_bulk(self, labels: List[str]) -> Dict[str, int]:
+        """
+        Count nodes for several labels in one query
+        
+        Each label gets its own UNION ALL branch with a static label, so every
+        count is still answered from the count store rather than a scan.
+        
+        Args:
+            labels: Node labels
+        
+        Returns:
+            Dictionary mapping each label to its node count
+        """
+        if not labels:
+            return {}
+        
+        try:
+            query = " UNION ALL ".join([
+                f"MATCH (n:{_quote_identifier(label)}) WITH count(n) AS count "
+                f"RETURN $labels[{i}] AS label, count"
+                for i, label in enumerate(labels)
+            ])
+            
+            result = self.execute_query(query, {'labels': labels})
+            counts = {record['label']: record['count'] for record in result}
+            return {label: counts.get(label, 0) for label in labels}
+            
+        except Exception as e:
+            self.logger.error(f"Error counting nodes: {e}")
+            return {}
+    
+    def count_relationships_bulk(self, rel_types: List[str]) -> Dict[str, int]:
+        """
+        Count relationships for several types in one query
+        
+        Args:
+            rel_types: Relationship types
+        
+        Returns:
+            Dictionary mapping each type to its relationship count
+        """
+        if not rel_types:
+            return {}
+        
+        try:
+            query = " UNION ALL ".join([
+                f"MATCH ()-[r:{_quote_identifier(rel_type)}]->() WITH count(r) AS count "
+                f"RETURN $types[{i}] AS type, count"
+                for i, rel_type in enumerate(rel_types)
+            ])
+            
+            result = self.execute_query(query, {'types': rel_types})
+            counts = {record['type']: record['count'] for record in result}
+            return {rel_type: counts.get(rel_type, 0) for rel_type in rel_types}
+            
+        except Exception as e:
+            self.logger.error(f"Error counting relationships: {e}")
+            return {}
+    
     def get_labels(self) -> List[str]:
         """
         Get all node labels in the database
@@ -3,10 +3,13 @@ RDF Store Connector (Apache Jena Fuseki)
 Handles SPARQL queries and RDF operations
 """
 
-from SPARQLWrapper import SPARQLWrapper, JSON, POST, GET
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from rdflib import Graph, Namespace, Literal, URIRef
 from rdflib.namespace import RDF, RDFS
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
 import sys
 import os
 
@@ -15,6 +18,26 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import setup_logger
 from config.database_config import DatabaseConfig
 
+# (connect, read) timeouts in seconds for every request to Fuseki, so a hung
+# server fails the call instead of blocking it (and its worker) forever
+_REQUEST_TIMEOUT = (5, 60)
+
+# Queries behind count_triples(), get_classes() and get_properties(), shared
+# with get_schema_basics() which runs all three at once
+_COUNT_TRIPLES_QUERY = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
+
+_CLASSES_QUERY = """
+SELECT DISTINCT ?class WHERE {
+    ?s a ?class .
+}
+"""
+
+_PROPERTIES_QUERY = """
+SELECT DISTINCT ?property WHERE {
+    ?s ?property ?o .
+}
+"""
+
 class RDFConnector:
     """RDF Store connection and operations handler"""
     
@@ -38,8 +61,7 @@ class RDFConnector:
         self.query_endpoint = f"{self.endpoint}/{self.dataset}/query"
         self.update_endpoint = f"{self.endpoint}/{self.dataset}/update"
         
-        self.sparql_query = None
-        self.sparql_update = None
+        self.session = None
         self.logger = setup_logger(__name__)
         
         # Create namespaces
@@ -57,21 +79,25 @@ class RDFConnector:
         try:
             self.logger.info(f"Connecting to RDF store at {self.endpoint}...")
             
-            # Create SPARQL wrappers
-            self.sparql_query = SPARQLWrapper(self.query_endpoint)
-            self.sparql_update = SPARQLWrapper(self.update_endpoint)
+            # One pooled keep-alive session for every query and update, so
+            # each SPARQL request reuses an open connection instead of
+            # paying a new TCP handshake. Only reads are retried: POST is
+            # not in Retry's default allowed methods.
+            self.session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=8,
+                pool_maxsize=16,
+                max_retries=Retry(total=2, backoff_factor=0.1)
+            )
+            self.session.mount('http://', adapter)
+            self.session.mount('https://', adapter)
             
             # Add authentication for UPDATE operations
             if self.username and self.password:
-                self.sparql_update.setCredentials(self.username, self.password)
                 self.logger.info(f"Using authentication: {self.username}")
             
-            self.sparql_query.setReturnFormat(JSON)
-            
             # Test connection with a simple query
-            test_query = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
-            self.sparql_query.setQuery(test_query)
-            results = self.sparql_query.query().convert()
+            self._query(_COUNT_TRIPLES_QUERY)
             
             self.logger.info("✓ Connected to RDF store")
             return True
@@ -79,19 +105,24 @@ class RDFConnector:
         except Exception as e:
             self.logger.error(f"✗ RDF connection failed: {e}")
             self.logger.error("Make sure Fuseki Docker container is running")
+            if self.session:
+                self.session.close()
+                self.session = None
             return False
     
     def disconnect(self):
         """Close connection"""
+        if self.session:
+            self.session.close()
+            self.session = None
         self.logger.info("RDF connection closed")
     
     def test_connection(self) -> bool:
         """Test if connection is alive"""
         try:
-            if self.sparql_query:
+            if self.session:
                 test_query = "ASK { ?s ?p ?o }"
-                self.sparql_query.setQuery(test_query)
-                self.sparql_query.query()
+                self._query(test_query)
                 return True
             return False
         except Exception as e:
@@ -109,6 +140,32 @@ class RDFConnector:
     
     # ========== Query Operations ==========
     
+    def _query(self, query: str) -> Dict[str, Any]:
+        """Send a SPARQL query over the session and return the JSON results"""
+        response = self.session.get(
+            self.query_endpoint,
+            params={'query': query},
+            headers={'Accept': 'application/sparql-results+json'},
+            timeout=_REQUEST_TIMEOUT
+        )
+        response.raise_for_status()
+        return response.json()
+    
+    def _run_select(self, query: str) -> List[Dict[str, Any]]:
+        """Run a SELECT query and flatten its bindings to values"""
+        results = self._query(query)
+        
+        bindings = results["results"]["bindings"]
+        
+        # Convert to simpler format
+        simplified = []
+        for binding in bindings:
+            row = {}
+            for var, value in binding.items():
+                row[var] = value["value"]
+            simplified.append(row)
+        return simplified
+    
     def execute_query(self, query: str) -> List[Dict[str, Any]]:
         """
         Execute a SPARQL SELECT query
@@ -120,19 +177,7 @@ class RDFConnector:
             List of result bindings
         """
         try:
-            self.sparql_query.setQuery(query)
-            self.sparql_query.setMethod(GET)
-            results = self.sparql_query.query().convert()
-            
-            bindings = results["results"]["bindings"]
-            
-            # Convert to simpler format
-            simplified = []
-            for binding in bindings:
-                row = {}
-                for var, value in binding.items():
-                    row[var] = value["value"]
-                simplified.append(row)
+            simplified = self._run_select(query)
             
             self.logger.info(f"✓ Query returned {len(simplified)} results")
             return simplified
@@ -141,6 +186,36 @@ class RDFConnector:
             self.logger.error(f"Error executing query: {e}")
             return []
     
+    def execute_queries(self, queries: List[str], max_workers: int = 4) -> List[List[Dict[str, Any]]]:
+        """
+        Execute several independent SPARQL SELECT queries concurrently
+        
+        The queries share the connector's connection pool.
+        
+        Args:
+            queries: SPARQL query strings
+            max_workers: Maximum number of queries in flight at once
+        
+        Returns:
+            One list of result bindings per query, in the same order
+            (empty for a query that failed)
+        """
+        if not queries:
+            return []
+        
+        def run(query: str) -> List[Dict[str, Any]]:
+            try:
+                return self._run_select(query)
+            except Exception as e:
+                self.logger.error(f"Error executing query: {e}")
+                return []
+        
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(queries))) as pool:
+            results = list(pool.map(run, queries))
+        
+        self.logger.info(f"✓ Ran {len(queries)} queries")
+        return results
+    
     def execute_update(self, update: str) -> bool:
         """
         Execute a SPARQL UPDATE query
@@ -152,9 +227,10 @@ class RDFConnector:
             True if successful
         """
         try:
-            self.sparql_update.setQuery(update)
-            self.sparql_update.setMethod(POST)
-            self.sparql_update.query()
+            auth = (self.username, self.password) if self.username and self.password else None
+            response = self.session.post(self.update_endpoint, data={'update': update}, auth=auth,
+                                         timeout=_REQUEST_TIMEOUT)
+            response.raise_for_status()
             
             self.logger.info("✓ Update executed successfully")
             return True
@@ -163,6 +239,24 @@ class RDFConnector:
             self.logger.error(f"Error executing update: {e}")
             return False
     
+    def execute_update_batch(self, operations: List[str]) -> bool:
+        """
+        Execute several SPARQL UPDATE operations in one request
+        
+        A SPARQL 1.1 update request may hold a sequence of operations
+        separated by ';'; they are applied in order.
+        
+        Args:
+            operations: SPARQL UPDATE strings (INSERT DATA, DELETE DATA, ...)
+        
+        Returns:
+            True if successful
+        """
+        if not operations:
+            return True
+        
+        return self.execute_update(" ;\n".join(operations))
+    
     def ask(self, query: str) -> bool:
         """
         Execute a SPARQL ASK query
@@ -174,8 +268,7 @@ class RDFConnector:
             Boolean result
         """
         try:
-            self.sparql_query.setQuery(query)
-            results = self.sparql_query.query().convert()
+            results = self._query(query)
             return results["boolean"]
         except Exception as e:
             self.logger.error(f"Error in ASK query: {e}")
@@ -320,8 +413,7 @@ class RDFConnector:
     def count_triples(self) -> int:
         """Count total number of triples"""
         try:
-            query = "SELECT (COUNT(*) as ?count) WHERE { ?s ?p ?o }"
-            results = self.execute_query(query)
+            results = self.execute_query(_COUNT_TRIPLES_QUERY)
             if results:
                 return int(results[0]['count'])
             return 0
@@ -332,12 +424,7 @@ class RDFConnector:
     def get_classes(self) -> List[str]:
         """Get all RDF classes"""
         try:
-            query = """
-            SELECT DISTINCT ?class WHERE {
-                ?s a ?class .
-            }
-            """
-            results = self.execute_query(query)
+            results = self.execute_query(_CLASSES_QUERY)
             return [r['class'] for r in results]
         except Exception as e:
             self.logger.error(f"Error getting classes: {e}")
@@ -346,17 +433,35 @@ class RDFConnector:
     def get_properties(self) -> List[str]:
         """Get all RDF properties"""
         try:
-            query = """
-            SELECT DISTINCT ?property WHERE {
-                ?s ?property ?o .
-            }
-            """
-            results = self.execute_query(query)
+            results = self.execute_query(_PROPERTIES_QUERY)
             return [r['property'] for r in results]
         except Exception as e:
             self.logger.error(f"Error getting properties: {e}")
             return []
     
+    def get_schema_basics(self) -> Dict[str, Any]:
+        """
+        Get the triple count, classes and properties in one go
+        
+        The three queries are sent concurrently over the session pool
+        instead of one after another.
+        
+        Returns:
+            Dictionary with triple_count, classes and properties
+        """
+        try:
+            counts, classes, properties = self.execute_queries([
+                _COUNT_TRIPLES_QUERY, _CLASSES_QUERY, _PROPERTIES_QUERY
+            ])
+            return {
+                'triple_count': int(counts[0]['count']) if counts else 0,
+                'classes': [r['class'] for r in classes],
+                'properties': [r['property'] for r in properties]
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting schema basics: {e}")
+            return {'triple_count': 0, 'classes': [], 'properties': []}
+    
     def get_subjects_of_type(self, class_uri: str, limit: int = 100) -> List[str]:
         """Get subjects of a specific type"""
         try:
@@ -9,7 +9,7 @@ from redis.exceptions import (
     TimeoutError as RedisTimeoutError,
     RedisError
 )
-from typing import Dict, List, Any, Optional, Union
+from typing import Dict, List, Any, Optional, Union, Iterator
 import json
 import sys
 import os
@@ -20,6 +20,19 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils.logger import setup_logger
 from config.database_config import DatabaseConfig
 
+# Top members of a sorted set with their scores and the `title` field of the
+# matching movie hash, as flat (id, score, title) triples in one reply
+_TOP_RATED_TITLES_LUA = """
+local r = redis.call('ZREVRANGE', KEYS[1], 0, tonumber(ARGV[1]) - 1, 'WITHSCORES')
+local o = {}
+for i = 1, #r, 2 do
+    o[#o + 1] = r[i]
+    o[#o + 1] = r[i + 1]
+    o[#o + 1] = redis.call('HGET', 'movie:' .. r[i], 'title')
+end
+return o
+"""
+
 class RedisConnector:
     """Redis connection and operations handler"""
     
@@ -42,6 +55,9 @@ class RedisConnector:
         self.db = db or config['db']
         
         self.client = None
+        self._top_rated_script = None
+        # Full INFO reply, fetched once and reused until refresh_info()
+        self._info_cache: Optional[Dict[str, Any]] = None
         self.logger = setup_logger(__name__)
     
     def connect(self) -> bool:
@@ -60,14 +76,25 @@ class RedisConnector:
                 'port': self.port,
                 'db': self.db,
                 'decode_responses': True,  # Automatically decode responses to strings
+                # RESP3 (HELLO 3, Redis >= 6): hashes come back as native maps
+                # instead of flat arrays rebuilt into dicts client-side
+                'protocol': 3,
+                'client_name': 'nosql_project',
                 'socket_timeout': 5,
-                'socket_connect_timeout': 5
+                'socket_connect_timeout': 5,
+                # Keep idle pooled connections alive and PING them before
+                # reuse after 30s idle, rather than failing on a dead socket
+                'socket_keepalive': True,
+                'health_check_interval': 30
             }
             
             if self.password:
                 connection_params['password'] = self.password
             
             self.client = redis.Redis(**connection_params)
+            self._info_cache = None
+            # Sent with EVALSHA, loaded on first use (and reloaded on NOSCRIPT)
+            self._top_rated_script = self.client.register_script(_TOP_RATED_TITLES_LUA)
             
             # Test connection
             self.client.ping()
@@ -118,8 +145,7 @@ class RedisConnector:
         
         if self.client:
             try:
-                server_info = self.client.info('server')
-                info['redis_version'] = server_info.get('redis_version', 'unknown')
+                info['redis_version'] = self._server_info().get('redis_version', 'unknown')
             except:
                 pass
         
@@ -665,6 +691,31 @@ class RedisConnector:
             self.logger.error(f"Error getting sorted set cardinality: {e}")
             return 0
     
+    def top_rated_titles(self, name: str = 'movies:by_rating',
+                         count: int = 5) -> List[tuple]:
+        """
+        Get the highest-scored movies with their titles in one round-trip
+        
+        Runs a cached Lua script server-side, so only the id, score and title
+        of each movie cross the wire instead of every field of its hash.
+        
+        Args:
+            name: Sorted set of movie ids scored by rating
+            count: Number of movies to return
+        
+        Returns:
+            List of (movie_id, score, title) tuples, highest score first;
+            title is None when the movie hash has no title
+        """
+        try:
+            reply = self._top_rated_script(keys=[name], args=[count])
+            # A missed HGET is Lua false, which RESP3 delivers as False
+            return [(reply[i], float(reply[i + 1]), reply[i + 2] or None)
+                    for i in range(0, len(reply), 3)]
+        except Exception as e:
+            self.logger.error(f"Error getting top rated titles: {e}")
+            return []
+    
     # ========== JSON Operations (requires RedisJSON module, optional) ==========
     
     def set_json(self, key: str, obj: Any) -> bool:
@@ -679,7 +730,8 @@ class RedisConnector:
             True if successful, False otherwise
         """
         try:
-            json_str = json.dumps(obj)
+            # Compact separators: no padding spaces stored or sent per item
+            json_str = json.dumps(obj, separators=(',', ':'))
             return self.set(key, json_str)
         except Exception as e:
             self.logger.error(f"Error setting JSON: {e}")
@@ -724,6 +776,38 @@ class RedisConnector:
             self.logger.error(f"Error getting keys: {e}")
             return []
     
+    def scan_iter(self, pattern: str = '*', count: int = 1000) -> Iterator[str]:
+        """
+        Iterate over keys matching pattern with SCAN
+        
+        Unlike keys(), this never blocks the server on a full keyspace walk and
+        yields keys incrementally, so callers can stop early. SCAN may return
+        a key more than once if the keyspace is resized during iteration.
+        
+        Args:
+            pattern: Pattern to match (default: '*' for all keys)
+            count: COUNT hint, i.e. roughly how many keys each SCAN call inspects
+        
+        Returns:
+            Iterator over matching keys
+        """
+        try:
+            yield from self.client.scan_iter(match=pattern, count=count)
+        except Exception as e:
+            self.logger.error(f"Error scanning keys: {e}")
+    
+    def pipeline(self, transaction: bool = False):
+        """
+        Get a pipeline for sending several commands in one round-trip
+        
+        Args:
+            transaction: Wrap the queued commands in MULTI/EXEC
+        
+        Returns:
+            redis-py Pipeline; queue commands on it, then call execute()
+        """
+        return self.client.pipeline(transaction=transaction)
+    
     def dbsize(self) -> int:
         """
         Get total number of keys in database
@@ -768,15 +852,28 @@ class RedisConnector:
             self.logger.error(f"Error getting server info: {e}")
             return {}
     
+    def refresh_info(self):
+        """Drop the cached INFO reply so the next stats read queries the server"""
+        self._info_cache = None
+    
+    def _server_info(self) -> Dict[str, Any]:
+        """Return the full INFO reply, running INFO only on first use"""
+        if self._info_cache is None:
+            self._info_cache = self.client.info()
+        return self._info_cache
+    
     def get_stats(self) -> Dict[str, Any]:
         """
         Get database statistics
         
+        Server counters come from a cached INFO reply shared with
+        get_connection_info(); call refresh_info() first for current values.
+        
         Returns:
             Dictionary with statistics
         """
         try:
-            info = self.client.info()
+            info = self._server_info()
             
             stats = {
                 'redis_version': info.get('redis_version', 'unknown'),
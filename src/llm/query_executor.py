@@ -8,11 +8,6 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from typing import Dict, List, Any
-from connectors.mongodb_connector import MongoDBConnector
-from connectors.neo4j_connector import Neo4jConnector
-from connectors.redis_connector import RedisConnector
-from connectors.rdf_connector import RDFConnector
-from connectors.hbase_connector import HBaseConnector
 from utils.logger import setup_logger
 
 class QueryExecutor:
@@ -26,6 +21,9 @@ class QueryExecutor:
         """Execute MongoDB query"""
         try:
             if 'mongodb' not in self.connectors:
+                # Imported on first use, so only the drivers of the databases
+                # actually queried get loaded
+                from connectors.mongodb_connector import MongoDBConnector
                 self.connectors['mongodb'] = MongoDBConnector()
                 self.connectors['mongodb'].connect()
             
@@ -117,6 +115,7 @@ class QueryExecutor:
         """Execute Neo4j Cypher query or CRUD operation"""
         try:
             if 'neo4j' not in self.connectors:
+                from connectors.neo4j_connector import Neo4jConnector
                 self.connectors['neo4j'] = Neo4jConnector()
                 self.connectors['neo4j'].connect()
             
@@ -391,6 +390,7 @@ class QueryExecutor:
         """Execute Redis commands or CRUD operations"""
         try:
             if 'redis' not in self.connectors:
+                from connectors.redis_connector import RedisConnector
                 self.connectors['redis'] = RedisConnector()
                 self.connectors['redis'].connect()
             
@@ -974,6 +974,7 @@ class QueryExecutor:
         """Execute SPARQL query or CRUD operation"""
         try:
             if 'rdf' not in self.connectors:
+                from connectors.rdf_connector import RDFConnector
                 self.connectors['rdf'] = RDFConnector()
                 self.connectors['rdf'].connect()
             
@@ -1596,6 +1597,7 @@ class QueryExecutor:
         """Execute HBase operation or CRUD"""
         try:
             if 'hbase' not in self.connectors:
+                from connectors.hbase_connector import HBaseConnector
                 self.connectors['hbase'] = HBaseConnector()
                 self.connectors['hbase'].connect()
             
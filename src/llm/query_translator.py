@@ -5,6 +5,8 @@ Translates natural language queries to database-specific queries
 
 import json
 import os
+import hashlib
+import functools
 from typing import Dict, Any, Optional
 import google.generativeai as genai
 from dotenv import load_dotenv
@@ -17,17 +19,61 @@ from utils.logger import setup_logger
 # Load environment variables
 load_dotenv()
 
+def _cached_translation(database_type: str):
+    """
+    Serve a translate_to_* method from the translator's cache_dir when set
+    
+    Entries are keyed on a hash of the database type, query and schema
+    context, so any change to the schema gives a fresh translation. Failed
+    translations are not stored.
+    """
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
+            if not self.cache_dir:
+                return method(self, natural_query, schema_context)
+            
+            key = hashlib.blake2b(
+                '\0'.join([database_type, natural_query, schema_context]).encode('utf-8'),
+                digest_size=16
+            ).hexdigest()
+            path = os.path.join(self.cache_dir, f"{key}.json")
+            
+            try:
+                if os.path.exists(path):
+                    with open(path, 'r', encoding='utf-8') as f:
+                        self.logger.info(f"Using cached {database_type} translation")
+                        return json.load(f)
+            except Exception as e:
+                self.logger.error(f"Error reading translation cache: {e}")
+            
+            result = method(self, natural_query, schema_context)
+            
+            if 'error' not in result:
+                try:
+                    os.makedirs(self.cache_dir, exist_ok=True)
+                    with open(path, 'w', encoding='utf-8') as f:
+                        json.dump(result, f, default=str)
+                except Exception as e:
+                    self.logger.error(f"Error writing translation cache: {e}")
+            return result
+        return wrapper
+    return decorator
+
 class QueryTranslator:
     """Translates natural language to database queries using Gemini"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, cache_dir: Optional[str] = None):
         """
         Initialize query translator
         
         Args:
             api_key: Google Gemini API key (optional, reads from .env if not provided)
+            cache_dir: Directory to persist translations in between runs
+                (e.g. ~/.cache/nosql_project/translations); disabled when None
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY not found. Add it to .env file or pass as parameter.")
         
@@ -84,6 +130,7 @@ class QueryTranslator:
         return json.loads(text)
     
     
+    @_cached_translation('mongodb')
     def translate_to_mongodb(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
         """
         Translate natural language to MongoDB query
@@ -211,6 +258,7 @@ Important: Return ONLY the JSON object, no text before or after."""
                 'natural_query': natural_query
             }
     
+    @_cached_translation('neo4j')
     def translate_to_neo4j(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
         """Translate natural language to Neo4j Cypher query or CRUD operation"""
         
@@ -315,6 +363,7 @@ Return ONLY the JSON, no additional text."""
                 'natural_query': natural_query
             }
     
+    @_cached_translation('redis')
     def translate_to_redis(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
         """Translate natural language to Redis commands or CRUD operations"""
         
@@ -421,6 +470,7 @@ Return ONLY the JSON."""
                 'natural_query': natural_query
             }
     
+    @_cached_translation('rdf')
     def translate_to_sparql(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
         """Translate natural language to SPARQL query or CRUD operation"""
         
@@ -554,6 +604,7 @@ Return ONLY the JSON."""
                 'natural_query': natural_query
             }
     
+    @_cached_translation('hbase')
     def translate_to_hbase(self, natural_query: str, schema_context: str) -> Dict[str, Any]:
         """Translate natural language to HBase operations or CRUD"""
         
@@ -5,169 +5,401 @@ Extracts and analyzes MongoDB collection schemas
 
 import sys
 import os
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+import re
+import time
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from collections import defaultdict, Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from connectors.mongodb_connector import MongoDBConnector
 from utils.logger import setup_logger
 
+# Exact-type lookup for the Python types BSON decodes to
+_TYPE_NAMES = {
+    type(None): 'null',
+    bool: 'boolean',
+    int: 'integer',
+    float: 'float',
+    str: 'string',
+    list: 'array',
+    dict: 'object',
+}
+
+# Scalar types whose values are kept as samples
+_SAMPLED_TYPES = {'boolean', 'integer', 'float', 'string'}
+
+def _classify_value(value: Any) -> str:
+    """Classify values whose exact type is not in _TYPE_NAMES (subclasses, BSON types)"""
+    # bool must be checked before int
+    for base in (bool, int, float, str, list, dict):
+        if isinstance(value, base):
+            return _TYPE_NAMES[base]
+    return type(value).__name__
+
+# Foreign-key naming conventions; group 1 is the referenced entity
+_FOREIGN_KEY_PATTERNS = [
+    re.compile(r'^(.+)_id$'),    # user_id
+    re.compile(r'^(.+)Id$'),     # userId
+    re.compile(r'^(.+)_ref$'),   # user_ref
+    re.compile(r'^fk_(.+)$'),    # fk_user
+]
+
+def _match_foreign_key(field_name: str) -> Optional[str]:
+    """Return the entity a field name appears to reference, or None"""
+    for pattern in _FOREIGN_KEY_PATTERNS:
+        match = pattern.match(field_name)
+        if match:
+            return match.group(1)
+    return None
+
+class FieldStats:
+    """Running statistics for a single field path"""
+    
+    __slots__ = ('count', 'null_count', 'types', 'sample_values', 'sample_full', 'nested', 'array')
+    
+    def __init__(self):
+        self.count = 0
+        self.null_count = 0
+        self.types = Counter()
+        self.sample_values = deque(maxlen=5)
+        self.sample_full = False
+        self.nested = False
+        self.array = False
+    
+    def add_sample(self, value: Any):
+        """Keep a sample value; callers stop once sample_full is set, so the first 5 are kept"""
+        self.sample_values.append(value)
+        self.sample_full = len(self.sample_values) == self.sample_values.maxlen
+
 class MongoDBSchemaExplorer:
     """Explores and analyzes MongoDB database schema"""
     
-    def __init__(self, connector: MongoDBConnector):
+    def __init__(self, connector: MongoDBConnector, cache_ttl: int = 300,
+                 max_schema_depth: int = 8):
         """
         Initialize schema explorer
         
         Args:
             connector: MongoDB connector instance
+            cache_ttl: Seconds to reuse a field analysis before re-sampling
+            max_schema_depth: Maximum number of nested object levels to analyze
         """
         self.connector = connector
         self.logger = setup_logger(__name__)
+        self.max_schema_depth = max_schema_depth
+        
+        # (collection_name, sample_size) -> (timestamp, field analysis)
+        self._field_cache: Dict[Tuple[str, int], Tuple[float, Dict[str, Any]]] = {}
+        # collection_name -> (timestamp, (sample document, index definitions))
+        self._metadata_cache: Dict[str, Tuple[float, Tuple[Optional[Dict], List[Dict]]]] = {}
+        self._ttl_seconds = cache_ttl
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def clear_cache(self):
+        """Drop all cached field analyses"""
+        self._field_cache.clear()
+        self._metadata_cache.clear()
+        self._cache_hits = 0
+        self._cache_misses = 0
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """
+        Get field analysis cache statistics
+        
+        Returns:
+            Dictionary with cache size, hits, misses and TTL
+        """
+        return {
+            'entries': len(self._field_cache),
+            'metadata_entries': len(self._metadata_cache),
+            'hits': self._cache_hits,
+            'misses': self._cache_misses,
+            'ttl_seconds': self._ttl_seconds
+        }
     
-    def analyze_field_types(self, collection_name: str, sample_size: int = 1000) -> Dict[str, Any]:
+    def analyze_field_types(self, collection_name: str, sample_size: int = 1000,
+                            total: Optional[int] = None) -> Dict[str, Any]:
         """
         Analyze field types in a collection by sampling documents
         
         Args:
             collection_name: Collection name
             sample_size: Number of documents to sample
+            total: Estimated document count, if already known (fetched otherwise)
         
         Returns:
             Dictionary with field type information
         """
+        cache_key = (collection_name, sample_size)
+        cached = self._field_cache.get(cache_key)
+        if cached and time.time() - cached[0] < self._ttl_seconds:
+            self._cache_hits += 1
+            return cached[1]
+        self._cache_misses += 1
+        
         try:
             # Sample documents
-            documents = self.connector.find_many(collection_name, {}, limit=sample_size)
-            
-            if not documents:
-                return {}
+            cursor = self._sample_documents(collection_name, sample_size, total)
             
             # Track field information
-            field_info = defaultdict(lambda: {
-                'count': 0,
-                'types': defaultdict(int),
-                'null_count': 0,
-                'sample_values': [],
-                'nested': False,
-                'array': False
-            })
+            field_info = defaultdict(FieldStats)
+            
+            # Analyze each document as its batch arrives
+            path_cache = {}
+            total_docs = 0
+            for doc in cursor:
+                self._analyze_document(doc, field_info, prefix='', path_cache=path_cache,
+                                       max_depth=self.max_schema_depth)
+                total_docs += 1
             
-            # Analyze each document
-            for doc in documents:
-                self._analyze_document(doc, field_info, prefix='')
+            if not total_docs:
+                return {}
             
             # Calculate statistics
-            total_docs = len(documents)
             result = {}
             
-            for field, info in field_info.items():
+            for field, stats in field_info.items():
                 # Determine primary type
-                if info['types']:
-                    primary_type = max(info['types'].items(), key=lambda x: x[1])[0]
+                if stats.types:
+                    primary_type = max(stats.types.items(), key=lambda x: x[1])[0]
                 else:
                     primary_type = 'unknown'
                 
                 result[field] = {
                     'type': primary_type,
-                    'all_types': dict(info['types']),
-                    'presence': f"{(info['count'] / total_docs * 100):.1f}%",
-                    'count': info['count'],
-                    'null_count': info['null_count'],
-                    'nested': info['nested'],
-                    'array': info['array'],
-                    'sample_values': info['sample_values'][:5]  # First 5 samples
+                    'all_types': dict(stats.types),
+                    'presence': f"{(stats.count / total_docs * 100):.1f}%",
+                    'count': stats.count,
+                    'null_count': stats.null_count,
+                    'nested': stats.nested,
+                    'array': stats.array,
+                    'sample_values': list(stats.sample_values)  # First 5 samples
                 }
             
+            self._field_cache[cache_key] = (time.time(), result)
             return result
             
         except Exception as e:
             self.logger.error(f"Error analyzing field types: {e}")
             return {}
     
-    def _analyze_document(self, doc: Dict, field_info: Dict, prefix: str = ''):
+    def _sample_documents(self, collection_name: str, size: int,
+                          total: Optional[int] = None) -> Iterator[Dict]:
+        """
+        Sample documents from a collection
+        
+        Uses the $sample aggregation stage so MongoDB picks a random subset
+        server-side. Small collections fall back to a plain $limit, since
+        $sample degrades to a collection scan plus sort there. Top-level
+        strings and arrays are truncated on the server to the prefixes
+        _analyze_document actually looks at.
+        
+        Args:
+            collection_name: Collection name
+            size: Number of documents to sample
+            total: Estimated document count, if already known (fetched otherwise)
+        
+        Returns:
+            Cursor over the sampled documents
+        """
+        collection = self.connector.db[collection_name]
+        if total is None:
+            total = collection.estimated_document_count()
+        
+        if total < size * 3:
+            first_stage = {'$limit': size}
+        else:
+            self.logger.info(f"Sampling {size} of {total:,} documents via $sample")
+            first_stage = {'$sample': {'size': size}}
+        
+        pipeline = [first_stage, {'$project': {'_id': 0}}]
+        
+        keys = self._discover_top_level_keys(collection, total)
+        truncate_stage = self._build_truncate_stage(keys)
+        if truncate_stage:
+            pipeline.append(truncate_stage)
+        
+        # Documents are decoded to plain dicts on purpose: the analysis keeps
+        # sample values, so RawBSONDocument would only defer the same decode.
+        # Truncating on the server is what keeps the decode cost small.
+        return collection.aggregate(pipeline, allowDiskUse=True, batchSize=500)
+    
+    def _discover_top_level_keys(self, collection, total: int, size: int = 50) -> List[str]:
+        """
+        Discover top-level field names from a small sample
+        
+        Only the key names travel over the wire; values stay on the server.
+        
+        Args:
+            collection: PyMongo collection
+            total: Estimated number of documents in the collection
+            size: Number of documents to inspect
+        
+        Returns:
+            List of top-level field names
+        """
+        first_stage = {'$limit': size} if total < size * 3 else {'$sample': {'size': size}}
+        pipeline = [
+            first_stage,
+            {'$project': {'_id': 0, 'keys': {'$map': {
+                'input': {'$objectToArray': '$$ROOT'},
+                'in': '$$this.k'
+            }}}},
+            {'$unwind': '$keys'},
+            {'$group': {'_id': '$keys'}}
+        ]
+        return [doc['_id'] for doc in collection.aggregate(pipeline)]
+    
+    def _build_truncate_stage(self, keys: List[str]) -> Optional[Dict]:
         """
-        Recursively analyze a document's fields
+        Build an $addFields stage capping strings at 50 chars and arrays at 3 items
+        
+        Args:
+            keys: Top-level field names
+        
+        Returns:
+            $addFields stage, or None if no field can be projected
+        """
+        fields = {}
+        for key in keys:
+            # Field paths cannot reference these names
+            if key == '_id' or key.startswith('$') or '.' in key:
+                continue
+            
+            ref = f"${key}"
+            fields[key] = {'$switch': {
+                'branches': [
+                    {'case': {'$eq': [{'$type': ref}, 'string']},
+                     'then': {'$substrCP': [ref, 0, 50]}},
+                    {'case': {'$isArray': ref},
+                     'then': {'$slice': [ref, 3]}}
+                ],
+                'default': ref
+            }}
+        
+        return {'$addFields': fields} if fields else None
+    
+    def _analyze_document(self, doc: Dict, field_info: Dict, prefix: str = '',
+                          path_cache: Optional[Dict[str, Dict[str, str]]] = None,
+                          max_depth: int = 8):
+        """
+        Analyze a document's fields, including nested objects
+        
+        Nested objects are walked with an explicit stack of item iterators
+        rather than recursion; a nested object's fields are still visited
+        right after the object itself, so field order is preserved.
         
         Args:
             doc: Document to analyze
-            field_info: Dictionary to store field information
+            field_info: Mapping of field path to FieldStats
             prefix: Field path prefix for nested fields
+            path_cache: prefix -> key -> interned field path, shared across
+                the documents of one analysis so paths are built only once
+            max_depth: Maximum number of nested object levels to descend into;
+                deeper objects are counted as 'object' but not expanded
         """
-        for key, value in doc.items():
-            if key == '_id':
-                continue  # Skip _id field
-            
-            field_path = f"{prefix}.{key}" if prefix else key
-            
-            # Increment field count
-            field_info[field_path]['count'] += 1
+        if path_cache is None:
+            path_cache = {}
+        
+        # Bind globals and bound methods to locals for the hot loop
+        lookup_type = _TYPE_NAMES.get
+        classify = _classify_value
+        sampled_types = _SAMPLED_TYPES
+        intern = sys.intern
+        cache_paths = path_cache.setdefault
+        
+        stack = [(iter(doc.items()), prefix, cache_paths(prefix, {}))]
+        push = stack.append
+        
+        while stack:
+            items, prefix, paths = stack[-1]
             
-            # Determine type
-            if value is None:
-                field_info[field_path]['null_count'] += 1
-                field_info[field_path]['types']['null'] += 1
-            elif isinstance(value, bool):
-                field_info[field_path]['types']['boolean'] += 1
-                if len(field_info[field_path]['sample_values']) < 5:
-                    field_info[field_path]['sample_values'].append(value)
-            elif isinstance(value, int):
-                field_info[field_path]['types']['integer'] += 1
-                if len(field_info[field_path]['sample_values']) < 5:
-                    field_info[field_path]['sample_values'].append(value)
-            elif isinstance(value, float):
-                field_info[field_path]['types']['float'] += 1
-                if len(field_info[field_path]['sample_values']) < 5:
-                    field_info[field_path]['sample_values'].append(value)
-            elif isinstance(value, str):
-                field_info[field_path]['types']['string'] += 1
-                if len(field_info[field_path]['sample_values']) < 5:
-                    field_info[field_path]['sample_values'].append(value[:50])  # Truncate
-            elif isinstance(value, list):
-                field_info[field_path]['array'] = True
-                if value:
-                    # Check array element types
-                    element_type = type(value[0]).__name__
-                    field_info[field_path]['types'][f'array<{element_type}>'] += 1
-                    if len(field_info[field_path]['sample_values']) < 5:
-                        field_info[field_path]['sample_values'].append(value[:3])  # First 3 elements
+            for key, value in items:
+                if key == '_id':
+                    continue  # Skip _id field
+                
+                field_path = paths.get(key)
+                if field_path is None:
+                    field_path = paths[key] = intern(f"{prefix}.{key}" if prefix else key)
+                stats = field_info[field_path]
+                types = stats.types
+                
+                # Increment field count
+                stats.count += 1
+                
+                # Determine type
+                type_name = lookup_type(type(value)) or classify(value)
+                
+                if type_name == 'null':
+                    stats.null_count += 1
+                    types['null'] += 1
+                elif type_name == 'array':
+                    stats.array = True
+                    if value:
+                        # Check array element types
+                        element_type = type(value[0]).__name__
+                        types[f'array<{element_type}>'] += 1
+                        if not stats.sample_full:
+                            stats.add_sample(value[:3])  # First 3 elements
+                    else:
+                        types['array<empty>'] += 1
+                elif type_name == 'object':
+                    stats.nested = True
+                    types['object'] += 1
+                    # Descend into the nested object, resume this one afterwards
+                    if len(stack) <= max_depth:
+                        push((iter(value.items()), field_path, cache_paths(field_path, {})))
+                        break
                 else:
-                    field_info[field_path]['types']['array<empty>'] += 1
-            elif isinstance(value, dict):
-                field_info[field_path]['nested'] = True
-                field_info[field_path]['types']['object'] += 1
-                # Recursively analyze nested object
-                self._analyze_document(value, field_info, prefix=field_path)
+                    types[type_name] += 1
+                    if not stats.sample_full and type_name in sampled_types:
+                        stats.add_sample(value[:50] if type_name == 'string' else value)
             else:
-                field_info[field_path]['types'][type(value).__name__] += 1
+                stack.pop()
     
-    def infer_relationships(self, collection_name: str, sample_size: int = 1000) -> List[Dict[str, Any]]:
+    def infer_relationships(self, collection_name: str, sample_size: int = 1000,
+                            collections: Optional[List[str]] = None,
+                            fields: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """
         Infer potential relationships based on field naming patterns
         
         Args:
             collection_name: Collection name
             sample_size: Number of documents to sample
+            collections: Known collection names (fetched on demand if not provided)
+            fields: Result of analyze_field_types, if already computed
         
         Returns:
             List of potential relationships
         """
         try:
             relationships = []
+            all_collections = set(collections) if collections is not None else None
             
             # Get field information
-            fields = self.analyze_field_types(collection_name, sample_size)
+            if fields is None:
+                fields = self.analyze_field_types(collection_name, sample_size)
             
             # Look for fields that might be foreign keys
             for field_name, field_info in fields.items():
-                # Check for _id suffix pattern
-                if field_name.endswith('_id') and field_info['type'] in ['string', 'ObjectId']:
-                    potential_target = field_name[:-3] + 's'  # e.g., user_id -> users
-                    
-                    # Check if target collection exists
-                    collections = self.connector.get_collections()
-                    if potential_target in collections:
+                if field_info['type'] not in ('string', 'ObjectId'):
+                    continue
+                
+                entity = _match_foreign_key(field_name.rsplit('.', 1)[-1])
+                if not entity:
+                    continue
+                
+                # Check if target collection exists
+                if all_collections is None:
+                    all_collections = set(self.connector.get_collections())
+                
+                # e.g., user_id -> users, falling back to a singular collection name
+                for potential_target in (entity + 's', entity):
+                    if potential_target in all_collections:
                         relationships.append({
                             'from_collection': collection_name,
                             'from_field': field_name,
@@ -175,6 +407,7 @@ class MongoDBSchemaExplorer:
                             'type': 'reference',
                             'confidence': 'high'
                         })
+                        break
             
             return relationships
             
@@ -182,33 +415,45 @@ class MongoDBSchemaExplorer:
             self.logger.error(f"Error inferring relationships: {e}")
             return []
     
-    def get_collection_schema(self, collection_name: str, sample_size: int = 1000) -> Dict[str, Any]:
+    def get_collection_schema(self, collection_name: str, sample_size: int = 1000,
+                              collections: Optional[List[str]] = None) -> Dict[str, Any]:
         """
         Get complete schema information for a collection
         
+        The document count is estimated from collection metadata rather
+        than counted, so it may be slightly off after unclean shutdowns or
+        with orphaned documents on sharded clusters; that is acceptable for
+        a schema overview.
+        
         Args:
             collection_name: Collection name
             sample_size: Number of documents to sample
+            collections: Known collection names, passed on to infer_relationships
         
         Returns:
             Complete schema information
         """
         try:
-            # Get basic stats
-            count = self.connector.count_documents(collection_name)
-            
-            # Analyze fields
-            fields = self.analyze_field_types(collection_name, sample_size)
+            collection = self.connector.db[collection_name]
             
-            # Infer relationships
-            relationships = self.infer_relationships(collection_name, sample_size)
+            # The estimate is read once: it is reported as the document count
+            # and also picks the sampling strategy
+            count = collection.estimated_document_count()
             
-            # Get sample document
-            sample = self.connector.find_one(collection_name)
+            # The cached sample document + index list are read in the
+            # background while the fields are sampled
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                metadata_future = executor.submit(self._get_collection_metadata, collection_name)
+                
+                # Analyze fields
+                fields = self.analyze_field_types(collection_name, sample_size, total=count)
+                
+                # Infer relationships
+                relationships = self.infer_relationships(collection_name, sample_size, collections, fields)
+                
+                # Get sample document and indexes
+                sample, indexes = metadata_future.result()
             
-            # Get indexes
-            collection = self.connector.db[collection_name]
-            indexes = list(collection.list_indexes())
             index_info = []
             for idx in indexes:
                 index_info.append({
@@ -232,12 +477,43 @@ class MongoDBSchemaExplorer:
             self.logger.error(f"Error getting collection schema: {e}")
             return {}
     
-    def get_database_schema(self, sample_size: int = 1000) -> Dict[str, Any]:
+    def _get_collection_metadata(self, collection_name: str) -> Tuple[Optional[Dict], List[Dict]]:
+        """
+        Get a sample document and the index definitions of a collection
+        
+        MongoDB has no command listing the indexes of every collection at
+        once, so these are fetched per collection and cached with the same
+        TTL as field analyses.
+        
+        Args:
+            collection_name: Collection name
+        
+        Returns:
+            Tuple of (sample document, index definitions)
+        """
+        cached = self._metadata_cache.get(collection_name)
+        if cached and time.time() - cached[0] < self._ttl_seconds:
+            return cached[1]
+        
+        sample = self.connector.find_one(collection_name)
+        indexes = list(self.connector.db[collection_name].list_indexes())
+        
+        self._metadata_cache[collection_name] = (time.time(), (sample, indexes))
+        return sample, indexes
+    
+    def get_database_schema(self, sample_size: int = 1000,
+                            max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Get complete schema for entire database
         
+        Collections are analyzed concurrently; MongoClient is thread-safe
+        and serves the workers from its connection pool.
+        
         Args:
             sample_size: Number of documents to sample per collection
+            max_workers: Maximum number of collections analyzed in parallel
+                (default: half the connection pool, since each collection
+                keeps two operations in flight)
         
         Returns:
             Complete database schema
@@ -245,16 +521,23 @@ class MongoDBSchemaExplorer:
         try:
             collections = self.connector.get_collections()
             
+            if max_workers is None:
+                max_workers = max(1, self.connector.max_pool_size // 2)
+            
             database_schema = {
                 'database': self.connector.database_name,
                 'total_collections': len(collections),
                 'collections': {}
             }
             
-            for collection in collections:
+            def analyze(collection: str) -> Dict[str, Any]:
                 self.logger.info(f"Analyzing collection: {collection}")
-                schema = self.get_collection_schema(collection, sample_size)
-                database_schema['collections'][collection] = schema
+                return self.get_collection_schema(collection, sample_size, collections)
+            
+            with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(collections)))) as executor:
+                schemas = executor.map(analyze, collections)
+                for collection, schema in zip(collections, schemas):
+                    database_schema['collections'][collection] = schema
             
             return database_schema
             
@@ -273,64 +556,60 @@ class MongoDBSchemaExplorer:
             Schema summary as string
         """
         try:
-            lines = []
-            
-            if 'database' in schema:
-                # Database-level schema
-                lines.append(f"Database: {schema['database']}")
-                lines.append(f"Collections: {schema['total_collections']}")
-                lines.append("")
-                
-                for coll_name, coll_schema in schema.get('collections', {}).items():
-                    lines.extend(self._format_collection_summary(coll_schema))
-                    lines.append("")
-            else:
-                # Single collection schema
-                lines.extend(self._format_collection_summary(schema))
-            
-            return "\n".join(lines)
+            return "\n".join(self._iter_schema_summary(schema))
             
         except Exception as e:
             self.logger.error(f"Error generating schema summary: {e}")
             return ""
     
-    def _format_collection_summary(self, schema: Dict[str, Any]) -> List[str]:
-        """Format a single collection schema summary"""
-        lines = []
-        
-        lines.append(f"Collection: {schema.get('collection', 'unknown')}")
-        lines.append(f"  Documents: {schema.get('document_count', 0):,}")
+    def _iter_schema_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield schema summary lines for a database or single collection schema"""
+        if 'database' in schema:
+            # Database-level schema
+            yield f"Database: {schema['database']}"
+            yield f"Collections: {schema['total_collections']}"
+            yield ""
+            
+            for coll_name, coll_schema in schema.get('collections', {}).items():
+                yield from self._iter_collection_summary(coll_schema)
+                yield ""
+        else:
+            # Single collection schema
+            yield from self._iter_collection_summary(schema)
+    
+    def _iter_collection_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield summary lines for a single collection schema"""
+        yield f"Collection: {schema.get('collection', 'unknown')}"
+        yield f"  Documents: {schema.get('document_count', 0):,}"
         
         # Fields
         fields = schema.get('fields', {})
         if fields:
-            lines.append(f"  Fields ({len(fields)}):")
-            for field_name, field_info in list(fields.items())[:20]:  # Limit to 20 fields
+            yield f"  Fields ({len(fields)}):"
+            for field_name, field_info in islice(fields.items(), 20):  # Limit to 20 fields
                 type_str = field_info['type']
                 if field_info.get('array'):
                     type_str = f"[{type_str}]"
                 if field_info.get('nested'):
                     type_str = f"{{{type_str}}}"
                 
-                lines.append(f"    - {field_name}: {type_str} (present in {field_info['presence']})")
+                yield f"    - {field_name}: {type_str} (present in {field_info['presence']})"
         
         # Relationships
         relationships = schema.get('relationships', [])
         if relationships:
-            lines.append(f"  Relationships ({len(relationships)}):")
+            yield f"  Relationships ({len(relationships)}):"
             for rel in relationships:
-                lines.append(f"    - {rel['from_field']} → {rel['to_collection']}")
+                yield f"    - {rel['from_field']} → {rel['to_collection']}"
         
         # Indexes
         indexes = schema.get('indexes', [])
         if indexes:
-            lines.append(f"  Indexes ({len(indexes)}):")
+            yield f"  Indexes ({len(indexes)}):"
             for idx in indexes:
                 keys = ', '.join(idx['keys'])
                 unique = ' (unique)' if idx.get('unique') else ''
-                lines.append(f"    - {idx['name']}: {keys}{unique}")
-        
-        return lines
+                yield f"    - {idx['name']}: {keys}{unique}"
     
     def generate_llm_context(self, collection_name: Optional[str] = None) -> str:
         """
@@ -345,26 +624,24 @@ class MongoDBSchemaExplorer:
         try:
             if collection_name:
                 schema = self.get_collection_schema(collection_name)
-                return self._format_llm_collection(schema)
+                return "\n".join(self._iter_llm_collection(schema))
             else:
                 schema = self.get_database_schema()
-                return self._format_llm_database(schema)
+                return "\n".join(self._iter_llm_database(schema))
                 
         except Exception as e:
             self.logger.error(f"Error generating LLM context: {e}")
             return ""
     
-    def _format_llm_collection(self, schema: Dict[str, Any]) -> str:
-        """Format collection schema for LLM"""
-        lines = []
-        
-        lines.append(f"# MongoDB Collection: {schema.get('collection')}")
-        lines.append("")
-        lines.append(f"Total documents: {schema.get('document_count', 0):,}")
-        lines.append("")
+    def _iter_llm_collection(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield collection schema lines for LLM"""
+        yield f"# MongoDB Collection: {schema.get('collection')}"
+        yield ""
+        yield f"Total documents: {schema.get('document_count', 0):,}"
+        yield ""
         
         # Field definitions
-        lines.append("## Fields:")
+        yield "## Fields:"
         fields = schema.get('fields', {})
         for field_name, field_info in fields.items():
             type_info = field_info['type']
@@ -374,39 +651,32 @@ class MongoDBSchemaExplorer:
             examples = field_info.get('sample_values', [])
             example_str = f" (e.g., {examples[0]})" if examples else ""
             
-            lines.append(f"- `{field_name}`: {type_info}{example_str}")
+            yield f"- `{field_name}`: {type_info}{example_str}"
         
         # Relationships
         relationships = schema.get('relationships', [])
         if relationships:
-            lines.append("")
-            lines.append("## Relationships:")
+            yield ""
+            yield "## Relationships:"
             for rel in relationships:
-                lines.append(f"- `{rel['from_field']}` references collection `{rel['to_collection']}`")
-        
-        return "\n".join(lines)
+                yield f"- `{rel['from_field']}` references collection `{rel['to_collection']}`"
     
-    def _format_llm_database(self, schema: Dict[str, Any]) -> str:
-        """Format database schema for LLM"""
-        lines = []
-        
-        lines.append(f"# MongoDB Database: {schema.get('database')}")
-        lines.append("")
-        lines.append(f"Total collections: {schema.get('total_collections')}")
-        lines.append("")
+    def _iter_llm_database(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield database schema lines for LLM"""
+        yield f"# MongoDB Database: {schema.get('database')}"
+        yield ""
+        yield f"Total collections: {schema.get('total_collections')}"
+        yield ""
         
         for coll_name, coll_schema in schema.get('collections', {}).items():
-            lines.append(f"## Collection: {coll_name}")
-            lines.append(f"Documents: {coll_schema.get('document_count', 0):,}")
+            yield f"## Collection: {coll_name}"
+            yield f"Documents: {coll_schema.get('document_count', 0):,}"
             
             # Key fields only (top 10)
             fields = coll_schema.get('fields', {})
-            field_items = list(fields.items())[:10]
-            if field_items:
-                lines.append("Key fields:")
-                for field_name, field_info in field_items:
-                    lines.append(f"  - {field_name}: {field_info['type']}")
+            if fields:
+                yield "Key fields:"
+                for field_name, field_info in islice(fields.items(), 10):
+                    yield f"  - {field_name}: {field_info['type']}"
             
-            lines.append("")
-        
-        return "\n".join(lines)
\ No newline at end of file
+            yield ""
\ No newline at end of file
@@ -5,26 +5,235 @@ Extracts and analyzes Neo4j graph schema
 
 import sys
 import os
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+import json
+import threading
+from typing import Dict, List, Any, Optional, Iterable, Iterator
+from collections import defaultdict, Counter
+from itertools import groupby, islice
+from concurrent.futures import ThreadPoolExecutor
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from connectors.neo4j_connector import Neo4jConnector
 from utils.logger import setup_logger
 
+# apoc.meta.cypher.type() names mapped onto the Python type names used when
+# properties are analyzed client-side, so both paths report the same types
+_APOC_TYPE_NAMES = {
+    'STRING': 'str',
+    'INTEGER': 'int',
+    'FLOAT': 'float',
+    'BOOLEAN': 'bool',
+    'MAP': 'dict',
+    'NULL': 'null',
+    'BYTE[]': 'bytearray',
+    # neo4j.time and neo4j.spatial classes; the driver uses one class for
+    # zoned and local variants, and the point class names which CRS it is
+    'DATE_TIME': 'DateTime',
+    'LOCAL_DATE_TIME': 'DateTime',
+    'DATE': 'Date',
+    'TIME': 'Time',
+    'LOCAL_TIME': 'Time',
+    'DURATION': 'Duration',
+    'POINT': 'Point'
+}
+
+def _apoc_type_name(apoc_type: str) -> str:
+    """Translate an apoc.meta.cypher.type() result into a Python type name"""
+    if apoc_type.startswith('LIST'):
+        return 'list'
+    return _APOC_TYPE_NAMES.get(apoc_type, apoc_type)
+
+def _quote_identifier(name: str) -> str:
+    """Backtick-quote a label or relationship type for use in Cypher"""
+    return "`" + name.replace("`", "``") + "`"
+
+def _truncate_str(value: str) -> str:
+    """First 50 characters of a string sample"""
+    return value[:50]
+
+def _truncate_repr(value: Any) -> str:
+    """First 50 characters of a container sample's repr"""
+    return str(value)[:50]
+
+def _keep(value: Any) -> Any:
+    """Scalar samples are stored as-is"""
+    return value
+
+# Exact-type dispatch for sample formatting: a dict lookup on type(value)
+# is cheaper than walking isinstance checks for every sampled value
+_SAMPLE_FORMATTERS = {
+    str: _truncate_str,
+    list: _truncate_repr,
+    dict: _truncate_repr,
+    int: _keep,
+    float: _keep,
+    bool: _keep
+}
+
+def _truncate_sample(value: Any) -> Any:
+    """Shorten a sample value the way property summaries display it"""
+    formatter = _SAMPLE_FORMATTERS.get(type(value))
+    if formatter is not None:
+        return formatter(value)
+    
+    # Other types, including subclasses of the ones above
+    if isinstance(value, str):
+        return value[:50]
+    if isinstance(value, (list, dict)):
+        return str(value)[:50]
+    return value
+
+def _join_lines(lines: Iterator[str], max_chars: Optional[int] = None) -> str:
+    """Newline-join lines, formatting no more of them than max_chars needs"""
+    if max_chars is None:
+        return "\n".join(lines)
+    
+    parts = []
+    size = 0
+    for line in lines:
+        parts.append(line)
+        size += len(line) + 1
+        if size > max_chars:
+            break
+    return "\n".join(parts)[:max_chars]
+
+# Samples at least this large are summarized with pandas column operations
+_VECTORIZE_THRESHOLD = 1000
+
+# Above this sample size the server-side aggregation (which collect()s the
+# whole sample into one row) is skipped in favour of streaming records
+_STREAMING_SAMPLE_THRESHOLD = 10_000
+
+class PropertyStats:
+    """Running statistics for a single node/relationship property"""
+    
+    __slots__ = ('count', 'null_count', 'types', 'sample_values', 'sample_full')
+    
+    def __init__(self):
+        self.count = 0
+        self.null_count = 0
+        self.types = Counter()
+        self.sample_values = []
+        self.sample_full = False
+    
+    def add_sample(self, value: Any):
+        """Keep a sample value; callers stop once sample_full is set, so the first 5 are kept"""
+        self.sample_values.append(value)
+        self.sample_full = len(self.sample_values) == 5
+    
+    def primary_type(self) -> str:
+        """Most frequent type name, or 'unknown' if none was seen"""
+        return self.types.most_common(1)[0][0] if self.types else 'unknown'
+
 class Neo4jSchemaExplorer:
     """Explores and analyzes Neo4j graph schema"""
     
-    def __init__(self, connector: Neo4jConnector):
+    def __init__(self, connector: Neo4jConnector, approximate_patterns: bool = False,
+                 cache_dir: Optional[str] = None):
         """
         Initialize schema explorer
         
         Args:
             connector: Neo4j connector instance
+            approximate_patterns: Estimate relationship pattern counts from
+                db.schema.visualization() and APOC's count store statistics
+                instead of scanning every relationship
+            cache_dir: Directory to persist graph schemas in between runs
+                (e.g. ~/.cache/nosql_project); disabled when None
         """
         self.connector = connector
+        self.approximate_patterns = approximate_patterns
+        self.cache_dir = os.path.expanduser(cache_dir) if cache_dir else None
         self.logger = setup_logger(__name__)
+        self._apoc_available = None
+        # Labels, relationship types and counts don't change while a schema
+        # is being explored, so each is fetched from the server only once
+        self._cache = {}
+        # One lock per cache key, so threads building a graph schema wait for
+        # a load already in flight instead of running the same query again
+        self._cache_locks: Dict[tuple, threading.Lock] = {}
+        self._cache_locks_guard = threading.Lock()
+    
+    def clear_cache(self):
+        """Drop cached labels, relationship types, counts and graph schemas"""
+        self._cache.clear()
+    
+    def _cached(self, key: tuple, loader):
+        """
+        Return the cached value for key, calling loader on first use
+        
+        Empty lists and dicts are returned but not cached: the connector
+        returns them when a query fails, and a transient error should not
+        stick until clear_cache().
+        """
+        if key in self._cache:
+            return self._cache[key]
+        
+        with self._cache_locks_guard:
+            lock = self._cache_locks.setdefault(key, threading.Lock())
+        
+        with lock:
+            if key in self._cache:
+                return self._cache[key]
+            value = loader()
+            if value is not None and value != [] and value != {}:
+                self._cache[key] = value
+            return value
+    
+    def _count_nodes(self, label: Optional[str] = None) -> int:
+        """Cached node count for a label (or all nodes), from apoc.meta.stats() when available"""
+        def load():
+            stats = self._get_meta_stats()
+            if stats:
+                return stats['nodeCount'] if label is None else stats['labels'].get(label, 0)
+            return self.connector.count_nodes(label)
+        
+        return self._cached(('count_nodes', label), load)
+    
+    def _count_relationships(self, rel_type: Optional[str] = None) -> int:
+        """Cached relationship count for a type (or all relationships), from apoc.meta.stats() when available"""
+        def load():
+            stats = self._get_meta_stats()
+            if stats:
+                if rel_type is None:
+                    return stats['relCount']
+                return stats['relTypes'].get(f"()-[:{rel_type}]->()", 0)
+            return self.connector.count_relationships(rel_type)
+        
+        return self._cached(('count_relationships', rel_type), load)
+    
+    def _has_apoc(self) -> bool:
+        """Check once whether the APOC plugin is installed"""
+        if self._apoc_available is None:
+            result = self.connector.execute_query("RETURN apoc.version() AS version")
+            self._apoc_available = bool(result)
+        return self._apoc_available
+    
+    def _get_meta_stats(self) -> Dict[str, Any]:
+        """Cached apoc.meta.stats() counters, or {} when APOC is not installed"""
+        def load():
+            if not self._has_apoc():
+                return {}
+            result = self.connector.execute_query("""
+            CALL apoc.meta.stats() YIELD labels, relTypes, nodeCount, relCount
+            RETURN labels, relTypes, nodeCount, relCount
+            """)
+            return result[0] if result else {}
+        
+        return self._cached(('meta_stats',), load)
+    
+    def _label_identifier(self, label: str) -> str:
+        """Check a label against the graph's labels and quote it for Cypher"""
+        if label not in self.get_node_labels():
+            raise ValueError(f"Unknown node label: {label}")
+        return _quote_identifier(label)
+    
+    def _rel_type_identifier(self, rel_type: str) -> str:
+        """Check a relationship type against the graph's types and quote it for Cypher"""
+        if rel_type not in self.get_relationship_types():
+            raise ValueError(f"Unknown relationship type: {rel_type}")
+        return _quote_identifier(rel_type)
     
     def get_node_labels(self) -> List[str]:
         """
@@ -33,7 +242,7 @@ class Neo4jSchemaExplorer:
         Returns:
             List of node labels
         """
-        return self.connector.get_labels()
+        return self._cached(('labels',), self.connector.get_labels)
     
     def get_relationship_types(self) -> List[str]:
         """
@@ -42,7 +251,7 @@ class Neo4jSchemaExplorer:
         Returns:
             List of relationship types
         """
-        return self.connector.get_relationship_types()
+        return self._cached(('relationship_types',), self.connector.get_relationship_types)
     
     def analyze_node_properties(self, label: str, sample_size: int = 100) -> Dict[str, Any]:
         """
@@ -56,74 +265,128 @@ class Neo4jSchemaExplorer:
             Dictionary with property information
         """
         try:
+            ident = self._label_identifier(label)
+            
+            if sample_size > _STREAMING_SAMPLE_THRESHOLD or not self._has_apoc():
+                # A single map column comes back flattened to the map itself
+                query = f"""
+                MATCH (n:{ident})
+                RETURN properties(n) AS props
+                LIMIT $k
+                """
+                return self._summarize_node_properties(
+                    self.connector.stream_query(query, {'k': sample_size})
+                )
+            
+            # Group property types server-side so only per-property
+            # aggregates cross the wire instead of every sampled node
             query = f"""
-            MATCH (n:{label})
-            RETURN n
-            LIMIT {sample_size}
+            MATCH (n:{ident})
+            WITH n LIMIT $k
+            WITH collect(n) AS nodes
+            WITH nodes, size(nodes) AS total
+            UNWIND range(0, total - 1) AS i
+            WITH total, i, keys(nodes[i]) AS ks, nodes[i] AS n
+            UNWIND range(0, size(ks) - 1) AS j
+            WITH total, i, j, ks[j] AS key, n[ks[j]] AS value
+            RETURN key, apoc.meta.cypher.type(value) AS type, count(*) AS count,
+                   collect(value)[0..5] AS samples, total, min([i, j]) AS first_seen
+            ORDER BY key
             """
             
-            results = self.connector.execute_query(query)
+            results = self.connector.execute_query(query, {'k': sample_size})
             
-            if not results:
-                return {}
+            return self._summarize_grouped_properties(results, node_properties=True)
             
-            # Track property information
-            property_info = defaultdict(lambda: {
-                'count': 0,
-                'types': defaultdict(int),
-                'null_count': 0,
-                'sample_values': []
-            })
+        except Exception as e:
+            self.logger.error(f"Error analyzing node properties: {e}")
+            return {}
+    
+    def _summarize_node_properties(self, nodes: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate property statistics over sampled node property maps (consumed once)"""
+        if isinstance(nodes, list) and len(nodes) >= _VECTORIZE_THRESHOLD:
+            return self._summarize_node_frame(nodes)
+        
+        total_nodes = 0
+        
+        # Track property information
+        property_info = defaultdict(PropertyStats)
+        
+        # Analyze each node
+        for node in nodes:
+            total_nodes += 1
             
-            # Analyze each node
-            for record in results:
-                node = record.get('n', {})
+            # Track which properties exist in this node
+            for key, value in node.items():
+                stats = property_info[key]
+                stats.count += 1
                 
-                # Track which properties exist in this node
-                for key, value in node.items():
-                    property_info[key]['count'] += 1
-                    
-                    if value is None:
-                        property_info[key]['null_count'] += 1
-                        property_info[key]['types']['null'] += 1
-                    else:
-                        value_type = type(value).__name__
-                        property_info[key]['types'][value_type] += 1
-                        
-                        # Store sample values
-                        if len(property_info[key]['sample_values']) < 5:
-                            if isinstance(value, str):
-                                property_info[key]['sample_values'].append(value[:50])
-                            elif isinstance(value, (list, dict)):
-                                property_info[key]['sample_values'].append(str(value)[:50])
-                            else:
-                                property_info[key]['sample_values'].append(value)
-            
-            # Calculate statistics
-            total_nodes = len(results)
-            result = {}
-            
-            for prop, info in property_info.items():
-                # Determine primary type
-                if info['types']:
-                    primary_type = max(info['types'].items(), key=lambda x: x[1])[0]
+                if value is None:
+                    stats.null_count += 1
+                    stats.types['null'] += 1
                 else:
-                    primary_type = 'unknown'
-                
-                result[prop] = {
-                    'type': primary_type,
-                    'all_types': dict(info['types']),
-                    'presence': f"{(info['count'] / total_nodes * 100):.1f}%",
-                    'count': info['count'],
-                    'null_count': info['null_count'],
-                    'sample_values': info['sample_values']
-                }
-            
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing node properties: {e}")
+                    stats.types[type(value).__name__] += 1
+                    
+                    # Store sample values
+                    if not stats.sample_full:
+                        stats.add_sample(_truncate_sample(value))
+        
+        if not total_nodes:
             return {}
+        
+        # Calculate statistics
+        result = {}
+        
+        for prop, stats in property_info.items():
+            result[prop] = {
+                'type': stats.primary_type(),
+                'all_types': dict(stats.types),
+                'presence': f"{(stats.count / total_nodes * 100):.1f}%",
+                'count': stats.count,
+                'null_count': stats.null_count,
+                'sample_values': stats.sample_values
+            }
+        
+        return result
+    
+    def _summarize_node_frame(self, nodes: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Column-wise variant of _summarize_node_properties for large samples
+        
+        Presence is counted per column in C instead of per property in Python.
+        Neo4j never stores null properties, so a missing value and a null are
+        treated alike and null_count is always 0.
+        
+        Args:
+            nodes: Sampled node property maps
+        
+        Returns:
+            Dictionary with property information
+        """
+        import pandas as pd
+        
+        # dtype=object keeps the original Python values (no int -> float upcasts)
+        frame = pd.DataFrame(nodes, dtype=object)
+        present = frame.notna().sum()
+        total_nodes = len(frame)
+        result = {}
+        
+        for prop in frame.columns:
+            values = frame[prop].dropna()
+            type_counts = values.map(type).value_counts(sort=False)
+            types = Counter({value_type.__name__: int(count) for value_type, count in type_counts.items()})
+            count = int(present[prop])
+            
+            result[prop] = {
+                'type': types.most_common(1)[0][0] if types else 'unknown',
+                'all_types': dict(types),
+                'presence': f"{(count / total_nodes * 100):.1f}%",
+                'count': count,
+                'null_count': 0,
+                'sample_values': [_truncate_sample(v) for v in values.head(5)]
+            }
+        
+        return result
     
     def analyze_relationship_properties(self, rel_type: str, sample_size: int = 100) -> Dict[str, Any]:
         """
@@ -137,59 +400,198 @@ class Neo4jSchemaExplorer:
             Dictionary with property information
         """
         try:
+            ident = self._rel_type_identifier(rel_type)
+            
+            if sample_size > _STREAMING_SAMPLE_THRESHOLD or not self._has_apoc():
+                query = f"""
+                MATCH ()-[r:{ident}]->()
+                RETURN properties(r) AS props
+                LIMIT $k
+                """
+                return self._summarize_relationship_properties(
+                    self.connector.stream_query(query, {'k': sample_size})
+                )
+            
             query = f"""
-            MATCH ()-[r:{rel_type}]->()
-            RETURN r
-            LIMIT {sample_size}
+            MATCH ()-[r:{ident}]->()
+            WITH r LIMIT $k
+            WITH collect(r) AS rels
+            WITH rels, size(rels) AS total
+            UNWIND range(0, total - 1) AS i
+            WITH total, i, keys(rels[i]) AS ks, rels[i] AS r
+            UNWIND range(0, size(ks) - 1) AS j
+            WITH total, i, j, ks[j] AS key, r[ks[j]] AS value
+            RETURN key, apoc.meta.cypher.type(value) AS type, count(*) AS count,
+                   collect(value)[0..5] AS samples, total, min([i, j]) AS first_seen
+            ORDER BY key
             """
             
-            results = self.connector.execute_query(query)
+            results = self.connector.execute_query(query, {'k': sample_size})
             
-            if not results:
-                return {}
+            return self._summarize_grouped_properties(results, node_properties=False)
             
-            # Track property information
-            property_info = defaultdict(lambda: {
-                'count': 0,
-                'types': defaultdict(int),
-                'sample_values': []
-            })
+        except Exception as e:
+            self.logger.error(f"Error analyzing relationship properties: {e}")
+            return {}
+    
+    def _summarize_relationship_properties(self, rels: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate property statistics over sampled relationship property maps (consumed once)"""
+        total_rels = 0
+        
+        # Track property information
+        property_info = defaultdict(PropertyStats)
+        
+        # Analyze each relationship
+        for rel in rels:
+            total_rels += 1
             
-            # Analyze each relationship
-            for record in results:
-                rel = record.get('r', {})
+            for key, value in rel.items():
+                stats = property_info[key]
+                stats.count += 1
                 
-                for key, value in rel.items():
-                    property_info[key]['count'] += 1
+                if value is not None:
+                    stats.types[type(value).__name__] += 1
                     
-                    if value is not None:
-                        value_type = type(value).__name__
-                        property_info[key]['types'][value_type] += 1
-                        
-                        if len(property_info[key]['sample_values']) < 5:
-                            property_info[key]['sample_values'].append(value)
-            
-            # Calculate statistics
-            total_rels = len(results)
-            result = {}
-            
-            for prop, info in property_info.items():
-                if info['types']:
-                    primary_type = max(info['types'].items(), key=lambda x: x[1])[0]
-                else:
-                    primary_type = 'unknown'
-                
+                    if not stats.sample_full:
+                        stats.add_sample(value)
+        
+        if not total_rels:
+            return {}
+        
+        # Calculate statistics
+        result = {}
+        
+        for prop, stats in property_info.items():
+            result[prop] = {
+                'type': stats.primary_type(),
+                'presence': f"{(stats.count / total_rels * 100):.1f}%",
+                'sample_values': stats.sample_values
+            }
+        
+        return result
+    
+    def _summarize_grouped_properties(self, rows: List[Dict[str, Any]],
+                                      node_properties: bool) -> Dict[str, Any]:
+        """
+        Build property statistics from server-side (key, type) aggregate rows
+        
+        Rows arrive sorted by key for grouping; properties are returned in the
+        order they first appear in the sample, like the client-side summaries.
+        
+        Args:
+            rows: Rows with key, type, count, samples, total and first_seen
+                ([sample index, key index]) columns
+            node_properties: Use the node summary shape (all_types, counts, truncated samples)
+        
+        Returns:
+            Dictionary with property information
+        """
+        if not rows:
+            return {}
+        
+        total = rows[0]['total']
+        result = {}
+        first_seen = {}
+        
+        for prop, group in groupby(rows, key=lambda row: row['key']):
+            types = Counter()
+            samples = []
+            for row in group:
+                if prop not in first_seen or row['first_seen'] < first_seen[prop]:
+                    first_seen[prop] = row['first_seen']
+                type_name = _apoc_type_name(row['type'])
+                types[type_name] += row['count']
+                if type_name != 'null':
+                    samples.extend(_truncate_sample(v) if node_properties else v
+                                   for v in row['samples'])
+            
+            count = sum(types.values())
+            null_count = types.get('null', 0)
+            if not node_properties:
+                types.pop('null', None)
+            
+            primary_type = types.most_common(1)[0][0] if types else 'unknown'
+            
+            if node_properties:
                 result[prop] = {
                     'type': primary_type,
-                    'presence': f"{(info['count'] / total_rels * 100):.1f}%",
-                    'sample_values': info['sample_values']
+                    'all_types': dict(types),
+                    'presence': f"{(count / total * 100):.1f}%",
+                    'count': count,
+                    'null_count': null_count,
+                    'sample_values': samples[:5]
                 }
+            else:
+                result[prop] = {
+                    'type': primary_type,
+                    'presence': f"{(count / total * 100):.1f}%",
+                    'sample_values': samples[:5]
+                }
+        
+        return {prop: result[prop] for prop in sorted(result, key=first_seen.__getitem__)}
+    
+    def _get_pattern_rows(self) -> List[Dict[str, Any]]:
+        """
+        Count relationships per (source labels, type, target labels) combination
+        
+        This is the only query that scans every relationship; the graph-wide
+        label patterns, the per-type patterns and the per-label connections of
+        a graph schema are all derived from its rows, and the rows are cached
+        like the other graph metadata.
+        
+        Returns:
+            Rows with source_labels, rel_type, target_labels and count, by count descending
+        """
+        def load():
+            if self.approximate_patterns:
+                rows = self._estimate_pattern_rows()
+                if rows is not None:
+                    return rows
             
-            return result
-            
-        except Exception as e:
-            self.logger.error(f"Error analyzing relationship properties: {e}")
-            return {}
+            query = """
+            MATCH (a)-[r]->(b)
+            RETURN labels(a) AS source_labels, type(r) AS rel_type, labels(b) AS target_labels, count(*) AS count
+            ORDER BY count DESC
+            """
+            return self.connector.execute_query(query)
+        
+        return self._cached(('pattern_rows',), load)
+    
+    def _estimate_pattern_rows(self) -> Optional[List[Dict[str, Any]]]:
+        """
+        Estimate pattern rows from the schema graph and count store statistics
+        
+        db.schema.visualization() gives the (label)-[type]->(label) combinations
+        without touching the data; each count is the smaller of the count store's
+        (:Source)-[:TYPE]->() and ()-[:TYPE]->(:Target) totals, so it is an upper
+        bound rather than an exact figure.
+        
+        Returns:
+            Pattern rows in the same shape as the full scan, or None if APOC is unavailable
+        """
+        rel_counts = self._get_meta_stats().get('relTypes')
+        if not rel_counts:
+            return None
+        
+        query = """
+        CALL db.schema.visualization() YIELD relationships
+        UNWIND relationships AS rel
+        RETURN startNode(rel).name AS source_label, type(rel) AS rel_type, endNode(rel).name AS target_label
+        """
+        rows = []
+        for rec in self.connector.execute_query(query):
+            source, rel_type, target = rec['source_label'], rec['rel_type'], rec['target_label']
+            count = min(rel_counts.get(f"(:{source})-[:{rel_type}]->()", 0),
+                        rel_counts.get(f"()-[:{rel_type}]->(:{target})", 0))
+            rows.append({
+                'source_labels': [source],
+                'rel_type': rel_type,
+                'target_labels': [target],
+                'count': count
+            })
+        
+        rows.sort(key=lambda row: row['count'], reverse=True)
+        return rows
     
     def get_relationship_patterns(self) -> List[Dict[str, Any]]:
         """
@@ -199,32 +601,45 @@ class Neo4jSchemaExplorer:
             List of relationship patterns
         """
         try:
-            query = """
-            MATCH (a)-[r]->(b)
-            WITH labels(a) as source_labels, type(r) as rel_type, labels(b) as target_labels
-            UNWIND source_labels as source_label
-            UNWIND target_labels as target_label
-            RETURN DISTINCT source_label, rel_type, target_label, count(*) as count
-            ORDER BY count DESC
-            """
-            
-            results = self.connector.execute_query(query)
-            
-            patterns = []
-            for record in results:
-                patterns.append({
-                    'source_label': record['source_label'],
-                    'relationship_type': record['rel_type'],
-                    'target_label': record['target_label'],
-                    'count': record['count']
-                })
-            
-            return patterns
+            return self._cached(('patterns',), self._aggregate_label_patterns)
             
         except Exception as e:
             self.logger.error(f"Error getting relationship patterns: {e}")
             return []
     
+    def _aggregate_label_patterns(self) -> List[Dict[str, Any]]:
+        """Fold the pattern rows into per-label (label)-[type]->(label) counts"""
+        counts = Counter()
+        for row in self._get_pattern_rows():
+            for source_label in row['source_labels']:
+                for target_label in row['target_labels']:
+                    counts[(source_label, row['rel_type'], target_label)] += row['count']
+        
+        patterns = []
+        for (source_label, rel_type, target_label), count in counts.most_common():
+            patterns.append({
+                'source_label': source_label,
+                'relationship_type': rel_type,
+                'target_label': target_label,
+                'count': count
+            })
+        
+        return patterns
+    
+    def _get_patterns_by_type(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Group the pattern rows by relationship type (cached)"""
+        def group():
+            patterns = defaultdict(list)
+            for row in self._get_pattern_rows():
+                patterns[row['rel_type']].append({
+                    'source_labels': row['source_labels'],
+                    'target_labels': row['target_labels'],
+                    'count': row['count']
+                })
+            return dict(patterns)
+        
+        return self._cached(('patterns_by_type',), group)
+    
     def get_node_schema(self, label: str, sample_size: int = 100) -> Dict[str, Any]:
         """
         Get complete schema information for a node label
@@ -237,27 +652,42 @@ class Neo4jSchemaExplorer:
             Complete node schema information
         """
         try:
-            # Get node count
-            count = self.connector.count_nodes(label)
-            
-            # Analyze properties
-            properties = self.analyze_node_properties(label, sample_size)
+            ident = self._label_identifier(label)
             
-            # Get outgoing relationships
-            outgoing_query = f"""
-            MATCH (n:{label})-[r]->(m)
-            RETURN DISTINCT type(r) as rel_type, labels(m) as target_labels, count(*) as count
-            ORDER BY count DESC
+            # Count, outgoing/incoming aggregates and the property sample
+            # are fetched together in one round-trip
+            query = f"""
+            MATCH (n:{ident})
+            WITH count(n) AS node_count
+            CALL {{
+                MATCH (n:{ident})-[r]->(m)
+                WITH type(r) AS rel_type, labels(m) AS target_labels, count(*) AS count
+                ORDER BY count DESC
+                RETURN collect({{rel_type: rel_type, target_labels: target_labels, count: count}}) AS outgoing
+            }}
+            CALL {{
+                MATCH (m)-[r]->(n:{ident})
+                WITH type(r) AS rel_type, labels(m) AS source_labels, count(*) AS count
+                ORDER BY count DESC
+                RETURN collect({{rel_type: rel_type, source_labels: source_labels, count: count}}) AS incoming
+            }}
+            CALL {{
+                MATCH (n:{ident})
+                WITH n LIMIT $k
+                RETURN collect(properties(n)) AS samples
+            }}
+            RETURN node_count, outgoing, incoming, samples
             """
-            outgoing = self.connector.execute_query(outgoing_query)
+            results = self.connector.execute_query(query, {'k': sample_size})
+            if not results:
+                return {}
             
-            # Get incoming relationships
-            incoming_query = f"""
-            MATCH (m)-[r]->(n:{label})
-            RETURN DISTINCT type(r) as rel_type, labels(m) as source_labels, count(*) as count
-            ORDER BY count DESC
-            """
-            incoming = self.connector.execute_query(incoming_query)
+            record = results[0]
+            count = record['node_count']
+            self._cache[('count_nodes', label)] = count
+            properties = self._summarize_node_properties(record['samples'])
+            outgoing = record['outgoing']
+            incoming = record['incoming']
             
             schema = {
                 'label': label,
@@ -287,44 +717,49 @@ class Neo4jSchemaExplorer:
             self.logger.error(f"Error getting node schema: {e}")
             return {}
     
-    def get_relationship_schema(self, rel_type: str, sample_size: int = 100) -> Dict[str, Any]:
+    def get_relationship_schema(self, rel_type: str, sample_size: int = 100,
+                                patterns: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Get complete schema information for a relationship type
         
         Args:
             rel_type: Relationship type
             sample_size: Number of relationships to sample
+            patterns: Precomputed patterns for this type (skips the pattern query)
         
         Returns:
             Complete relationship schema information
         """
         try:
+            ident = self._rel_type_identifier(rel_type)
+            
             # Get relationship count
-            count = self.connector.count_relationships(rel_type)
+            count = self._count_relationships(rel_type)
             
             # Analyze properties
             properties = self.analyze_relationship_properties(rel_type, sample_size)
             
             # Get patterns (what connects to what)
-            pattern_query = f"""
-            MATCH (a)-[r:{rel_type}]->(b)
-            RETURN DISTINCT labels(a) as source_labels, labels(b) as target_labels, count(*) as count
-            ORDER BY count DESC
-            """
-            patterns = self.connector.execute_query(pattern_query)
-            
-            schema = {
-                'relationship_type': rel_type,
-                'relationship_count': count,
-                'properties': properties,
-                'patterns': [
+            if patterns is None:
+                pattern_query = f"""
+                MATCH (a)-[r:{ident}]->(b)
+                RETURN DISTINCT labels(a) as source_labels, labels(b) as target_labels, count(*) as count
+                ORDER BY count DESC
+                """
+                patterns = [
                     {
                         'source_labels': rec['source_labels'],
                         'target_labels': rec['target_labels'],
                         'count': rec['count']
                     }
-                    for rec in patterns
+                    for rec in self.connector.execute_query(pattern_query)
                 ]
+            
+            schema = {
+                'relationship_type': rel_type,
+                'relationship_count': count,
+                'properties': properties,
+                'patterns': patterns
             }
             
             return schema
@@ -333,24 +768,139 @@ class Neo4jSchemaExplorer:
             self.logger.error(f"Error getting relationship schema: {e}")
             return {}
     
-    def get_graph_schema(self, sample_size: int = 100) -> Dict[str, Any]:
+    def ensure_indexes(self, labels: List[str], key: str = 'id') -> int:
+        """
+        Create a range index on a lookup property for each label if missing
+        
+        Args:
+            labels: Node labels to index
+            key: Property to index
+        
+        Returns:
+            Number of labels whose index statement succeeded
+        """
+        created = 0
+        prop = _quote_identifier(key)
+        
+        # Schema statements each need their own transaction, so they cannot
+        # be batched into one query
+        for label in labels:
+            try:
+                ident = self._label_identifier(label)
+                query = f"CREATE INDEX IF NOT EXISTS FOR (n:{ident}) ON (n.{prop})"
+                if self.connector.execute_write(query):
+                    created += 1
+            except Exception as e:
+                self.logger.error(f"Error creating index for {label}: {e}")
+        
+        self.logger.info(f"✓ Ensured {key} indexes on {created} labels")
+        return created
+    
+    def get_graph_schema(self, sample_size: int = 100, max_workers: int = 8,
+                         create_indexes: bool = False) -> Dict[str, Any]:
         """
         Get complete schema for entire graph
         
+        The schema is kept in memory per sample_size until clear_cache() is
+        called. When a cache_dir is configured, it is also read from disk as
+        long as the graph's freshness token (labels, types and total counts)
+        is unchanged.
+        
         Args:
             sample_size: Number of nodes/relationships to sample
+            max_workers: Maximum number of queries run in parallel
+            create_indexes: Create missing id indexes for every label first
+                (leave off for read-only users)
         
         Returns:
             Complete graph schema
         """
+        if create_indexes:
+            self.ensure_indexes(self.get_node_labels())
+        
+        key = ('graph_schema', sample_size)
+        if key in self._cache:
+            return self._cache[key]
+        
+        schema = self._load_graph_schema(sample_size, max_workers)
+        # An empty schema means the build failed; try again next time
+        if schema:
+            self._cache[key] = schema
+        return schema
+    
+    def _load_graph_schema(self, sample_size: int, max_workers: int) -> Dict[str, Any]:
+        """Graph schema from the on-disk cache when still fresh, else from the server"""
+        if not self.cache_dir:
+            return self._build_graph_schema(sample_size, max_workers)
+        
+        try:
+            token = self._freshness_token()
+            path = os.path.join(self.cache_dir, f"{self.connector.database}_{sample_size}.json")
+            
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    cached = json.load(f)
+                if cached.get('token') == token:
+                    self.logger.info(f"Using cached graph schema from {path}")
+                    return cached['schema']
+            
+            schema = self._build_graph_schema(sample_size, max_workers)
+            if schema:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                with open(path, 'w', encoding='utf-8') as f:
+                    json.dump({'token': token, 'schema': schema}, f, default=str)
+            return schema
+            
+        except Exception as e:
+            self.logger.error(f"Error using graph schema cache: {e}")
+            return self._build_graph_schema(sample_size, max_workers)
+    
+    def _freshness_token(self) -> List[Any]:
+        """
+        Cheap fingerprint of the graph used to validate the on-disk schema cache
+        
+        Counts come from the count store, so this costs a few O(1) queries.
+        Edits that only change property values are not detected.
+        """
+        return [
+            self.connector.count_nodes(),
+            self.connector.count_relationships(),
+            sorted(self.connector.get_labels()),
+            sorted(self.connector.get_relationship_types())
+        ]
+    
+    def _build_graph_schema(self, sample_size: int, max_workers: int) -> Dict[str, Any]:
+        """Query the server for the complete graph schema"""
         try:
             labels = self.get_node_labels()
             rel_types = self.get_relationship_types()
             
+            # One apoc.meta.stats() call answers every count below; load it
+            # before fanning out so the workers don't each fetch it
+            self._get_meta_stats()
+            
+            # The queries below are independent and latency-bound, and every
+            # execute_query call opens its own session, so run them concurrently.
+            # Nodes/relationships and their connections are sampled in a few
+            # batched round-trips instead of several queries per label and type.
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                total_nodes = executor.submit(self._count_nodes)
+                total_relationships = executor.submit(self._count_relationships)
+                pattern_rows = executor.submit(self._get_pattern_rows)
+                node_samples = executor.submit(self._sample_nodes_batch, labels, sample_size)
+                rel_samples = executor.submit(self._sample_relationships_batch, rel_types, sample_size)
+                node_counts = {label: executor.submit(self._count_nodes, label) for label in labels}
+                rel_counts = {rel_type: executor.submit(self._count_relationships, rel_type)
+                              for rel_type in rel_types}
+            
+            # Both pattern views and the per-label connections come from the
+            # same cached relationship scan
+            pattern_rows.result()
+            
             graph_schema = {
                 'database': self.connector.database,
-                'total_nodes': self.connector.count_nodes(),
-                'total_relationships': self.connector.count_relationships(),
+                'total_nodes': total_nodes.result(),
+                'total_relationships': total_relationships.result(),
                 'node_labels': len(labels),
                 'relationship_types': len(rel_types),
                 'nodes': {},
@@ -358,17 +908,32 @@ class Neo4jSchemaExplorer:
                 'patterns': self.get_relationship_patterns()
             }
             
+            node_samples = node_samples.result()
+            node_rels = self._get_label_connections(labels)
+            rel_samples = rel_samples.result()
+            rel_patterns = self._get_patterns_by_type()
+            
             # Analyze each node label
             for label in labels:
                 self.logger.info(f"Analyzing node label: {label}")
-                schema = self.get_node_schema(label, sample_size)
-                graph_schema['nodes'][label] = schema
+                connections = node_rels.get(label, {})
+                graph_schema['nodes'][label] = {
+                    'label': label,
+                    'node_count': node_counts[label].result(),
+                    'properties': self._summarize_node_properties(node_samples.get(label, [])),
+                    'outgoing_relationships': connections.get('outgoing', []),
+                    'incoming_relationships': connections.get('incoming', [])
+                }
             
             # Analyze each relationship type
             for rel_type in rel_types:
                 self.logger.info(f"Analyzing relationship type: {rel_type}")
-                schema = self.get_relationship_schema(rel_type, sample_size)
-                graph_schema['relationships'][rel_type] = schema
+                graph_schema['relationships'][rel_type] = {
+                    'relationship_type': rel_type,
+                    'relationship_count': rel_counts[rel_type].result(),
+                    'properties': self._summarize_relationship_properties(rel_samples.get(rel_type, [])),
+                    'patterns': rel_patterns.get(rel_type, [])
+                }
             
             return graph_schema
             
@@ -376,6 +941,96 @@ class Neo4jSchemaExplorer:
             self.logger.error(f"Error getting graph schema: {e}")
             return {}
     
+    def _sample_nodes_batch(self, labels: List[str], sample_size: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Sample node property maps for several labels in a single query
+        
+        Each label gets its own UNION ALL branch with a static label, so every
+        sample is a label scan that stops after sample_size nodes.
+        
+        Args:
+            labels: Node labels to sample
+            sample_size: Number of nodes to sample per label
+        
+        Returns:
+            Dictionary mapping each label to its sampled property maps
+        """
+        if not labels:
+            return {}
+        
+        query = " UNION ALL ".join([
+            f"CALL {{ MATCH (n:{_quote_identifier(label)}) RETURN n LIMIT $k }} "
+            f"RETURN $labels[{i}] AS lbl, collect(properties(n)) AS nodes"
+            for i, label in enumerate(labels)
+        ])
+        results = self.connector.execute_query(query, {'labels': labels, 'k': sample_size})
+        return {rec['lbl']: rec['nodes'] for rec in results}
+    
+    def _sample_relationships_batch(self, rel_types: List[str], sample_size: int) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Sample relationship property maps for several types in a single query
+        
+        Each type gets its own UNION ALL branch with a static type, so every
+        sample stops after sample_size relationships of that type.
+        
+        Args:
+            rel_types: Relationship types to sample
+            sample_size: Number of relationships to sample per type
+        
+        Returns:
+            Dictionary mapping each type to its sampled property maps
+        """
+        if not rel_types:
+            return {}
+        
+        query = " UNION ALL ".join([
+            f"CALL {{ MATCH ()-[r:{_quote_identifier(rel_type)}]->() RETURN r LIMIT $k }} "
+            f"RETURN $types[{i}] AS rt, collect(properties(r)) AS rels"
+            for i, rel_type in enumerate(rel_types)
+        ])
+        results = self.connector.execute_query(query, {'types': rel_types, 'k': sample_size})
+        return {rec['rt']: rec['rels'] for rec in results}
+    
+    def _get_label_connections(self, labels: List[str]) -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+        """
+        Get outgoing and incoming relationship aggregates for several labels at once
+        
+        Derived from the cached pattern rows, so no extra relationship scan is
+        made (and approximate_patterns applies here too).
+        
+        Args:
+            labels: Node labels to inspect
+        
+        Returns:
+            Dictionary mapping each label to its 'outgoing' and 'incoming' lists
+        """
+        wanted = set(labels)
+        outgoing = Counter()
+        incoming = Counter()
+        for row in self._get_pattern_rows():
+            source_labels = tuple(row['source_labels'])
+            target_labels = tuple(row['target_labels'])
+            for label in wanted.intersection(source_labels):
+                outgoing[(label, row['rel_type'], target_labels)] += row['count']
+            for label in wanted.intersection(target_labels):
+                incoming[(label, row['rel_type'], source_labels)] += row['count']
+        
+        connections = defaultdict(lambda: {'outgoing': [], 'incoming': []})
+        for (label, rel_type, other_labels), count in outgoing.most_common():
+            connections[label]['outgoing'].append({
+                'type': rel_type,
+                'target_labels': list(other_labels),
+                'count': count
+            })
+        for (label, rel_type, other_labels), count in incoming.most_common():
+            connections[label]['incoming'].append({
+                'type': rel_type,
+                'source_labels': list(other_labels),
+                'count': count
+            })
+        
+        return dict(connections)
+    
     def generate_schema_summary(self, schema: Dict[str, Any]) -> str:
         """
         Generate a human-readable schema summary
@@ -387,105 +1042,105 @@ class Neo4jSchemaExplorer:
             Schema summary as string
         """
         try:
-            lines = []
-            
-            if 'database' in schema:
-                # Graph-level schema
-                lines.append(f"Neo4j Database: {schema['database']}")
-                lines.append(f"Total Nodes: {schema.get('total_nodes', 0):,}")
-                lines.append(f"Total Relationships: {schema.get('total_relationships', 0):,}")
-                lines.append(f"Node Labels: {schema.get('node_labels', 0)}")
-                lines.append(f"Relationship Types: {schema.get('relationship_types', 0)}")
-                lines.append("")
-                
-                # Node schemas
-                lines.append("Node Labels:")
-                for label, node_schema in schema.get('nodes', {}).items():
-                    lines.extend(self._format_node_summary(node_schema))
-                    lines.append("")
-                
-                # Relationship schemas
-                lines.append("Relationship Types:")
-                for rel_type, rel_schema in schema.get('relationships', {}).items():
-                    lines.extend(self._format_relationship_summary(rel_schema))
-                    lines.append("")
-                
-                # Patterns
-                patterns = schema.get('patterns', [])
-                if patterns:
-                    lines.append("Common Graph Patterns:")
-                    for pattern in patterns[:10]:  # Top 10
-                        lines.append(f"  ({pattern['source_label']})-[:{pattern['relationship_type']}]->({pattern['target_label']}) [{pattern['count']} instances]")
-            
-            return "\n".join(lines)
+            return "\n".join(self._iter_schema_summary(schema))
             
         except Exception as e:
             self.logger.error(f"Error generating schema summary: {e}")
             return ""
     
-    def _format_node_summary(self, schema: Dict[str, Any]) -> List[str]:
-        """Format node schema summary"""
-        lines = []
+    def _iter_schema_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield schema summary lines for a graph-level schema"""
+        if 'database' not in schema:
+            return
+        
+        # Graph-level schema
+        yield f"Neo4j Database: {schema['database']}"
+        yield f"Total Nodes: {schema.get('total_nodes', 0):,}"
+        yield f"Total Relationships: {schema.get('total_relationships', 0):,}"
+        yield f"Node Labels: {schema.get('node_labels', 0)}"
+        yield f"Relationship Types: {schema.get('relationship_types', 0)}"
+        yield ""
         
-        lines.append(f"  :{schema.get('label', 'unknown')}")
-        lines.append(f"    Nodes: {schema.get('node_count', 0):,}")
+        # Node schemas
+        yield "Node Labels:"
+        for label, node_schema in schema.get('nodes', {}).items():
+            yield from self._iter_node_summary(node_schema)
+            yield ""
+        
+        # Relationship schemas
+        yield "Relationship Types:"
+        for rel_type, rel_schema in schema.get('relationships', {}).items():
+            yield from self._iter_relationship_summary(rel_schema)
+            yield ""
+        
+        # Patterns
+        patterns = schema.get('patterns', [])
+        if patterns:
+            yield "Common Graph Patterns:"
+            for pattern in patterns[:10]:  # Top 10
+                yield f"  ({pattern['source_label']})-[:{pattern['relationship_type']}]->({pattern['target_label']}) [{pattern['count']} instances]"
+    
+    def _iter_node_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield node schema summary lines"""
+        yield f"  :{schema.get('label', 'unknown')}"
+        yield f"    Nodes: {schema.get('node_count', 0):,}"
         
         # Properties
         properties = schema.get('properties', {})
         if properties:
-            lines.append(f"    Properties ({len(properties)}):")
-            for prop_name, prop_info in list(properties.items())[:10]:
-                lines.append(f"      - {prop_name}: {prop_info['type']} (present in {prop_info['presence']})")
+            yield f"    Properties ({len(properties)}):"
+            for prop_name, prop_info in islice(properties.items(), 10):
+                yield f"      - {prop_name}: {prop_info['type']} (present in {prop_info['presence']})"
         
         # Outgoing relationships
         outgoing = schema.get('outgoing_relationships', [])
         if outgoing:
-            lines.append(f"    Outgoing relationships:")
+            yield f"    Outgoing relationships:"
             for rel in outgoing[:5]:
                 targets = ', '.join(rel['target_labels'])
-                lines.append(f"      - :{rel['type']} -> ({targets}) [{rel['count']} instances]")
+                yield f"      - :{rel['type']} -> ({targets}) [{rel['count']} instances]"
         
         # Incoming relationships
         incoming = schema.get('incoming_relationships', [])
         if incoming:
-            lines.append(f"    Incoming relationships:")
+            yield f"    Incoming relationships:"
             for rel in incoming[:5]:
                 sources = ', '.join(rel['source_labels'])
-                lines.append(f"      - ({sources})-[:{rel['type']}] <- [{rel['count']} instances]")
-        
-        return lines
+                yield f"      - ({sources})-[:{rel['type']}] <- [{rel['count']} instances]"
     
-    def _format_relationship_summary(self, schema: Dict[str, Any]) -> List[str]:
-        """Format relationship schema summary"""
-        lines = []
-        
-        lines.append(f"  :{schema.get('relationship_type', 'unknown')}")
-        lines.append(f"    Relationships: {schema.get('relationship_count', 0):,}")
+    def _iter_relationship_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield relationship schema summary lines"""
+        yield f"  :{schema.get('relationship_type', 'unknown')}"
+        yield f"    Relationships: {schema.get('relationship_count', 0):,}"
         
         # Properties
         properties = schema.get('properties', {})
         if properties:
-            lines.append(f"    Properties ({len(properties)}):")
+            yield f"    Properties ({len(properties)}):"
             for prop_name, prop_info in properties.items():
-                lines.append(f"      - {prop_name}: {prop_info['type']} (present in {prop_info['presence']})")
+                yield f"      - {prop_name}: {prop_info['type']} (present in {prop_info['presence']})"
         
         # Patterns
         patterns = schema.get('patterns', [])
         if patterns:
-            lines.append(f"    Connects:")
+            yield f"    Connects:"
             for pattern in patterns[:5]:
                 sources = ', '.join(pattern['source_labels'])
                 targets = ', '.join(pattern['target_labels'])
-                lines.append(f"      - ({sources}) -> ({targets}) [{pattern['count']} instances]")
-        
-        return lines
+                yield f"      - ({sources}) -> ({targets}) [{pattern['count']} instances]"
     
-    def generate_llm_context(self, label: Optional[str] = None) -> str:
+    def generate_llm_context(self, label: Optional[str] = None,
+                             schema: Optional[Dict[str, Any]] = None,
+                             max_chars: Optional[int] = None) -> str:
         """
         Generate schema context optimized for LLM query translation
         
         Args:
             label: Specific node label (if None, generates for entire graph)
+            schema: Already built graph schema to use instead of fetching it
+                (ignored when label is given)
+            max_chars: Stop formatting once this many characters are produced
+                and return only that prefix (None for the full context)
         
         Returns:
             LLM-friendly schema description
@@ -493,80 +1148,95 @@ class Neo4jSchemaExplorer:
         try:
             if label:
                 schema = self.get_node_schema(label)
-                return self._format_llm_node(schema)
+                return _join_lines(self._iter_llm_node(schema), max_chars)
             else:
-                schema = self.get_graph_schema()
-                return self._format_llm_graph(schema)
+                if schema is None:
+                    schema = self.get_graph_schema()
+                return _join_lines(self._iter_llm_graph(schema), max_chars)
                 
         except Exception as e:
             self.logger.error(f"Error generating LLM context: {e}")
             return ""
     
-    def _format_llm_node(self, schema: Dict[str, Any]) -> str:
-        """Format node schema for LLM"""
-        lines = []
+    def generate_llm_context_json(self, label: Optional[str] = None) -> str:
+        """
+        Generate schema context as JSON instead of markdown
+        
+        Serializes the schema dictionary directly, skipping the line-by-line
+        formatting, for callers that assemble JSON prompts.
         
-        lines.append(f"# Neo4j Node Label: :{schema.get('label')}")
-        lines.append("")
-        lines.append(f"Total nodes: {schema.get('node_count', 0):,}")
-        lines.append("")
+        Args:
+            label: Specific node label (if None, generates for entire graph)
+        
+        Returns:
+            Schema as an indented JSON string
+        """
+        try:
+            schema = self.get_node_schema(label) if label else self.get_graph_schema()
+            return json.dumps(schema, indent=2, default=str)
+            
+        except Exception as e:
+            self.logger.error(f"Error generating LLM JSON context: {e}")
+            return ""
+    
+    def _iter_llm_node(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield node schema lines for LLM"""
+        yield f"# Neo4j Node Label: :{schema.get('label')}"
+        yield ""
+        yield f"Total nodes: {schema.get('node_count', 0):,}"
+        yield ""
         
         # Properties
-        lines.append("## Properties:")
+        yield "## Properties:"
         properties = schema.get('properties', {})
         for prop_name, prop_info in properties.items():
             examples = prop_info.get('sample_values', [])
             example_str = f" (e.g., {examples[0]})" if examples else ""
-            lines.append(f"- `{prop_name}`: {prop_info['type']}{example_str}")
+            yield f"- `{prop_name}`: {prop_info['type']}{example_str}"
         
         # Relationships
         outgoing = schema.get('outgoing_relationships', [])
         if outgoing:
-            lines.append("")
-            lines.append("## Outgoing Relationships:")
+            yield ""
+            yield "## Outgoing Relationships:"
             for rel in outgoing:
                 targets = ', '.join(rel['target_labels'])
-                lines.append(f"- `:{rel['type']}` -> ({targets})")
+                yield f"- `:{rel['type']}` -> ({targets})"
         
         incoming = schema.get('incoming_relationships', [])
         if incoming:
-            lines.append("")
-            lines.append("## Incoming Relationships:")
+            yield ""
+            yield "## Incoming Relationships:"
             for rel in incoming:
                 sources = ', '.join(rel['source_labels'])
-                lines.append(f"- ({sources})-[`:{rel['type']}`]->")
-        
-        return "\n".join(lines)
+                yield f"- ({sources})-[`:{rel['type']}`]->"
     
-    def _format_llm_graph(self, schema: Dict[str, Any]) -> str:
-        """Format graph schema for LLM"""
-        lines = []
-        
-        lines.append(f"# Neo4j Graph Database: {schema.get('database')}")
-        lines.append("")
-        lines.append(f"Total nodes: {schema.get('total_nodes', 0):,}")
-        lines.append(f"Total relationships: {schema.get('total_relationships', 0):,}")
-        lines.append("")
+    def _iter_llm_graph(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield graph schema lines for LLM"""
+        yield f"# Neo4j Graph Database: {schema.get('database')}"
+        yield ""
+        yield f"Total nodes: {schema.get('total_nodes', 0):,}"
+        yield f"Total relationships: {schema.get('total_relationships', 0):,}"
+        yield ""
         
         # Node labels
-        lines.append("## Node Labels:")
+        yield "## Node Labels:"
         for label, node_schema in schema.get('nodes', {}).items():
-            lines.append(f"### :{label}")
-            lines.append(f"Count: {node_schema.get('node_count', 0):,}")
+            yield f"### :{label}"
+            yield f"Count: {node_schema.get('node_count', 0):,}"
             
             # Key properties
             properties = node_schema.get('properties', {})
             if properties:
-                prop_list = list(properties.keys())[:5]
-                lines.append(f"Key properties: {', '.join(prop_list)}")
+                yield f"Key properties: {', '.join(islice(properties, 5))}"
             
-            lines.append("")
+            yield ""
         
         # Relationship types
-        lines.append("## Relationship Types:")
+        yield "## Relationship Types:"
         for rel_type, rel_schema in schema.get('relationships', {}).items():
-            lines.append(f"### :{rel_type}")
-            lines.append(f"Count: {rel_schema.get('relationship_count', 0):,}")
+            yield f"### :{rel_type}"
+            yield f"Count: {rel_schema.get('relationship_count', 0):,}"
             
             # Patterns
             patterns = rel_schema.get('patterns', [])
@@ -574,15 +1244,13 @@ class Neo4jSchemaExplorer:
                 for pattern in patterns[:2]:
                     sources = ', '.join(pattern['source_labels'])
                     targets = ', '.join(pattern['target_labels'])
-                    lines.append(f"  ({sources})-[:{rel_type}]->({targets})")
+                    yield f"  ({sources})-[:{rel_type}]->({targets})"
             
-            lines.append("")
+            yield ""
         
         # Common patterns
         patterns = schema.get('patterns', [])
         if patterns:
-            lines.append("## Common Graph Patterns:")
+            yield "## Common Graph Patterns:"
             for pattern in patterns[:10]:
-                lines.append(f"- ({pattern['source_label']})-[:{pattern['relationship_type']}]->({pattern['target_label']})")
-        
-        return "\n".join(lines)
\ No newline at end of file
+                yield f"- ({pattern['source_label']})-[:{pattern['relationship_type']}]->({pattern['target_label']})"
\ No newline at end of file
@@ -12,6 +12,10 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from connectors.rdf_connector import RDFConnector
 from utils.logger import setup_logger
 
+def _local_name(uri: str) -> str:
+    """Last path segment of an IRI (same as uri.split('/')[-1], without the list)"""
+    return uri.rpartition('/')[2]
+
 class RDFSchemaExplorer:
     """Explores and analyzes RDF graph schemas"""
     
@@ -32,30 +36,24 @@ class RDFSchemaExplorer:
                 'class_analysis': {}
             }
             
-            # Analyze each class
+            # Count instances and collect properties for every class in one
+            # grouped query instead of two queries per class
+            class_query = """
+            SELECT ?cls (COUNT(DISTINCT ?s) as ?count)
+                   (GROUP_CONCAT(DISTINCT STR(?property); SEPARATOR=" ") as ?properties)
+            WHERE {
+                ?s a ?cls .
+                ?s ?property ?o .
+            }
+            GROUP BY ?cls
+            """
+            class_stats = {r['cls']: r for r in self.connector.execute_query(class_query)}
+            
             for cls in classes:
-                count_query = f"""
-                SELECT (COUNT(?s) as ?count) WHERE {{
-                    ?s a <{cls}> .
-                }}
-                """
-                results = self.connector.execute_query(count_query)
-                count = int(results[0]['count']) if results else 0
-                
-                # Get sample properties for this class
-                props_query = f"""
-                SELECT DISTINCT ?property WHERE {{
-                    ?s a <{cls}> .
-                    ?s ?property ?o .
-                }}
-                LIMIT 20
-                """
-                props_results = self.connector.execute_query(props_query)
-                class_props = [r['property'] for r in props_results]
-                
+                stats = class_stats.get(cls, {})
                 schema['class_analysis'][cls] = {
-                    'instance_count': count,
-                    'properties': class_props
+                    'instance_count': int(stats.get('count', 0)),
+                    'properties': stats.get('properties', '').split()[:20]
                 }
             
             return schema
@@ -93,7 +91,9 @@ class RDFSchemaExplorer:
         for cls, analysis in schema.get('class_analysis', {}).items():
             lines.append(f"### {cls}")
             lines.append(f"Instances: {analysis['instance_count']:,}")
-            props = ', '.join([p.split('/')[-1] for p in analysis['properties'][:10]])
+            # str.join materializes any iterable into a sequence first, so a list
+            # comprehension is cheaper here than a generator expression
+            props = ', '.join([_local_name(p) for p in analysis['properties'][:10]])
             lines.append(f"Properties: {props}")
             lines.append("")
         
@@ -5,8 +5,11 @@ Extracts and analyzes Redis key patterns and data structures
 
 import sys
 import os
-from typing import Dict, List, Any, Optional
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Iterator, Iterable, TextIO
+from collections import defaultdict, Counter
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import random
 import re
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -14,6 +17,45 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from connectors.redis_connector import RedisConnector
 from utils.logger import setup_logger
 
+# UUIDs, hashes and long IDs (group 1) or plain numbers (group 2), matched in
+# a single pass; equivalent to substituting the first and then the second
+_VARIABLE_PART_RE = re.compile(r'([a-f0-9]{8,})|(\d+)')
+
+# Sample values kept per data type in a pattern analysis
+_MAX_SAMPLE_VALUES = 5
+
+# Hash field names collected per pattern; only the first 20 are reported
+_MAX_FIELD_NAMES = 64
+
+def _placeholder(match: re.Match) -> str:
+    """Replacement for _VARIABLE_PART_RE matches"""
+    return '{id}' if match.lastindex == 1 else '{num}'
+
+def _normalize_part(part: str) -> str:
+    """Pattern form of one colon-separated key segment"""
+    # Fast paths for the common segments, using C string checks instead of
+    # the regex; the results are the same as the regex would give
+    if part.isascii():
+        if part.isdigit():
+            return '{id}' if len(part) >= 8 else '{num}'
+        if len(part) < 8 and part.isalpha():
+            return part
+    
+    part = _VARIABLE_PART_RE.sub(_placeholder, part)
+    
+    # Replace long strings (potential dynamic values)
+    if len(part) > 20 and '{' not in part:
+        return '{value}'
+    return part
+
+def _emit(lines: Iterable[str], sink: Optional[TextIO]) -> str:
+    """Join lines into a string, or write them to sink as they are produced"""
+    if sink is None:
+        return "\n".join(lines)
+    for line in lines:
+        sink.write(line + "\n")
+    return ""
+
 class RedisSchemaExplorer:
     """Explores and analyzes Redis key patterns and data structures"""
     
@@ -26,6 +68,17 @@ class RedisSchemaExplorer:
         """
         self.connector = connector
         self.logger = setup_logger(__name__)
+        # Key patterns by sample size, shared by get_database_schema and
+        # infer_relationships so a session scans the keyspace once
+        self._pattern_cache: Dict[int, Dict[str, List[str]]] = {}
+        # Full database schemas by sample size, so the summary and LLM
+        # context reuse one analysis instead of re-sampling the keyspace
+        self._schema_cache: Dict[int, Dict[str, Any]] = {}
+    
+    def clear_cache(self):
+        """Drop cached key patterns and schemas (call after the keyspace changes)"""
+        self._pattern_cache.clear()
+        self._schema_cache.clear()
     
     def get_key_patterns(self, sample_size: int = 1000) -> Dict[str, List[str]]:
         """
@@ -37,13 +90,12 @@ class RedisSchemaExplorer:
         Returns:
             Dictionary of patterns and their matching keys
         """
+        if sample_size in self._pattern_cache:
+            return self._pattern_cache[sample_size]
+        
         try:
-            # Get all keys (or sample)
-            all_keys = self.connector.keys('*')
-            
-            if len(all_keys) > sample_size:
-                import random
-                all_keys = random.sample(all_keys, sample_size)
+            # Sample keys incrementally instead of listing the whole keyspace
+            all_keys = self._scan_sample('*', sample_size)
             
             # Group keys by pattern
             patterns = defaultdict(list)
@@ -53,38 +105,60 @@ class RedisSchemaExplorer:
                 pattern = self._extract_pattern(key)
                 patterns[pattern].append(key)
             
-            return dict(patterns)
+            self._pattern_cache[sample_size] = dict(patterns)
+            return self._pattern_cache[sample_size]
             
         except Exception as e:
             self.logger.error(f"Error getting key patterns: {e}")
             return {}
     
-    def _extract_pattern(self, key: str) -> str:
+    def _scan_sample(self, pattern: str = '*', sample_size: int = 1000,
+                     count: int = 1000) -> List[str]:
         """
-        Extract pattern from a key by replacing variable parts
+        Collect up to sample_size distinct keys matching pattern via SCAN
+        
+        SCAN walks the keyspace in hash-table order, which is unrelated to key
+        names, so stopping after the first sample_size keys gives a spread-out
+        sample without visiting (or blocking on) the rest of the keyspace.
         
         Args:
-            key: Redis key
+            pattern: Key pattern to match
+            sample_size: Maximum number of keys to collect
+            count: SCAN COUNT hint per round-trip
         
         Returns:
-            Pattern string
+            List of sampled keys
         """
-        # Replace UUIDs, hashes, and long IDs
-        pattern = re.sub(r'[a-f0-9]{8,}', '{id}', key)
+        sample = []
+        seen = set()
         
-        # Replace numbers
-        pattern = re.sub(r'\d+', '{num}', pattern)
+        for key in self.connector.scan_iter(pattern, count=count):
+            # SCAN can repeat keys while the keyspace is being resized
+            if key in seen:
+                continue
+            seen.add(key)
+            sample.append(key)
+            if len(sample) >= sample_size:
+                break
         
-        # Replace long strings (potential dynamic values)
-        parts = pattern.split(':')
-        cleaned_parts = []
-        for part in parts:
-            if len(part) > 20 and '{' not in part:
-                cleaned_parts.append('{value}')
-            else:
-                cleaned_parts.append(part)
+        return sample
+    
+    @staticmethod
+    @lru_cache(maxsize=8192)
+    def _extract_pattern(key: str) -> str:
+        """
+        Extract pattern from a key by replacing variable parts
+        
+        Args:
+            key: Redis key
         
-        return ':'.join(cleaned_parts)
+        Returns:
+            Pattern string
+        """
+        # Variable parts never contain ':', so each segment is normalized on
+        # its own: UUIDs, hashes and long IDs become {id}, numbers {num} and
+        # long strings {value}
+        return ':'.join([_normalize_part(part) for part in key.split(':')])
     
     def analyze_key_pattern(self, pattern: str, sample_keys: List[str], 
                            sample_size: int = 10) -> Dict[str, Any]:
@@ -100,66 +174,99 @@ class RedisSchemaExplorer:
             Analysis results
         """
         try:
-            # Sample keys for analysis
+            # Sample keys for analysis (distinct keys, so no pipeline slot
+            # is spent on a duplicate; skipped when there are few enough)
             if len(sample_keys) > sample_size:
-                import random
                 sample_keys = random.sample(sample_keys, sample_size)
             
             # Analyze data types
-            type_counts = defaultdict(int)
             structure_info = defaultdict(lambda: {
                 'sample_values': [],
                 'field_names': set(),
                 'element_types': set()
             })
             
+            client = self.connector.client
+            
+            # Round-trip 1: TYPE of every sampled key
+            pipe = client.pipeline(transaction=False)
             for key in sample_keys:
-                # Determine key type
-                key_type = self._get_key_type(key)
-                type_counts[key_type] += 1
+                pipe.type(key)
+            key_types = [
+                'unknown' if isinstance(key_type, Exception) else key_type
+                for key_type in pipe.execute(raise_on_error=False)
+            ]
+            type_counts = Counter(key_types)
+            
+            # Round-trip 2: the structure command matching each key's type
+            pipe = client.pipeline(transaction=False)
+            queued = []
+            for key, key_type in zip(sample_keys, key_types):
+                if key_type == 'string':
+                    pipe.get(key)
+                elif key_type == 'hash':
+                    # Fields and values together, bounded for large hashes
+                    pipe.hscan(key, 0, count=20)
+                elif key_type == 'list':
+                    pipe.lrange(key, 0, 2)  # First 3 elements
+                elif key_type == 'set':
+                    # One bounded SSCAN page instead of pulling the whole set
+                    pipe.sscan(key, 0, count=10)
+                elif key_type == 'zset':
+                    pipe.zrange(key, 0, 2, withscores=True)
+                else:
+                    continue
+                queued.append((key, key_type))
+            
+            replies = pipe.execute(raise_on_error=False) if queued else []
+            
+            for (key, key_type), reply in zip(queued, replies):
+                if isinstance(reply, Exception):
+                    continue
+                
+                # Only the first few samples are reported, so stop copying
+                # values once a type has enough of them
+                info = structure_info.get(key_type)
+                keep_sample = info is None or len(info['sample_values']) < _MAX_SAMPLE_VALUES
                 
-                # Get detailed structure based on type
                 if key_type == 'string':
-                    value = self.connector.get(key)
-                    if value:
-                        structure_info['string']['sample_values'].append(value[:50])
+                    if reply and keep_sample:
+                        structure_info['string']['sample_values'].append(reply[:50])
                 
                 elif key_type == 'hash':
-                    fields = self.connector.hkeys(key)
-                    structure_info['hash']['field_names'].update(fields)
-                    
-                    # Sample values
-                    if fields:
-                        sample_field = fields[0]
-                        value = self.connector.hget(key, sample_field)
-                        structure_info['hash']['sample_values'].append({sample_field: value[:50] if value else None})
+                    mapping = reply[1]
+                    field_names = structure_info['hash']['field_names']
+                    if len(field_names) < _MAX_FIELD_NAMES:
+                        field_names.update(mapping)
+                    if mapping and keep_sample:
+                        field, value = next(iter(mapping.items()))
+                        structure_info['hash']['sample_values'].append({field: value[:50] if value else None})
                 
                 elif key_type == 'list':
-                    length = self.connector.llen(key)
-                    elements = self.connector.lrange(key, 0, 2)  # First 3 elements
-                    structure_info['list']['sample_values'].append(elements)
+                    if keep_sample:
+                        structure_info['list']['sample_values'].append(reply)
                 
                 elif key_type == 'set':
-                    members = list(self.connector.smembers(key))[:3]  # First 3 members
-                    structure_info['set']['sample_values'].append(members)
+                    if keep_sample:
+                        structure_info['set']['sample_values'].append(reply[1][:3])  # First 3 members
                 
                 elif key_type == 'zset':
-                    members = self.connector.zrange(key, 0, 2, withscores=True)
-                    structure_info['zset']['sample_values'].append(members)
+                    if keep_sample:
+                        structure_info['zset']['sample_values'].append(reply)
             
             # Compile analysis
             analysis = {
                 'pattern': pattern,
                 'total_keys': len(sample_keys),
                 'types': dict(type_counts),
-                'primary_type': max(type_counts.items(), key=lambda x: x[1])[0] if type_counts else 'unknown',
+                'primary_type': type_counts.most_common(1)[0][0] if type_counts else 'unknown',
                 'structure': {}
             }
             
             # Add structure details
             for data_type, info in structure_info.items():
                 analysis['structure'][data_type] = {
-                    'sample_values': info['sample_values'][:5],
+                    'sample_values': info['sample_values'][:_MAX_SAMPLE_VALUES],
                     'field_names': list(info['field_names'])[:20] if info['field_names'] else [],
                     'element_types': list(info['element_types']) if info['element_types'] else []
                 }
@@ -170,33 +277,20 @@ class RedisSchemaExplorer:
             self.logger.error(f"Error analyzing key pattern: {e}")
             return {}
     
-    def _get_key_type(self, key: str) -> str:
-        """
-        Get Redis data type for a key
-        
-        Args:
-            key: Redis key
-        
-        Returns:
-            Data type string
-        """
-        try:
-            # Use Redis TYPE command through client
-            key_type = self.connector.client.type(key)
-            return key_type
-        except:
-            return 'unknown'
-    
-    def get_database_schema(self, sample_size: int = 1000) -> Dict[str, Any]:
+    def get_database_schema(self, sample_size: int = 1000, max_workers: int = 8) -> Dict[str, Any]:
         """
         Get complete schema for Redis database
         
         Args:
             sample_size: Number of keys to sample
+            max_workers: Maximum number of patterns analyzed in parallel
         
         Returns:
             Complete database schema
         """
+        if sample_size in self._schema_cache:
+            return self._schema_cache[sample_size]
+        
         try:
             # Get basic stats
             total_keys = self.connector.dbsize()
@@ -204,20 +298,34 @@ class RedisSchemaExplorer:
             # Get key patterns
             patterns = self.get_key_patterns(sample_size)
             
-            # Analyze each pattern
+            # Analyze each pattern; the work is mostly waiting on Redis
+            # round-trips, so overlap the patterns' pipelines in threads
             pattern_schemas = {}
-            for pattern, keys in patterns.items():
-                self.logger.info(f"Analyzing pattern: {pattern}")
-                analysis = self.analyze_key_pattern(pattern, keys)
-                pattern_schemas[pattern] = analysis
+            with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+                futures = {}
+                for pattern, keys in patterns.items():
+                    self.logger.info(f"Analyzing pattern: {pattern}")
+                    futures[pattern] = executor.submit(self.analyze_key_pattern, pattern, keys)
+                
+                for pattern, future in futures.items():
+                    pattern_schemas[pattern] = future.result()
             
             # Get metadata keys
-            metadata_keys = [k for k in self.connector.keys('stats:*') + self.connector.keys('meta:*')]
+            metadata_keys = list(dict.fromkeys(
+                list(self.connector.scan_iter('stats:*', count=500)) +
+                list(self.connector.scan_iter('meta:*', count=500))
+            ))
             metadata = {}
-            for key in metadata_keys:
-                value = self.connector.get(key)
-                if value:
-                    metadata[key] = value
+            if metadata_keys:
+                # Fetch all metadata values in one round-trip
+                pipe = self.connector.client.pipeline(transaction=False)
+                for key in metadata_keys:
+                    pipe.get(key)
+                values = pipe.execute(raise_on_error=False)
+                metadata = {
+                    key: value for key, value in zip(metadata_keys, values)
+                    if value and not isinstance(value, Exception)
+                }
             
             schema = {
                 'database': self.connector.db,
@@ -227,117 +335,120 @@ class RedisSchemaExplorer:
                 'sample_size': sample_size
             }
             
+            self._schema_cache[sample_size] = schema
             return schema
             
         except Exception as e:
             self.logger.error(f"Error getting database schema: {e}")
             return {}
     
-    def generate_schema_summary(self, schema: Dict[str, Any]) -> str:
+    def generate_schema_summary(self, schema: Dict[str, Any],
+                                sink: Optional[TextIO] = None) -> str:
         """
         Generate a human-readable schema summary
         
         Args:
             schema: Schema dictionary
+            sink: Optional file-like object to write the summary to line by line
         
         Returns:
-            Schema summary as string
+            Schema summary as string (empty when written to sink)
         """
         try:
-            lines = []
-            
-            lines.append(f"Redis Database: {schema.get('database', 0)}")
-            lines.append(f"Total Keys: {schema.get('total_keys', 0):,}")
-            lines.append(f"Patterns Detected: {len(schema.get('patterns', {}))}")
-            lines.append("")
-            
-            # Metadata
-            metadata = schema.get('metadata', {})
-            if metadata:
-                lines.append("Metadata:")
-                for key, value in metadata.items():
-                    lines.append(f"  {key}: {value}")
-                lines.append("")
-            
-            # Patterns
-            lines.append("Key Patterns:")
-            patterns = schema.get('patterns', {})
-            for pattern, analysis in patterns.items():
-                lines.extend(self._format_pattern_summary(analysis))
-                lines.append("")
-            
-            return "\n".join(lines)
+            return _emit(self._iter_schema_summary(schema), sink)
             
         except Exception as e:
             self.logger.error(f"Error generating schema summary: {e}")
             return ""
     
-    def _format_pattern_summary(self, analysis: Dict[str, Any]) -> List[str]:
-        """Format pattern analysis summary"""
-        lines = []
+    def _iter_schema_summary(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield schema summary lines"""
+        yield f"Redis Database: {schema.get('database', 0)}"
+        yield f"Total Keys: {schema.get('total_keys', 0):,}"
+        yield f"Patterns Detected: {len(schema.get('patterns', {}))}"
+        yield ""
+        
+        # Metadata
+        metadata = schema.get('metadata', {})
+        if metadata:
+            yield "Metadata:"
+            for key, value in metadata.items():
+                yield f"  {key}: {value}"
+            yield ""
         
-        lines.append(f"  Pattern: {analysis.get('pattern', 'unknown')}")
-        lines.append(f"    Keys: {analysis.get('total_keys', 0):,}")
-        lines.append(f"    Primary Type: {analysis.get('primary_type', 'unknown')}")
+        # Patterns
+        yield "Key Patterns:"
+        patterns = schema.get('patterns', {})
+        for pattern, analysis in patterns.items():
+            yield from self._iter_pattern_summary(analysis)
+            yield ""
+    
+    def _iter_pattern_summary(self, analysis: Dict[str, Any]) -> Iterator[str]:
+        """Yield pattern analysis summary lines"""
+        yield f"  Pattern: {analysis.get('pattern', 'unknown')}"
+        yield f"    Keys: {analysis.get('total_keys', 0):,}"
+        yield f"    Primary Type: {analysis.get('primary_type', 'unknown')}"
         
         # Type distribution
         types = analysis.get('types', {})
         if len(types) > 1:
-            lines.append(f"    Type distribution: {types}")
+            yield f"    Type distribution: {types}"
         
         # Structure details
         structure = analysis.get('structure', {})
         for data_type, info in structure.items():
             if info.get('field_names'):
                 fields = ', '.join(info['field_names'][:10])
-                lines.append(f"    {data_type.capitalize()} fields: {fields}")
+                yield f"    {data_type.capitalize()} fields: {fields}"
             
             if info.get('sample_values'):
                 samples = info['sample_values'][:2]
-                lines.append(f"    Sample values: {samples}")
-        
-        return lines
+                yield f"    Sample values: {samples}"
     
-    def generate_llm_context(self) -> str:
+    def generate_llm_context(self, sink: Optional[TextIO] = None,
+                             schema: Optional[Dict[str, Any]] = None) -> str:
         """
         Generate schema context optimized for LLM query translation
         
+        Args:
+            sink: Optional file-like object to write the context to line by line
+            schema: Database schema from get_database_schema (analyzed if omitted)
+        
         Returns:
-            LLM-friendly schema description
+            LLM-friendly schema description (empty when written to sink)
         """
         try:
-            schema = self.get_database_schema()
-            return self._format_llm_schema(schema)
+            if schema is None:
+                schema = self.get_database_schema()
+            return _emit(self._iter_llm_schema(schema), sink)
                 
         except Exception as e:
             self.logger.error(f"Error generating LLM context: {e}")
             return ""
     
-    def _format_llm_schema(self, schema: Dict[str, Any]) -> str:
-        """Format Redis schema for LLM"""
-        lines = []
-        
-        lines.append(f"# Redis Database: {schema.get('database')}")
-        lines.append("")
-        lines.append(f"Total keys: {schema.get('total_keys', 0):,}")
-        lines.append("")
+    def _iter_llm_schema(self, schema: Dict[str, Any]) -> Iterator[str]:
+        """Yield Redis schema lines for LLM"""
+        yield f"# Redis Database: {schema.get('database')}"
+        yield ""
+        yield f"Total keys: {schema.get('total_keys', 0):,}"
+        yield ""
         
         # Metadata context
         metadata = schema.get('metadata', {})
         if metadata:
-            lines.append("## Dataset Information:")
+            yield "## Dataset Information:"
             for key, value in metadata.items():
                 clean_key = key.replace('stats:', '').replace('meta:', '').replace('_', ' ').title()
-                lines.append(f"- {clean_key}: {value}")
-            lines.append("")
+                yield f"- {clean_key}: {value}"
+            yield ""
         
         # Key patterns
-        lines.append("## Key Patterns:")
+        yield "## Key Patterns:"
         patterns = schema.get('patterns', {})
         for pattern, analysis in patterns.items():
-            lines.append(f"### {pattern}")
-            lines.append(f"Type: {analysis.get('primary_type')}")
-            lines.append(f"Count: {analysis.get('total_keys', 0):,} keys")
+            yield f"### {pattern}"
+            yield f"Type: {analysis.get('primary_type')}"
+            yield f"Count: {analysis.get('total_keys', 0):,} keys"
             
             # Structure
             structure = analysis.get('structure', {})
@@ -346,11 +457,9 @@ class RedisSchemaExplorer:
             if primary_type == 'hash' and 'hash' in structure:
                 fields = structure['hash'].get('field_names', [])
                 if fields:
-                    lines.append(f"Fields: {', '.join(fields[:10])}")
+                    yield f"Fields: {', '.join(fields[:10])}"
             
-            lines.append("")
-        
-        return "\n".join(lines)
+            yield ""
     
     def infer_relationships(self) -> List[Dict[str, Any]]:
         """
@@ -363,9 +472,10 @@ class RedisSchemaExplorer:
             relationships = []
             
             patterns = self.get_key_patterns()
-            pattern_list = list(patterns.keys())
+            # Set for O(1) target lookups instead of scanning the pattern list
+            pattern_set = set(patterns)
             
-            for pattern in pattern_list:
+            for pattern in patterns:
                 # Look for foreign key patterns
                 # e.g., movie:{id}:cast might reference person:{id}
                 parts = pattern.split(':')
@@ -376,7 +486,7 @@ class RedisSchemaExplorer:
                         
                         # Look for related patterns
                         potential_target = f"{entity}:{{id}}"
-                        if potential_target in pattern_list and potential_target != pattern:
+                        if potential_target in pattern_set and potential_target != pattern:
                             relationships.append({
                                 'from_pattern': pattern,
                                 'to_pattern': potential_target,
@@ -4,9 +4,13 @@ Provides consistent logging across all modules
 """
 
 import logging
+import logging.handlers
 import sys
 from datetime import datetime
-from typing import Optional
+from typing import Dict, Optional
+
+# Loggers already configured by setup_logger, keyed by name
+_LOGGER_CACHE: Dict[str, logging.Logger] = {}
 
 def setup_logger(name: str, level: int = logging.INFO, log_file: Optional[str] = None):
     """
@@ -20,6 +24,8 @@ def setup_logger(name: str, level: int = logging.INFO, log_file: Optional[str] =
     Returns:
         Configured logger instance
     """
+    if name in _LOGGER_CACHE:
+        return _LOGGER_CACHE[name]
     
     # Create logger
     logger = logging.getLogger(name)
@@ -27,6 +33,7 @@ def setup_logger(name: str, level: int = logging.INFO, log_file: Optional[str] =
     
     # Avoid duplicate handlers if logger already exists
     if logger.handlers:
+        _LOGGER_CACHE[name] = logger
         return logger
     
     # Create formatters
@@ -48,14 +55,40 @@ def setup_logger(name: str, level: int = logging.INFO, log_file: Optional[str] =
     # File handler (optional)
     if log_file:
         try:
-            file_handler = logging.FileHandler(log_file, encoding='utf-8')
+            # Rotate instead of growing forever, and buffer records so they
+            # reach the file in batches (errors flush immediately)
+            file_handler = logging.handlers.RotatingFileHandler(
+                log_file, maxBytes=10 * 1024 * 1024, backupCount=5, encoding='utf-8'
+            )
             file_handler.setLevel(level)
             file_handler.setFormatter(detailed_formatter)
-            logger.addHandler(file_handler)
+            buffered_handler = logging.handlers.MemoryHandler(
+                capacity=1024, flushLevel=logging.ERROR, target=file_handler
+            )
+            buffered_handler.setLevel(level)
+            logger.addHandler(buffered_handler)
         except Exception as e:
             logger.warning(f"Could not create log file: {e}")
     
+    _LOGGER_CACHE[name] = logger
     return logger
 
-# Create a default logger for the project
-default_logger = setup_logger('nosql_project', log_file='app.log')
\ No newline at end of file
+_default_logger: Optional[logging.Logger] = None
+
+def get_default_logger() -> logging.Logger:
+    """
+    Get the default project logger, creating it (and app.log) on first use
+    
+    Returns:
+        The 'nosql_project' logger
+    """
+    global _default_logger
+    if _default_logger is None:
+        _default_logger = setup_logger('nosql_project', log_file='app.log')
+    return _default_logger
+
+def __getattr__(name: str):
+    """Keep `from utils.logger import default_logger` working without opening app.log at import"""
+    if name == 'default_logger':
+        return get_default_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
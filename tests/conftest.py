@@ -0,0 +1,36 @@
+"""
+Shared pytest setup for the test suite
+"""
+
+import sys
+import os
+
+import pytest
+
+# Put src/ on the import path once for every test module; the modules only
+# add it themselves when run directly as scripts
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+@pytest.fixture(scope="session")
+def rdf_connector():
+    """One Fuseki connector shared by the RDF and RDF schema tests"""
+    from connectors.rdf_connector import RDFConnector
+    
+    connector = RDFConnector()
+    if not connector.connect():
+        pytest.skip("Fuseki is not reachable")
+    yield connector
+    connector.disconnect()
+
+@pytest.fixture(scope="session")
+def redis_connector():
+    """One Redis connector shared by the Redis and Redis schema tests"""
+    from connectors.redis_connector import RedisConnector
+    
+    connector = RedisConnector()
+    if not connector.connect():
+        pytest.skip("Redis is not reachable")
+    yield connector
+    connector.disconnect()
\ No newline at end of file
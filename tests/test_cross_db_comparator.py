@@ -5,7 +5,9 @@ Test Cross-Database Comparator
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from cross_db_comparator import CrossDatabaseComparator
 
@@ -6,7 +6,11 @@ Tests connection and operations
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.hbase_connector import HBaseConnector
 
@@ -33,6 +37,15 @@ def test_connection():
         print("✗ Connection failed")
         return None
 
+@pytest.fixture(scope="module")
+def connector():
+    """One HBase (Thrift) connection shared by every test in this module"""
+    connector = HBaseConnector()
+    if not connector.connect():
+        pytest.skip("HBase (Thrift) is not reachable")
+    yield connector
+    connector.disconnect()
+
 def test_list_tables(connector):
     """Test 2: List tables"""
     print_section("TEST 2: List Tables")
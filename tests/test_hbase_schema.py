@@ -1,5 +1,7 @@
 import sys, os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.hbase_connector import HBaseConnector
 from schema.hbase_schema_explorer import HBaseSchemaExplorer
@@ -5,9 +5,14 @@ Tests connection and queries on just the movies collection
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
 
 # Add src directory to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.mongodb_connector import MongoDBConnector
 
@@ -38,6 +43,15 @@ def test_connection():
         print("✗ Connection failed")
         return None
 
+@pytest.fixture(scope="module")
+def connector():
+    """One MongoDB connection shared by every test in this module"""
+    connector = MongoDBConnector()
+    if not connector.connect():
+        pytest.skip("MongoDB is not reachable")
+    yield connector
+    connector.disconnect()
+
 def test_database_structure(connector):
     """Test 2: Explore database structure"""
     print_section("TEST 2: Database Structure")
@@ -51,9 +65,21 @@ def test_database_structure(connector):
     # List collections in sample_mflix
     collections = connector.get_collections('sample_mflix')
     print(f"\n📁 Collections in 'sample_mflix' ({len(collections)}):")
+    
+    # Count every collection in one round-trip: each collection adds its own
+    # {_id: name, count: n} row via $unionWith (empty collections add none)
+    counts = {}
+    if collections:
+        pipeline = [{'$group': {'_id': collections[0], 'count': {'$sum': 1}}}]
+        for coll in collections[1:]:
+            pipeline.append({'$unionWith': {
+                'coll': coll,
+                'pipeline': [{'$group': {'_id': coll, 'count': {'$sum': 1}}}]
+            }})
+        counts = {row['_id']: row['count'] for row in connector.aggregate(collections[0], pipeline)}
+    
     for coll in collections:
-        count = connector.count_documents(coll)
-        print(f"  - {coll}: {count:,} documents")
+        print(f"  - {coll}: {counts.get(coll, 0):,} documents")
 
 def test_movies_stats(connector):
     """Test 3: Get movies collection statistics"""
@@ -79,9 +105,22 @@ def test_basic_queries(connector):
     """Test 4: Basic find operations"""
     print_section("TEST 4: Basic Queries")
     
+    # The four queries are independent, so they run concurrently over the
+    # client's connection pool and are printed afterwards
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        movie_future = executor.submit(
+            connector.find_one, 'movies',
+            projection={'title': 1, 'year': 1, 'genres': 1, 'directors': 1, 'imdb.rating': 1}
+        )
+        total_future = executor.submit(connector.estimated_count, 'movies')
+        movies_2015_future = executor.submit(
+            connector.find_many, 'movies', {'year': 2015}, projection={'title': 1}, limit=5
+        )
+        year_count_future = executor.submit(connector.count_documents, 'movies', {'year': 2015})
+    
     # Query 1: Find one movie
     print("\n🎬 Sample Movie:")
-    movie = connector.find_one('movies')
+    movie = movie_future.result()
     if movie:
         print(f"  Title: {movie.get('title', 'N/A')}")
         print(f"  Year: {movie.get('year', 'N/A')}")
@@ -94,28 +133,60 @@ def test_basic_queries(connector):
             print(f"  IMDb Rating: {imdb.get('rating', 'N/A')}")
     
     # Query 2: Count total movies
-    total = connector.count_documents('movies')
+    total = total_future.result()
     print(f"\n📊 Total Movies: {total:,}")
     
     # Query 3: Find movies from 2015
     print("\n🎬 Movies from 2015:")
-    movies_2015 = connector.find_many('movies', {'year': 2015}, limit=5)
+    movies_2015 = movies_2015_future.result()
     print(f"  Found {len(movies_2015)} (showing first 5):")
     for movie in movies_2015:
         print(f"    - {movie.get('title')}")
     
     # Query 4: Count movies by year
-    year_count = connector.count_documents('movies', {'year': 2015})
+    year_count = year_count_future.result()
     print(f"  Total 2015 movies: {year_count}")
 
 def test_filtered_queries(connector):
     """Test 5: Complex filtered queries"""
     print_section("TEST 5: Filtered Queries")
     
+    # The unsorted queries (plus the Action count) in one round-trip
+    facet_pipeline = [{'$facet': {
+        'action': [
+            {'$match': {'genres': 'Action'}},
+            {'$limit': 5},
+            {'$project': {'title': 1, 'year': 1}}
+        ],
+        'action_count': [{'$match': {'genres': 'Action'}}, {'$count': 'n'}],
+        'nolan': [
+            {'$match': {'directors': 'Christopher Nolan'}},
+            {'$limit': 10},
+            {'$project': {'title': 1, 'year': 1}}
+        ]
+    }}]
+    
+    # The $facet and the sorted find are independent; run them concurrently
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        facet_future = executor.submit(connector.aggregate, 'movies', facet_pipeline)
+        # A plain find, not a $facet branch: $facet can't use indexes, so the
+        # sort would be done in memory over every match instead of a top-5 scan
+        high_rated_future = executor.submit(
+            connector.find_many,
+            'movies',
+            {'imdb.rating': {'$gte': 8.5}},
+            projection={'title': 1, 'year': 1, 'imdb.rating': 1},
+            limit=5,
+            sort=[('imdb.rating', -1)]
+        )
+    
+    results = facet_future.result()
+    facets = results[0] if results else {}
+    
     # Query 1: Action movies
     print("\n🎬 Action Movies (sample):")
-    action_movies = connector.find_many('movies', {'genres': 'Action'}, limit=5)
-    action_count = connector.count_documents('movies', {'genres': 'Action'})
+    action_movies = facets.get('action', [])
+    action_count = facets['action_count'][0]['n'] if facets.get('action_count') else 0
     print(f"  Total action movies: {action_count:,}")
     print(f"  Showing first {len(action_movies)}:")
     for movie in action_movies:
@@ -123,12 +194,7 @@ def test_filtered_queries(connector):
     
     # Query 2: Highly rated movies
     print("\n⭐ Highly Rated Movies (>= 8.5):")
-    high_rated = connector.find_many(
-        'movies',
-        {'imdb.rating': {'$gte': 8.5}},
-        limit=5,
-        sort=[('imdb.rating', -1)]
-    )
+    high_rated = high_rated_future.result()
     print(f"  Found {len(high_rated)} (showing top 5):")
     for movie in high_rated:
         rating = movie.get('imdb', {}).get('rating', 'N/A')
@@ -136,11 +202,7 @@ def test_filtered_queries(connector):
     
     # Query 3: Movies by specific director (if exists)
     print("\n🎬 Movies by Christopher Nolan:")
-    nolan_movies = connector.find_many(
-        'movies',
-        {'directors': 'Christopher Nolan'},
-        limit=10
-    )
+    nolan_movies = facets.get('nolan', [])
     if nolan_movies:
         print(f"  Found {len(nolan_movies)} movies:")
         for movie in nolan_movies:
@@ -152,46 +214,51 @@ def test_aggregation(connector):
     """Test 6: Aggregation queries"""
     print_section("TEST 6: Aggregation Queries")
     
-    # Aggregation 1: Count movies by genre
+    # All three aggregations share one pass over the collection
+    facet_pipeline = [{'$facet': {
+        # Aggregation 1: Count movies by genre
+        'by_genre': [
+            {'$unwind': '$genres'},
+            {'$group': {'_id': '$genres', 'count': {'$sum': 1}}},
+            {'$sort': {'count': -1}},
+            {'$limit': 10}
+        ],
+        # Aggregation 2: Movies by decade
+        'by_decade': [
+            {'$match': {'year': {'$gte': 1900, '$lte': 2020}}},
+            {'$group': {
+                '_id': {'$subtract': ['$year', {'$mod': ['$year', 10]}]},
+                'count': {'$sum': 1}
+            }},
+            {'$sort': {'_id': 1}}
+        ],
+        # Aggregation 3: Average rating by genre
+        'rating_by_genre': [
+            {'$match': {'imdb.rating': {'$exists': True}}},
+            {'$unwind': '$genres'},
+            {'$group': {
+                '_id': '$genres',
+                'avg_rating': {'$avg': '$imdb.rating'},
+                'count': {'$sum': 1}
+            }},
+            {'$match': {'count': {'$gte': 100}}},
+            {'$sort': {'avg_rating': -1}},
+            {'$limit': 5}
+        ]
+    }}]
+    results = connector.aggregate('movies', facet_pipeline)
+    facets = results[0] if results else {}
+    
     print("\n📊 Top 10 Genres by Movie Count:")
-    genre_pipeline = [
-        {'$unwind': '$genres'},
-        {'$group': {'_id': '$genres', 'count': {'$sum': 1}}},
-        {'$sort': {'count': -1}},
-        {'$limit': 10}
-    ]
-    genres = connector.aggregate('movies', genre_pipeline)
-    for i, genre in enumerate(genres, 1):
+    for i, genre in enumerate(facets.get('by_genre', []), 1):
         print(f"  {i}. {genre['_id']}: {genre['count']:,} movies")
     
-    # Aggregation 2: Movies by decade
     print("\n📊 Movies by Decade:")
-    decade_pipeline = [
-        {'$match': {'year': {'$gte': 1900, '$lte': 2020}}},
-        {'$addFields': {'decade': {'$subtract': ['$year', {'$mod': ['$year', 10]}]}}},
-        {'$group': {'_id': '$decade', 'count': {'$sum': 1}}},
-        {'$sort': {'_id': 1}}
-    ]
-    decades = connector.aggregate('movies', decade_pipeline)
-    for decade in decades:
+    for decade in facets.get('by_decade', []):
         print(f"  {decade['_id']}s: {decade['count']:,} movies")
     
-    # Aggregation 3: Average rating by genre
     print("\n📊 Average IMDb Rating by Genre (Top 5, min 100 movies):")
-    rating_pipeline = [
-        {'$match': {'imdb.rating': {'$exists': True}}},
-        {'$unwind': '$genres'},
-        {'$group': {
-            '_id': '$genres',
-            'avg_rating': {'$avg': '$imdb.rating'},
-            'count': {'$sum': 1}
-        }},
-        {'$match': {'count': {'$gte': 100}}},
-        {'$sort': {'avg_rating': -1}},
-        {'$limit': 5}
-    ]
-    ratings = connector.aggregate('movies', rating_pipeline)
-    for rating in ratings:
+    for rating in facets.get('rating_by_genre', []):
         print(f"  {rating['_id']}: {rating['avg_rating']:.2f} ({rating['count']} movies)")
 
 def test_distinct_values(connector):
@@ -200,26 +267,50 @@ def test_distinct_values(connector):
     
     # Get distinct genres
     print("\n🎭 All Genres:")
-    genres = connector.get_distinct_values('movies', 'genres')
-    genres_sorted = sorted([g for g in genres if g])
+    genres = connector.get_distinct_aggregated('movies', 'genres')
+    genres_sorted = [g for g in genres if g]
     print(f"  Found {len(genres_sorted)} unique genres:")
-    for i in range(0, len(genres_sorted), 5):
-        print(f"  {', '.join(genres_sorted[i:i+5])}")
+    # Five per row, written with a single print
+    if genres_sorted:
+        print("\n".join([f"  {', '.join(genres_sorted[i:i+5])}"
+                         for i in range(0, len(genres_sorted), 5)]))
     
     # Get years with movies
     print("\n📅 Year Range:")
-    years = connector.get_distinct_values('movies', 'year')
-    years = sorted([y for y in years if y and isinstance(y, int)])
-    if years:
-        print(f"  From {min(years)} to {max(years)}")
-        print(f"  Total: {len(years)} different years")
+    # Only the range and the number of distinct years come back
+    year_stats = connector.aggregate('movies', [
+        {'$match': {'year': {'$type': ['int', 'long'], '$ne': 0}}},
+        {'$group': {
+            '_id': None,
+            'min': {'$min': '$year'},
+            'max': {'$max': '$year'},
+            'years': {'$addToSet': '$year'}
+        }},
+        {'$project': {'min': 1, 'max': 1, 'count': {'$size': '$years'}}}
+    ])
+    if year_stats:
+        print(f"  From {year_stats[0]['min']} to {year_stats[0]['max']}")
+        print(f"  Total: {year_stats[0]['count']} different years")
     
     # Get sample directors
     print("\n🎬 Sample Directors:")
-    all_directors = connector.get_distinct_values('movies', 'directors')
-    all_directors = sorted([d for d in all_directors if d])
-    print(f"  Total unique directors: {len(all_directors):,}")
-    print(f"  First 20: {', '.join(all_directors[:20])}")
+    # Count on the server and fetch only the first 20 names, instead of
+    # pulling every distinct director over the wire
+    director_pipeline = [
+        {'$unwind': '$directors'},
+        {'$match': {'directors': {'$nin': [None, '']}}},
+        {'$group': {'_id': '$directors'}},
+        {'$facet': {
+            'total': [{'$count': 'n'}],
+            'first': [{'$sort': {'_id': 1}}, {'$limit': 20}]
+        }}
+    ]
+    results = connector.aggregate('movies', director_pipeline)
+    facets = results[0] if results else {}
+    total_directors = facets['total'][0]['n'] if facets.get('total') else 0
+    first_directors = [d['_id'] for d in facets.get('first', [])]
+    print(f"  Total unique directors: {total_directors:,}")
+    print(f"  First 20: {', '.join(first_directors)}")
 
 def test_crud_operations(connector):
     """Test 8: CRUD operations on test collection"""
@@ -227,57 +318,66 @@ def test_crud_operations(connector):
     
     test_collection = 'test_movies'
     
-    # Clean up from previous tests
-    connector.delete_many(test_collection, {})
-    
-    # INSERT
-    print("\n➕ Testing INSERT:")
-    doc1 = {
-        'title': 'Test Movie',
-        'year': 2024,
-        'genres': ['Drama', 'Action'],
-        'imdb': {'rating': 8.5}
-    }
-    doc_id = connector.insert_one(test_collection, doc1)
-    print(f"  ✓ Inserted document with ID: {doc_id}")
-    
-    # INSERT MANY
-    docs = [
-        {'title': 'Movie 2', 'year': 2024, 'genres': ['Comedy']},
-        {'title': 'Movie 3', 'year': 2024, 'genres': ['Action']},
-        {'title': 'Movie 4', 'year': 2023, 'genres': ['Drama']}
-    ]
-    count = connector.insert_many(test_collection, docs)
-    print(f"  ✓ Inserted {count} more documents")
-    
-    # READ
-    print("\n📖 Testing READ:")
-    all_docs = connector.find_many(test_collection, {})
-    print(f"  ✓ Found {len(all_docs)} documents")
-    for doc in all_docs:
-        print(f"    - {doc.get('title')}")
-    
-    # UPDATE
-    print("\n✏️ Testing UPDATE:")
-    modified = connector.update_one(
-        test_collection,
-        {'title': 'Test Movie'},
-        {'$set': {'imdb': {'rating': 9.0}, 'updated': True}}
-    )
-    print(f"  ✓ Updated {modified} document")
-    
-    # Verify update
-    updated_doc = connector.find_one(test_collection, {'title': 'Test Movie'})
-    if updated_doc:
-        print(f"  New rating: {updated_doc.get('imdb', {}).get('rating')}")
-    
-    # DELETE
-    print("\n🗑️ Testing DELETE:")
-    deleted = connector.delete_many(test_collection, {})
-    print(f"  ✓ Deleted {deleted} documents (cleanup)")
-    
-    remaining = connector.count_documents(test_collection)
-    print(f"  ✓ Remaining documents: {remaining}")
+    # Scratch data: don't wait for the journal on every write; the shared
+    # connector gets its previous setting back even if a step fails
+    previous_fast_writes = connector.fast_writes
+    connector.fast_writes = True
+    
+    try:
+        # Clean up from previous tests
+        connector.delete_many(test_collection, {})
+        
+        # INSERT
+        print("\n➕ Testing INSERT:")
+        doc1 = {
+            'title': 'Test Movie',
+            'year': 2024,
+            'genres': ['Drama', 'Action'],
+            'imdb': {'rating': 8.5}
+        }
+        doc_id = connector.insert_one(test_collection, doc1)
+        print(f"  ✓ Inserted document with ID: {doc_id}")
+        
+        # INSERT MANY
+        docs = [
+            {'title': 'Movie 2', 'year': 2024, 'genres': ['Comedy']},
+            {'title': 'Movie 3', 'year': 2024, 'genres': ['Action']},
+            {'title': 'Movie 4', 'year': 2023, 'genres': ['Drama']}
+        ]
+        count = connector.insert_many(test_collection, docs)
+        print(f"  ✓ Inserted {count} more documents")
+        
+        # READ
+        print("\n📖 Testing READ:")
+        all_docs = connector.find_many(test_collection, {}, projection={'title': 1})
+        print(f"  ✓ Found {len(all_docs)} documents")
+        for doc in all_docs:
+            print(f"    - {doc.get('title')}")
+        
+        # UPDATE
+        print("\n✏️ Testing UPDATE:")
+        modified = connector.update_one(
+            test_collection,
+            {'title': 'Test Movie'},
+            {'$set': {'imdb': {'rating': 9.0}, 'updated': True}}
+        )
+        print(f"  ✓ Updated {modified} document")
+        
+        # Verify update
+        updated_doc = connector.find_one(test_collection, {'title': 'Test Movie'}, {'imdb.rating': 1})
+        if updated_doc:
+            print(f"  New rating: {updated_doc.get('imdb', {}).get('rating')}")
+        
+        # DELETE
+        print("\n🗑️ Testing DELETE:")
+        deleted = connector.delete_many(test_collection, {})
+        print(f"  ✓ Deleted {deleted} documents (cleanup)")
+        
+        remaining = connector.estimated_count(test_collection)
+        print(f"  ✓ Remaining documents: {remaining}")
+    
+    finally:
+        connector.fast_writes = previous_fast_writes
 
 def run_all_tests():
     """Run all tests"""
@@ -5,7 +5,11 @@ Test MongoDB Schema Explorer
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.mongodb_connector import MongoDBConnector
 from schema.mongodb_schema_explorer import MongoDBSchemaExplorer
@@ -15,15 +19,19 @@ def print_section(title):
     print(f" {title}")
     print("="*70)
 
-def test_field_analysis():
+@pytest.fixture(scope="module")
+def explorer():
+    """One connection and explorer shared by every test in this module"""
+    connector = MongoDBConnector()
+    if not connector.connect():
+        pytest.skip("MongoDB is not reachable")
+    yield MongoDBSchemaExplorer(connector)
+    connector.disconnect()
+
+def test_field_analysis(explorer):
     """Test field type analysis"""
     print_section("TEST 1: Field Type Analysis")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     # Analyze movies collection
     print("\n🔍 Analyzing 'movies' collection fields...")
     fields = explorer.analyze_field_types('movies', sample_size=100)
@@ -39,18 +47,11 @@ def test_field_analysis():
             print(f"    Nested: Yes")
         if field_info.get('sample_values'):
             print(f"    Samples: {field_info['sample_values'][:2]}")
-    
-    connector.disconnect()
 
-def test_relationship_inference():
+def test_relationship_inference(explorer):
     """Test relationship inference"""
     print_section("TEST 2: Relationship Inference")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     print("\n🔗 Inferring relationships...")
     relationships = explorer.infer_relationships('movies')
     
@@ -60,18 +61,11 @@ def test_relationship_inference():
             print(f"  {rel['from_collection']}.{rel['from_field']} → {rel['to_collection']}")
     else:
         print("\nNo relationships found (this is normal for movies collection)")
-    
-    connector.disconnect()
 
-def test_collection_schema():
+def test_collection_schema(explorer):
     """Test complete collection schema"""
     print_section("TEST 3: Collection Schema")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     print("\n📋 Getting complete schema for 'movies'...")
     schema = explorer.get_collection_schema('movies', sample_size=100)
     
@@ -80,51 +74,30 @@ def test_collection_schema():
     print(f"Fields: {len(schema['fields'])}")
     print(f"Relationships: {len(schema['relationships'])}")
     print(f"Indexes: {len(schema['indexes'])}")
-    
-    connector.disconnect()
 
-def test_schema_summary():
+def test_schema_summary(explorer):
     """Test schema summary generation"""
     print_section("TEST 4: Schema Summary")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     print("\n📄 Generating human-readable summary...")
     schema = explorer.get_collection_schema('movies', sample_size=100)
     summary = explorer.generate_schema_summary(schema)
     
     print("\n" + summary)
-    
-    connector.disconnect()
 
-def test_llm_context():
+def test_llm_context(explorer):
     """Test LLM context generation"""
     print_section("TEST 5: LLM Context Generation")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     print("\n🤖 Generating LLM-optimized context...")
     llm_context = explorer.generate_llm_context('movies')
     
     print("\n" + llm_context)
-    
-    connector.disconnect()
 
-def test_database_schema():
+def test_database_schema(explorer):
     """Test full database schema"""
     print_section("TEST 6: Full Database Schema")
     
-    connector = MongoDBConnector()
-    connector.connect()
-    
-    explorer = MongoDBSchemaExplorer(connector)
-    
     print("\n🗄️ Analyzing entire database...")
     print("(This may take a minute...)")
     
@@ -137,8 +110,6 @@ def test_database_schema():
         print(f"\n  {coll_name}:")
         print(f"    Documents: {coll_schema['document_count']:,}")
         print(f"    Fields: {len(coll_schema['fields'])}")
-    
-    connector.disconnect()
 
 def run_all_tests():
     """Run all tests"""
@@ -146,13 +117,22 @@ def run_all_tests():
     print(" "*15 + "MONGODB SCHEMA EXPLORER TESTS")
     print("="*70)
     
+    # One connection and one explorer shared by every test, so the explorer's
+    # field and metadata caches carry over between tests using the same sample
+    connector = MongoDBConnector()
+    if not connector.connect():
+        print("\n✗ Connection failed. Cannot continue tests.")
+        return
+    
+    explorer = MongoDBSchemaExplorer(connector)
+    
     try:
-        test_field_analysis()
-        test_relationship_inference()
-        test_collection_schema()
-        test_schema_summary()
-        test_llm_context()
-        test_database_schema()
+        test_field_analysis(explorer)
+        test_relationship_inference(explorer)
+        test_collection_schema(explorer)
+        test_schema_summary(explorer)
+        test_llm_context(explorer)
+        test_database_schema(explorer)
         
         print("\n" + "="*70)
         print("✅ ALL TESTS COMPLETED")
@@ -162,6 +142,9 @@ def run_all_tests():
         print(f"\n✗ Test failed: {e}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        connector.disconnect()
 
 if __name__ == "__main__":
     run_all_tests()
\ No newline at end of file
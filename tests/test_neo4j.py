@@ -6,10 +6,82 @@ Tests connection and operations on the movie graph
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.neo4j_connector import Neo4jConnector
 
+# Cypher used by the tests; values are passed as parameters so each query
+# is planned once and served from Neo4j's query cache afterwards
+GRAPH_STATS = """
+CALL apoc.meta.stats() YIELD labels, relTypesCount, nodeCount, relCount
+RETURN labels, relTypesCount, nodeCount, relCount
+"""
+
+ACTED_IN_PAIRS = """
+MATCH (p:Person)-[r:ACTED_IN]->(m:Movie)
+RETURN p.name as actor, m.title as movie
+LIMIT $limit
+"""
+
+DIRECTED_PAIRS = """
+MATCH (p:Person)-[r:DIRECTED]->(m:Movie)
+RETURN p.name as director, m.title as movie
+LIMIT $limit
+"""
+
+MOVIES_BY_YEAR = """
+MATCH (m:Movie)
+WHERE m.year = $year
+RETURN m.title, m.imdb_rating
+ORDER BY m.imdb_rating DESC
+LIMIT $limit
+"""
+
+DIRECTOR_ACTORS = """
+MATCH (d:Person)-[:DIRECTED]->(m:Movie)<-[:ACTED_IN]-(a:Person)
+WHERE d.name = $director
+RETURN DISTINCT a.name as actor, count(m) as movies
+ORDER BY movies DESC
+LIMIT $limit
+"""
+
+CO_ACTORS = """
+MATCH (a1:Person)-[:ACTED_IN]->(m:Movie)<-[:ACTED_IN]-(a2:Person)
+WHERE a1.name < a2.name
+RETURN a1.name as actor1, a2.name as actor2, m.title as movie
+LIMIT $limit
+"""
+
+TOP_ACTORS = """
+MATCH (p:Person)-[:ACTED_IN]->(m:Movie)
+RETURN p.name as actor, count(m) as movie_count
+ORDER BY movie_count DESC
+LIMIT $limit
+"""
+
+TOP_DIRECTORS = """
+MATCH (p:Person)-[:DIRECTED]->(m:Movie)
+RETURN p.name as director, count(m) as movie_count
+ORDER BY movie_count DESC
+LIMIT $limit
+"""
+
+CREATE_ACTED_IN = """
+UNWIND $batch AS row
+CREATE (p:Person {name: row.pname, born: row.born})
+CREATE (m:Movie {title: row.mtitle, year: row.myear})
+CREATE (p)-[:ACTED_IN {role: row.role}]->(m)
+"""
+
+DELETE_PERSON_AND_MOVIE = """
+MATCH (p:Person {name: $pname}), (m:Movie {title: $mtitle})
+DETACH DELETE p, m
+"""
+
 def print_section(title):
     """Print formatted section header"""
     print("\n" + "="*70)
@@ -35,27 +107,69 @@ def test_connection():
         print("✗ Connection failed")
         return None
 
+def quote(name):
+    """Backtick-quote a label or relationship type for Cypher"""
+    return "`" + name.replace("`", "``") + "`"
+
+def get_graph_counts(connector):
+    """Per-label, per-type and total counts in a single query"""
+    # With APOC every counter comes from the count store in one procedure call
+    rows = connector.execute_query(GRAPH_STATS)
+    if rows:
+        stats = rows[0]
+        return stats['labels'], stats['relTypesCount'], stats['nodeCount'], stats['relCount']
+    
+    # Without APOC, one UNION ALL query with a branch per label and type;
+    # each branch aggregates before adding constant columns so it stays a
+    # count-store lookup
+    labels = connector.get_labels()
+    rel_types = connector.get_relationship_types()
+    branches = [
+        f"MATCH (n:{quote(label)}) WITH count(n) AS count "
+        f"RETURN 'label' AS kind, $names[{i}] AS name, count"
+        for i, label in enumerate(labels)
+    ] + [
+        f"MATCH ()-[r:{quote(rel_type)}]->() WITH count(r) AS count "
+        f"RETURN 'type' AS kind, $names[{i}] AS name, count"
+        for i, rel_type in enumerate(rel_types, len(labels))
+    ] + [
+        "MATCH (n) WITH count(n) AS count RETURN 'total' AS kind, 'nodes' AS name, count",
+        "MATCH ()-[r]->() WITH count(r) AS count RETURN 'total' AS kind, 'relationships' AS name, count"
+    ]
+    rows = connector.execute_query(" UNION ALL ".join(branches), {'names': labels + rel_types})
+    counts = {(row['kind'], row['name']): row['count'] for row in rows}
+    
+    label_counts = {label: counts.get(('label', label), 0) for label in labels}
+    rel_counts = {rel_type: counts.get(('type', rel_type), 0) for rel_type in rel_types}
+    return (label_counts, rel_counts,
+            counts.get(('total', 'nodes'), 0), counts.get(('total', 'relationships'), 0))
+
+@pytest.fixture(scope="module")
+def connector():
+    """One Neo4j connection shared by every test in this module"""
+    connector = Neo4jConnector()
+    if not connector.connect():
+        pytest.skip("Neo4j is not reachable")
+    yield connector
+    connector.disconnect()
+
 def test_database_info(connector):
     """Test 2: Database information"""
     print_section("TEST 2: Database Information")
     
+    label_counts, rel_counts, total_nodes, total_rels = get_graph_counts(connector)
+    
     # Get labels
-    labels = connector.get_labels()
-    print(f"\n📊 Node Labels ({len(labels)}):")
-    for label in labels:
-        count = connector.count_nodes(label)
+    print(f"\n📊 Node Labels ({len(label_counts)}):")
+    for label, count in label_counts.items():
         print(f"  - {label}: {count:,} nodes")
     
     # Get relationship types
-    rel_types = connector.get_relationship_types()
-    print(f"\n🔗 Relationship Types ({len(rel_types)}):")
-    for rel_type in rel_types:
-        count = connector.count_relationships(rel_type)
+    print(f"\n🔗 Relationship Types ({len(rel_counts)}):")
+    for rel_type, count in rel_counts.items():
         print(f"  - {rel_type}: {count:,} relationships")
     
     # Total counts
-    total_nodes = connector.count_nodes()
-    total_rels = connector.count_relationships()
     print(f"\n📈 Total Statistics:")
     print(f"  - Total Nodes: {total_nodes:,}")
     print(f"  - Total Relationships: {total_rels:,}")
@@ -66,14 +180,14 @@ def test_find_nodes(connector):
     
     # Find movies
     print("\n🎬 Sample Movies:")
-    movies = connector.find_nodes('Movie', limit=5)
+    movies = connector.find_nodes_projected('Movie', ['title', 'year', 'imdb_rating'], limit=5)
     for movie in movies:
         print(f"  - {movie.get('title')} ({movie.get('year')})")
         print(f"    Rating: {movie.get('imdb_rating', 'N/A')}")
     
     # Find people
     print("\n👤 Sample People:")
-    people = connector.find_nodes('Person', limit=5)
+    people = connector.find_nodes_projected('Person', ['name'], limit=5)
     for person in people:
         print(f"  - {person.get('name')}")
 
@@ -83,23 +197,13 @@ def test_find_relationships(connector):
     
     # Find actors and their movies
     print("\n🎭 Actors and Movies:")
-    query = """
-    MATCH (p:Person)-[r:ACTED_IN]->(m:Movie)
-    RETURN p.name as actor, m.title as movie
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
+    results = connector.execute_query(ACTED_IN_PAIRS, {'limit': 10})
     for record in results:
         print(f"  - {record['actor']} acted in '{record['movie']}'")
     
     # Find directors and their movies
     print("\n🎬 Directors and Movies:")
-    query = """
-    MATCH (p:Person)-[r:DIRECTED]->(m:Movie)
-    RETURN p.name as director, m.title as movie
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
+    results = connector.execute_query(DIRECTED_PAIRS, {'limit': 10})
     for record in results:
         print(f"  - {record['director']} directed '{record['movie']}'")
 
@@ -107,91 +211,59 @@ def test_complex_queries(connector):
     """Test 5: Complex graph queries"""
     print_section("TEST 5: Complex Queries")
     
+    # Movies by year, actors who worked with a director and co-actors, read
+    # in one transaction
+    movies_2010, nolan_actors, co_actors = connector.execute_queries([
+        (MOVIES_BY_YEAR, {'year': 2010, 'limit': 5}),
+        (DIRECTOR_ACTORS, {'director': 'Christopher Nolan', 'limit': 5}),
+        (CO_ACTORS, {'limit': 5})
+    ])
+    
     # Find movies by year
     print("\n📅 Movies from 2010:")
-    query = """
-    MATCH (m:Movie)
-    WHERE m.year = 2010
-    RETURN m.title, m.imdb_rating
-    ORDER BY m.imdb_rating DESC
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for record in results:
+    for record in movies_2010:
         print(f"  - {record['m.title']}: {record['m.imdb_rating']}")
     
     # Find actors who worked with specific director
     print("\n🎬 Actors who worked with Christopher Nolan:")
-    query = """
-    MATCH (d:Person)-[:DIRECTED]->(m:Movie)<-[:ACTED_IN]-(a:Person)
-    WHERE d.name = 'Christopher Nolan'
-    RETURN DISTINCT a.name as actor, count(m) as movies
-    ORDER BY movies DESC
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for record in results:
+    for record in nolan_actors:
         print(f"  - {record['actor']}: {record['movies']} movie(s)")
     
     # Find co-actors
     print("\n👥 Actors who appeared together:")
-    query = """
-    MATCH (a1:Person)-[:ACTED_IN]->(m:Movie)<-[:ACTED_IN]-(a2:Person)
-    WHERE a1.name < a2.name
-    RETURN a1.name as actor1, a2.name as actor2, m.title as movie
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for record in results:
+    for record in co_actors:
         print(f"  - {record['actor1']} and {record['actor2']} in '{record['movie']}'")
 
 def test_aggregations(connector):
     """Test 6: Aggregation queries"""
     print_section("TEST 6: Aggregations")
     
+    top_actors, top_directors = connector.execute_queries([
+        (TOP_ACTORS, {'limit': 5}),
+        (TOP_DIRECTORS, {'limit': 5})
+    ])
+    
     # Most prolific actors
     print("\n🌟 Most Prolific Actors:")
-    query = """
-    MATCH (p:Person)-[:ACTED_IN]->(m:Movie)
-    RETURN p.name as actor, count(m) as movie_count
-    ORDER BY movie_count DESC
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for record in results:
+    for record in top_actors:
         print(f"  - {record['actor']}: {record['movie_count']} movies")
     
     # Most prolific directors
     print("\n🎬 Most Prolific Directors:")
-    query = """
-    MATCH (p:Person)-[:DIRECTED]->(m:Movie)
-    RETURN p.name as director, count(m) as movie_count
-    ORDER BY movie_count DESC
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for record in results:
+    for record in top_directors:
         print(f"  - {record['director']}: {record['movie_count']} movies")
 
 def test_crud_operations(connector):
     """Test 7: CRUD operations"""
     print_section("TEST 7: CRUD Operations")
     
-    # CREATE
-    print("\n➕ Creating test nodes:")
-    connector.create_node('Person', {'name': 'Test Actor', 'born': 1990})
-    connector.create_node('Movie', {'title': 'Test Movie', 'year': 2024})
-    print("  ✓ Created Person and Movie nodes")
-    
-    # CREATE relationship
-    print("\n🔗 Creating relationship:")
-    connector.create_relationship(
-        'Person', {'name': 'Test Actor'},
-        'Movie', {'title': 'Test Movie'},
-        'ACTED_IN',
-        {'role': 'Lead'}
-    )
-    print("  ✓ Created ACTED_IN relationship")
+    # CREATE nodes and relationship in one transaction
+    print("\n➕ Creating test nodes and relationship:")
+    summary = connector.execute_write(CREATE_ACTED_IN, {'batch': [
+        {'pname': 'Test Actor', 'born': 1990, 'mtitle': 'Test Movie', 'myear': 2024, 'role': 'Lead'}
+    ]})
+    print(f"  ✓ Created {summary.get('nodes_created', 0)} nodes and "
+          f"{summary.get('relationships_created', 0)} ACTED_IN relationship")
     
     # READ
     print("\n📖 Reading test nodes:")
@@ -208,11 +280,12 @@ def test_crud_operations(connector):
     )
     print("  ✓ Updated Person node")
     
-    # DELETE
+    # DELETE both nodes (and the relationship) in one transaction
     print("\n🗑️ Deleting test nodes:")
-    connector.delete_node('Person', {'name': 'Test Actor'})
-    connector.delete_node('Movie', {'title': 'Test Movie'})
-    print("  ✓ Deleted test nodes")
+    summary = connector.execute_write(
+        DELETE_PERSON_AND_MOVIE, {'pname': 'Test Actor', 'mtitle': 'Test Movie'}
+    )
+    print(f"  ✓ Deleted {summary.get('nodes_deleted', 0)} test nodes")
 
 def run_all_tests():
     """Run all tests"""
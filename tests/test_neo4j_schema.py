@@ -5,7 +5,11 @@ Test Neo4j Schema Explorer
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.neo4j_connector import Neo4jConnector
 from schema.neo4j_schema_explorer import Neo4jSchemaExplorer
@@ -15,40 +19,37 @@ def print_section(title):
     print(f" {title}")
     print("="*70)
 
-def test_labels_and_types():
+@pytest.fixture(scope="module")
+def explorer():
+    """One connection and explorer shared by every test in this module"""
+    connector = Neo4jConnector()
+    if not connector.connect():
+        pytest.skip("Neo4j is not reachable")
+    yield Neo4jSchemaExplorer(connector)
+    connector.disconnect()
+
+def test_labels_and_types(explorer):
     """Test getting labels and relationship types"""
     print_section("TEST 1: Labels and Relationship Types")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     # Get labels
     labels = explorer.get_node_labels()
+    label_counts = explorer.connector.count_nodes_bulk(labels)
     print(f"\n🏷️  Node Labels ({len(labels)}):")
-    for label in labels:
-        count = connector.count_nodes(label)
+    for label, count in label_counts.items():
         print(f"  - {label}: {count:,} nodes")
     
     # Get relationship types
     rel_types = explorer.get_relationship_types()
+    rel_counts = explorer.connector.count_relationships_bulk(rel_types)
     print(f"\n🔗 Relationship Types ({len(rel_types)}):")
-    for rel_type in rel_types:
-        count = connector.count_relationships(rel_type)
+    for rel_type, count in rel_counts.items():
         print(f"  - {rel_type}: {count:,} relationships")
-    
-    connector.disconnect()
 
-def test_node_properties():
+def test_node_properties(explorer):
     """Test node property analysis"""
     print_section("TEST 2: Node Property Analysis")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     # Analyze Movie node properties
     print("\n🎬 Analyzing Movie node properties...")
     properties = explorer.analyze_node_properties('Movie', sample_size=50)
@@ -60,36 +61,22 @@ def test_node_properties():
         print(f"    Presence: {prop_info['presence']}")
         if prop_info.get('sample_values'):
             print(f"    Samples: {prop_info['sample_values'][:2]}")
-    
-    connector.disconnect()
 
-def test_relationship_patterns():
+def test_relationship_patterns(explorer):
     """Test relationship pattern detection"""
     print_section("TEST 3: Relationship Patterns")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     print("\n🔗 Detecting relationship patterns...")
     patterns = explorer.get_relationship_patterns()
     
     print(f"\nFound {len(patterns)} patterns:\n")
     for pattern in patterns[:10]:
         print(f"  ({pattern['source_label']})-[:{pattern['relationship_type']}]->({pattern['target_label']}) [{pattern['count']} instances]")
-    
-    connector.disconnect()
 
-def test_node_schema():
+def test_node_schema(explorer):
     """Test complete node schema"""
     print_section("TEST 4: Complete Node Schema")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     print("\n📋 Getting complete schema for Movie nodes...")
     schema = explorer.get_node_schema('Movie', sample_size=50)
     
@@ -103,18 +90,11 @@ def test_node_schema():
         print("\nOutgoing relationships:")
         for rel in schema['outgoing_relationships'][:3]:
             print(f"  - {rel['type']} -> {rel['target_labels']}")
-    
-    connector.disconnect()
 
-def test_relationship_schema():
+def test_relationship_schema(explorer):
     """Test relationship schema"""
     print_section("TEST 5: Relationship Schema")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     # Get first relationship type
     rel_types = explorer.get_relationship_types()
     if rel_types:
@@ -131,41 +111,28 @@ def test_relationship_schema():
             print("\nPatterns:")
             for pattern in schema['patterns'][:3]:
                 print(f"  ({pattern['source_labels']}) -> ({pattern['target_labels']})")
-    
-    connector.disconnect()
 
-def test_schema_summary():
+def test_schema_summary(explorer):
     """Test schema summary generation"""
     print_section("TEST 6: Schema Summary")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     print("\n📄 Generating schema summary...")
     schema = explorer.get_graph_schema(sample_size=50)
     summary = explorer.generate_schema_summary(schema)
     
     print("\n" + summary)
-    
-    connector.disconnect()
 
-def test_llm_context():
+def test_llm_context(explorer):
     """Test LLM context generation"""
     print_section("TEST 7: LLM Context Generation")
     
-    connector = Neo4jConnector()
-    connector.connect()
-    
-    explorer = Neo4jSchemaExplorer(connector)
-    
     print("\n🤖 Generating LLM-optimized context...")
-    llm_context = explorer.generate_llm_context()
-    
-    print("\n" + llm_context[:1000] + "...")  # First 1000 chars
+    # Same sample size as the summary test, so the explorer's cached schema
+    # is reused instead of sampling the graph again
+    schema = explorer.get_graph_schema(sample_size=50)
+    llm_context = explorer.generate_llm_context(schema=schema, max_chars=1000)
     
-    connector.disconnect()
+    print("\n" + llm_context + "...")  # First 1000 chars
 
 def run_all_tests():
     """Run all tests"""
@@ -173,14 +140,23 @@ def run_all_tests():
     print(" "*15 + "NEO4J SCHEMA EXPLORER TESTS")
     print("="*70)
     
+    # One connection and one explorer shared by every test instead of a
+    # connect/disconnect per test
+    connector = Neo4jConnector()
+    if not connector.connect():
+        print("\n✗ Connection failed. Cannot continue tests.")
+        return
+    
+    explorer = Neo4jSchemaExplorer(connector)
+    
     try:
-        test_labels_and_types()
-        test_node_properties()
-        test_relationship_patterns()
-        test_node_schema()
-        test_relationship_schema()
-        test_schema_summary()
-        test_llm_context()
+        test_labels_and_types(explorer)
+        test_node_properties(explorer)
+        test_relationship_patterns(explorer)
+        test_node_schema(explorer)
+        test_relationship_schema(explorer)
+        test_schema_summary(explorer)
+        test_llm_context(explorer)
         
         print("\n" + "="*70)
         print("✅ ALL TESTS COMPLETED")
@@ -190,6 +166,9 @@ def run_all_tests():
         print(f"\n✗ Test failed: {e}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        connector.disconnect()
 
 if __name__ == "__main__":
     run_all_tests()
\ No newline at end of file
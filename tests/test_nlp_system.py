@@ -4,29 +4,53 @@ Test Natural Language Query System (End-to-End)
 
 import sys
 import os
+from concurrent.futures import ThreadPoolExecutor
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from llm.query_translator import QueryTranslator
 from llm.query_executor import QueryExecutor
-from schema.mongodb_schema_explorer import MongoDBSchemaExplorer
-from schema.neo4j_schema_explorer import Neo4jSchemaExplorer
-from schema.redis_schema_explorer import RedisSchemaExplorer
-from schema.rdf_schema_explorer import RDFSchemaExplorer
-from connectors.mongodb_connector import MongoDBConnector
-from connectors.neo4j_connector import Neo4jConnector
-from connectors.redis_connector import RedisConnector
-from connectors.rdf_connector import RDFConnector
+
+# Translations are kept on disk, so reruns against an unchanged schema skip
+# the LLM calls
+TRANSLATION_CACHE_DIR = '~/.cache/nosql_project/translations'
 
 def print_section(title):
     print("\n" + "="*70)
     print(f" {title}")
     print("="*70)
 
-def test_mongodb_nlq():
+@pytest.fixture(scope="module")
+def translator():
+    """One translator for every backend, with translations cached on disk"""
+    try:
+        return QueryTranslator(cache_dir=TRANSLATION_CACHE_DIR)
+    except ValueError as e:
+        pytest.skip(str(e))
+
+@pytest.fixture(scope="module")
+def executor():
+    """One executor for every backend, closed after the module's tests"""
+    executor = QueryExecutor()
+    yield executor
+    executor.close_all()
+
+def translate_all(translate, queries, schema):
+    """Translate every query concurrently; results come back in query order"""
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        return list(pool.map(lambda nlq: translate(nlq, schema), queries))
+
+def test_mongodb_nlq(translator, executor):
     """Test MongoDB natural language queries"""
     print_section("TEST 1: MongoDB Natural Language Queries")
     
+    from connectors.mongodb_connector import MongoDBConnector
+    from schema.mongodb_schema_explorer import MongoDBSchemaExplorer
+    
     # Get schema
     print("\n📊 Loading MongoDB schema...")
     mongo_conn = MongoDBConnector()
@@ -34,10 +58,6 @@ def test_mongodb_nlq():
     explorer = MongoDBSchemaExplorer(mongo_conn)
     schema = explorer.generate_llm_context('movies')
     
-    # Initialize translator and executor
-    translator = QueryTranslator()
-    executor = QueryExecutor()
-    
     # Test queries
     test_queries = [
         "Find all movies from 2015",
@@ -45,11 +65,13 @@ def test_mongodb_nlq():
         "Find movies with rating above 8",
     ]
     
-    for nlq in test_queries:
+    # The LLM calls dominate and don't depend on each other, so translate all
+    # queries at once; results are executed and printed in order below
+    translations = translate_all(translator.translate_to_mongodb, test_queries, schema)
+    
+    for nlq, translated in zip(test_queries, translations):
         print(f"\n🔍 Natural Query: {nlq}")
         
-        # Translate
-        translated = translator.translate_to_mongodb(nlq, schema)
         print(f"📝 MongoDB Query: {translated.get('query', {})}")
         print(f"💡 Explanation: {translated.get('explanation', 'N/A')}")
         
@@ -67,10 +89,13 @@ def test_mongodb_nlq():
     
     mongo_conn.disconnect()
 
-def test_neo4j_nlq():
+def test_neo4j_nlq(translator, executor):
     """Test Neo4j natural language queries"""
     print_section("TEST 2: Neo4j Natural Language Queries")
     
+    from connectors.neo4j_connector import Neo4jConnector
+    from schema.neo4j_schema_explorer import Neo4jSchemaExplorer
+    
     # Get schema
     print("\n📊 Loading Neo4j schema...")
     neo4j_conn = Neo4jConnector()
@@ -78,19 +103,17 @@ def test_neo4j_nlq():
     explorer = Neo4jSchemaExplorer(neo4j_conn)
     schema = explorer.generate_llm_context()
     
-    translator = QueryTranslator()
-    executor = QueryExecutor()
-    
     test_queries = [
         "Find all movies",
         "Who directed The Dark Knight?",
         "Show me actors in action movies"
     ]
     
-    for nlq in test_queries:
+    translations = translate_all(translator.translate_to_neo4j, test_queries, schema)
+    
+    for nlq, translated in zip(test_queries, translations):
         print(f"\n🔍 Natural Query: {nlq}")
         
-        translated = translator.translate_to_neo4j(nlq, schema)
         print(f"📝 Cypher: {translated.get('cypher', 'N/A')}")
         print(f"💡 Explanation: {translated.get('explanation', 'N/A')}")
         
@@ -105,29 +128,30 @@ def test_neo4j_nlq():
     
     neo4j_conn.disconnect()
 
-def test_redis_nlq():
+def test_redis_nlq(translator, executor):
     """Test Redis natural language queries"""
     print_section("TEST 3: Redis Natural Language Queries")
     
+    from connectors.redis_connector import RedisConnector
+    from schema.redis_schema_explorer import RedisSchemaExplorer
+    
     print("\n📊 Loading Redis schema...")
     redis_conn = RedisConnector()
     redis_conn.connect()
     explorer = RedisSchemaExplorer(redis_conn)
     schema = explorer.generate_llm_context()
     
-    translator = QueryTranslator()
-    executor = QueryExecutor()
-    
     test_queries = [
         "Get top 5 rated movies",
         "Find all genres",
         "Show me action movie IDs"
     ]
     
-    for nlq in test_queries:
+    translations = translate_all(translator.translate_to_redis, test_queries, schema)
+    
+    for nlq, translated in zip(test_queries, translations):
         print(f"\n🔍 Natural Query: {nlq}")
         
-        translated = translator.translate_to_redis(nlq, schema)
         print(f"📝 Redis Commands: {translated.get('commands', [])}")
         print(f"💡 Explanation: {translated.get('explanation', 'N/A')}")
         
@@ -142,29 +166,30 @@ def test_redis_nlq():
     
     redis_conn.disconnect()
 
-def test_rdf_nlq():
+def test_rdf_nlq(translator, executor):
     """Test RDF natural language queries"""
     print_section("TEST 4: RDF/SPARQL Natural Language Queries")
     
+    from connectors.rdf_connector import RDFConnector
+    from schema.rdf_schema_explorer import RDFSchemaExplorer
+    
     print("\n📊 Loading RDF schema...")
     rdf_conn = RDFConnector()
     rdf_conn.connect()
     explorer = RDFSchemaExplorer(rdf_conn)
     schema = explorer.generate_llm_context()
     
-    translator = QueryTranslator()
-    executor = QueryExecutor()
-    
     test_queries = [
         "Find all movies",
         "Show me drama movies",
         "Who directed movies in 1924?"
     ]
     
-    for nlq in test_queries:
+    translations = translate_all(translator.translate_to_sparql, test_queries, schema)
+    
+    for nlq, translated in zip(test_queries, translations):
         print(f"\n🔍 Natural Query: {nlq}")
         
-        translated = translator.translate_to_sparql(nlq, schema)
         print(f"📝 SPARQL: {translated.get('sparql', 'N/A')[:100]}...")
         print(f"💡 Explanation: {translated.get('explanation', 'N/A')}")
         
@@ -185,11 +210,16 @@ def run_all_tests():
     print(" "*15 + "NATURAL LANGUAGE QUERY SYSTEM TEST")
     print("="*70)
     
+    # One translator and one executor for every backend, so the Gemini
+    # client is configured once and its connection reused across all queries
+    translator = QueryTranslator(cache_dir=TRANSLATION_CACHE_DIR)
+    executor = QueryExecutor()
+    
     try:
-        test_mongodb_nlq()
-        test_neo4j_nlq()
-        test_redis_nlq()
-        test_rdf_nlq()
+        test_mongodb_nlq(translator, executor)
+        test_neo4j_nlq(translator, executor)
+        test_redis_nlq(translator, executor)
+        test_rdf_nlq(translator, executor)
         
         print("\n" + "="*70)
         print("✅ ALL NLQ TESTS COMPLETED")
@@ -199,6 +229,9 @@ def run_all_tests():
         print(f"\n✗ Test failed: {e}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        executor.close_all()
 
 if __name__ == "__main__":
     run_all_tests()
\ No newline at end of file
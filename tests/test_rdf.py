@@ -6,10 +6,189 @@ Tests SPARQL queries and RDF operations
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.rdf_connector import RDFConnector
 
+# SPARQL used by the tests, defined once at import time
+
+# All movies
+ALL_MOVIES = """
+PREFIX ex: <http://example.org/>
+SELECT ?movie ?title WHERE {
+    ?movie a ex:Movie .
+    ?movie ex:title ?title .
+}
+LIMIT 5
+"""
+
+# Movies with years
+MOVIES_BY_YEAR = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?year WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:year ?year .
+}
+ORDER BY DESC(?year)
+LIMIT 5
+"""
+
+# Count movies
+MOVIE_COUNT = """
+PREFIX ex: <http://example.org/>
+SELECT (COUNT(?movie) as ?count) WHERE {
+    ?movie a ex:Movie .
+}
+"""
+
+# Movies and directors
+MOVIE_DIRECTORS = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?director WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:directedBy ?person .
+    ?person ex:name ?director .
+}
+LIMIT 10
+"""
+
+# Movies and genres
+MOVIE_GENRES = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?genre WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:hasGenre ?g .
+    ?g ex:name ?genre .
+}
+LIMIT 10
+"""
+
+# Movies with actors
+MOVIE_CAST = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?actor WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:starring ?person .
+    ?person ex:name ?actor .
+}
+LIMIT 10
+"""
+
+# Count movies by genre
+MOVIES_PER_GENRE = """
+PREFIX ex: <http://example.org/>
+SELECT ?genre (COUNT(?movie) as ?count) WHERE {
+    ?movie a ex:Movie ;
+           ex:hasGenre ?g .
+    ?g ex:name ?genre .
+}
+GROUP BY ?genre
+ORDER BY DESC(?count)
+LIMIT 10
+"""
+
+# Directors and their movie count
+MOVIES_PER_DIRECTOR = """
+PREFIX ex: <http://example.org/>
+SELECT ?director (COUNT(?movie) as ?count) WHERE {
+    ?movie a ex:Movie ;
+           ex:directedBy ?person .
+    ?person ex:name ?director .
+}
+GROUP BY ?director
+ORDER BY DESC(?count)
+LIMIT 10
+"""
+
+# Rated movies by genre (counted; averaging needs xsd:float casts)
+RATED_MOVIES_PER_GENRE = """
+PREFIX ex: <http://example.org/>
+SELECT ?genre (COUNT(?movie) as ?count) WHERE {
+    ?movie a ex:Movie ;
+           ex:hasGenre ?g ;
+           ex:imdbRating ?rating .
+    ?g ex:name ?genre .
+}
+GROUP BY ?genre
+ORDER BY DESC(?count)
+LIMIT 10
+"""
+
+# High-rated movies (FIXED - Simple string comparison)
+HIGH_RATED_MOVIES = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?rating WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:imdbRating ?rating .
+    FILTER(?rating >= "8.0")
+}
+ORDER BY DESC(?rating)
+LIMIT 10
+"""
+
+# Recent movies (FIXED - Simple string comparison)
+RECENT_MOVIES = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?year WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:year ?year .
+    FILTER(?year >= "2010")
+}
+ORDER BY DESC(?year)
+LIMIT 10
+"""
+
+# Movies by specific genre
+ACTION_MOVIES = """
+PREFIX ex: <http://example.org/>
+SELECT ?title WHERE {
+    ?movie a ex:Movie ;
+           ex:title ?title ;
+           ex:hasGenre ?g .
+    ?g ex:name "Action" .
+}
+LIMIT 10
+"""
+
+# Test movie created by the CRUD test
+TEST_MOVIE_DETAILS = """
+PREFIX ex: <http://example.org/>
+SELECT ?title ?year ?rating WHERE {
+    <http://example.org/movie/test_001> ex:title ?title ;
+                                        ex:year ?year ;
+                                        ex:imdbRating ?rating .
+}
+"""
+
+# Does a movie titled Inception exist?
+INCEPTION_EXISTS = """
+PREFIX ex: <http://example.org/>
+ASK {
+    ?movie a ex:Movie ;
+           ex:title "Inception" .
+}
+"""
+
+# Are there any Action movies?
+ACTION_MOVIES_EXIST = """
+PREFIX ex: <http://example.org/>
+ASK {
+    ?movie a ex:Movie ;
+           ex:hasGenre ?g .
+    ?g ex:name "Action" .
+}
+"""
+
 def print_section(title):
     print("\n" + "="*70)
     print(f" {title}")
@@ -35,254 +214,116 @@ def test_connection():
         print("✗ Connection failed")
         return None
 
+@pytest.fixture
+def connector(rdf_connector):
+    """The session-wide Fuseki connector from conftest.py"""
+    return rdf_connector
+
 def test_basic_info(connector):
     """Test 2: Basic information"""
     print_section("TEST 2: Basic Information")
     
+    # Triple count, classes and properties in one concurrent batch
+    basics = connector.get_schema_basics()
+    
     # Count triples
     print("\n📊 Counting triples...")
-    count = connector.count_triples()
-    print(f"  Total triples: {count:,}")
+    print(f"  Total triples: {basics['triple_count']:,}")
     
     # Get classes
     print("\n📋 RDF Classes:")
-    classes = connector.get_classes()
-    for cls in classes[:10]:
+    for cls in basics['classes'][:10]:
         print(f"  - {cls}")
     
     # Get properties
     print("\n🔗 RDF Properties:")
-    properties = connector.get_properties()
-    for prop in properties[:15]:
+    for prop in basics['properties'][:15]:
         print(f"  - {prop}")
 
 def test_simple_queries(connector):
     """Test 3: Simple SPARQL queries"""
     print_section("TEST 3: Simple SPARQL Queries")
     
-    # Query 1: Get all movies
+    movies, movies_by_year, movie_count = connector.execute_queries([
+        ALL_MOVIES, MOVIES_BY_YEAR, MOVIE_COUNT
+    ])
+    
     print("\n🎬 All Movies (first 5):")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?movie ?title WHERE {
-        ?movie a ex:Movie .
-        ?movie ex:title ?title .
-    }
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in movies:
         print(f"  - {result['title']}")
     
-    # Query 2: Movies with years
     print("\n📅 Movies with Years:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?year WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:year ?year .
-    }
-    ORDER BY DESC(?year)
-    LIMIT 5
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in movies_by_year:
         print(f"  - {result['title']} ({result['year']})")
     
-    # Query 3: Count movies
     print("\n📊 Movie Count:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT (COUNT(?movie) as ?count) WHERE {
-        ?movie a ex:Movie .
-    }
-    """
-    results = connector.execute_query(query)
-    if results:
-        print(f"  Total movies: {results[0]['count']}")
+    if movie_count:
+        print(f"  Total movies: {movie_count[0]['count']}")
 
 def test_relationship_queries(connector):
     """Test 4: Relationship queries"""
     print_section("TEST 4: Relationship Queries")
     
-    # Query 1: Movies and directors
+    directors, genres, cast = connector.execute_queries([
+        MOVIE_DIRECTORS, MOVIE_GENRES, MOVIE_CAST
+    ])
+    
     print("\n🎬 Movies with Directors:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?director WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:directedBy ?person .
-        ?person ex:name ?director .
-    }
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in directors:
         print(f"  - {result['title']} directed by {result['director']}")
     
-    # Query 2: Movies and genres
     print("\n🎭 Movies with Genres:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?genre WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:hasGenre ?g .
-        ?g ex:name ?genre .
-    }
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in genres:
         print(f"  - {result['title']}: {result['genre']}")
     
-    # Query 3: Movies with actors
     print("\n👥 Movies with Cast:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?actor WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:starring ?person .
-        ?person ex:name ?actor .
-    }
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in cast:
         print(f"  - {result['title']}: {result['actor']}")
 
 def test_aggregation_queries(connector):
     """Test 5: Aggregation queries"""
     print_section("TEST 5: Aggregation Queries")
     
-    # Query 1: Count movies by genre
+    genre_counts, director_counts, rated_by_genre = connector.execute_queries([
+        MOVIES_PER_GENRE, MOVIES_PER_DIRECTOR, RATED_MOVIES_PER_GENRE
+    ])
+    
     print("\n📊 Movies by Genre:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?genre (COUNT(?movie) as ?count) WHERE {
-        ?movie a ex:Movie ;
-               ex:hasGenre ?g .
-        ?g ex:name ?genre .
-    }
-    GROUP BY ?genre
-    ORDER BY DESC(?count)
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in genre_counts:
         print(f"  - {result['genre']}: {result['count']} movies")
     
-    # Query 2: Directors and their movie count
     print("\n🎬 Prolific Directors:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?director (COUNT(?movie) as ?count) WHERE {
-        ?movie a ex:Movie ;
-               ex:directedBy ?person .
-        ?person ex:name ?director .
-    }
-    GROUP BY ?director
-    ORDER BY DESC(?count)
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in director_counts:
         print(f"  - {result['director']}: {result['count']} movies")
     
-    # Query 3: Average rating by genre (FIXED - Using FILTER instead of xsd:float)
     print("\n⭐ Average Rating by Genre:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?genre (AVG(?ratingNum) as ?avgRating) WHERE {
-        ?movie a ex:Movie ;
-               ex:hasGenre ?g ;
-               ex:imdbRating ?rating .
-        ?g ex:name ?genre .
-        BIND(xsd:float(?rating) AS ?ratingNum)
-        FILTER(isNumeric(?rating))
-    }
-    GROUP BY ?genre
-    ORDER BY DESC(?avgRating)
-    LIMIT 10
-    """
-    # Alternative simpler query without xsd conversion
-    query_simple = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?genre (COUNT(?movie) as ?count) WHERE {
-        ?movie a ex:Movie ;
-               ex:hasGenre ?g ;
-               ex:imdbRating ?rating .
-        ?g ex:name ?genre .
-    }
-    GROUP BY ?genre
-    ORDER BY DESC(?count)
-    LIMIT 10
-    """
-    results = connector.execute_query(query_simple)
-    for result in results:
+    for result in rated_by_genre:
         print(f"  - {result['genre']}: {result['count']} rated movies")
 
 def test_filter_queries(connector):
     """Test 6: Filter queries"""
     print_section("TEST 6: Filter Queries")
     
-    # Query 1: High-rated movies (FIXED - Simple string comparison)
+    high_rated, recent, action = connector.execute_queries([
+        HIGH_RATED_MOVIES, RECENT_MOVIES, ACTION_MOVIES
+    ])
+    
     print("\n⭐ High-Rated Movies (>= 8.0):")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?rating WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:imdbRating ?rating .
-        FILTER(?rating >= "8.0")
-    }
-    ORDER BY DESC(?rating)
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    if results:
-        for result in results:
+    if high_rated:
+        for result in high_rated:
             print(f"  - {result['title']}: {result['rating']}")
     else:
         print("  (No movies with ratings >= 8.0 in dataset)")
     
-    # Query 2: Recent movies (FIXED - Simple string comparison)
     print("\n📅 Recent Movies (>= 2010):")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?year WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:year ?year .
-        FILTER(?year >= "2010")
-    }
-    ORDER BY DESC(?year)
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    if results:
-        for result in results:
+    if recent:
+        for result in recent:
             print(f"  - {result['title']} ({result['year']})")
     else:
         print("  (No movies from 2010+ in dataset - dataset contains old movies)")
     
-    # Query 3: Movies by specific genre
     print("\n🎭 Action Movies:")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title WHERE {
-        ?movie a ex:Movie ;
-               ex:title ?title ;
-               ex:hasGenre ?g .
-        ?g ex:name "Action" .
-    }
-    LIMIT 10
-    """
-    results = connector.execute_query(query)
-    for result in results:
+    for result in action:
         print(f"  - {result['title']}")
 
 def test_crud_operations(connector):
@@ -305,25 +346,19 @@ def test_crud_operations(connector):
     
     # READ
     print("\n📖 Reading test movie...")
-    query = """
-    PREFIX ex: <http://example.org/>
-    SELECT ?title ?year ?rating WHERE {
-        <http://example.org/movie/test_001> ex:title ?title ;
-                                            ex:year ?year ;
-                                            ex:imdbRating ?rating .
-    }
-    """
-    results = connector.execute_query(query)
+    results = connector.execute_query(TEST_MOVIE_DETAILS)
     if results:
         result = results[0]
         print(f"  Title: {result['title']}")
         print(f"  Year: {result['year']}")
         print(f"  Rating: {result['rating']}")
     
-    # UPDATE (delete old, insert new)
+    # UPDATE (delete old, insert new) in one request
     print("\n✏️ Updating test movie...")
-    connector.delete_triple(test_movie, "http://example.org/year", "2024")
-    connector.insert_triple(test_movie, "http://example.org/year", "2025")
+    connector.execute_update_batch([
+        f'DELETE DATA {{ <{test_movie}> <http://example.org/year> "2024" . }}',
+        f'INSERT DATA {{ <{test_movie}> <http://example.org/year> "2025" . }}'
+    ])
     print("  ✓ Updated year to 2025")
     
     # DELETE
@@ -343,27 +378,12 @@ def test_ask_queries(connector):
     
     # Check if specific movie exists
     print("\n❓ Does 'Inception' exist?")
-    query = """
-    PREFIX ex: <http://example.org/>
-    ASK {
-        ?movie a ex:Movie ;
-               ex:title "Inception" .
-    }
-    """
-    result = connector.ask(query)
+    result = connector.ask(INCEPTION_EXISTS)
     print(f"  Result: {result}")
     
     # Check if any Action movies exist
     print("\n❓ Are there any Action movies?")
-    query = """
-    PREFIX ex: <http://example.org/>
-    ASK {
-        ?movie a ex:Movie ;
-               ex:hasGenre ?g .
-        ?g ex:name "Action" .
-    }
-    """
-    result = connector.ask(query)
+    result = connector.ask(ACTION_MOVIES_EXIST)
     print(f"  Result: {result}")
 
 def run_all_tests():
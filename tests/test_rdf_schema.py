@@ -1,9 +1,23 @@
 import sys, os
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.rdf_connector import RDFConnector
 from schema.rdf_schema_explorer import RDFSchemaExplorer
 
+def test_rdf_schema(rdf_connector):
+    """Schema analysis, summary and LLM context on a connected store"""
+    explorer = RDFSchemaExplorer(rdf_connector)
+    
+    print("\n📊 Analyzing schema...")
+    schema = explorer.get_graph_schema()
+    
+    print("\n" + explorer.generate_schema_summary(schema))
+    
+    print("\n🤖 LLM Context:")
+    print(explorer.generate_llm_context())
+
 def main():
     print("\n" + "="*60)
     print("RDF SCHEMA EXPLORER TEST")
@@ -14,15 +28,7 @@ def main():
         print("✗ Connection failed")
         return
     
-    explorer = RDFSchemaExplorer(conn)
-    
-    print("\n📊 Analyzing schema...")
-    schema = explorer.get_graph_schema()
-    
-    print("\n" + explorer.generate_schema_summary(schema))
-    
-    print("\n🤖 LLM Context:")
-    print(explorer.generate_llm_context())
+    test_rdf_schema(conn)
     
     conn.disconnect()
     print("\n✅ Complete!")
@@ -5,225 +5,282 @@ Tests connection and operations
 
 import sys
 import os
+import io
+import functools
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from operator import itemgetter
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.redis_connector import RedisConnector
 
-def print_section(title):
+def print_section(title, out=None):
     """Print formatted section header"""
-    print("\n" + "="*70)
-    print(f" {title}")
-    print("="*70)
+    print("\n" + "="*70, file=out)
+    print(f" {title}", file=out)
+    print("="*70, file=out)
 
-def test_connection():
+def buffered_output(test):
+    """Collect a test's printed report and write it to stdout in one call"""
+    @functools.wraps(test)
+    def wrapper(*args, out=None, **kwargs):
+        # A caller passing its own buffer takes care of writing it out
+        if out is not None:
+            return test(*args, out=out, **kwargs)
+        
+        buffer = io.StringIO()
+        try:
+            return test(*args, out=buffer, **kwargs)
+        finally:
+            sys.stdout.write(buffer.getvalue())
+    return wrapper
+
+@buffered_output
+def test_connection(out=None):
     """Test 1: Connection"""
-    print_section("TEST 1: Connection")
+    print_section("TEST 1: Connection", out)
     
     connector = RedisConnector()
     
     if connector.connect():
-        print("✓ Connection successful")
+        print("✓ Connection successful", file=out)
         
         info = connector.get_connection_info()
-        print(f"  Host: {info['host']}:{info['port']}")
-        print(f"  Database: {info['db']}")
-        print(f"  Redis Version: {info.get('redis_version', 'unknown')}")
-        print(f"  Connected: {info['connected']}")
+        print(f"  Host: {info['host']}:{info['port']}", file=out)
+        print(f"  Database: {info['db']}", file=out)
+        print(f"  Redis Version: {info.get('redis_version', 'unknown')}", file=out)
+        print(f"  Connected: {info['connected']}", file=out)
         
         return connector
     else:
-        print("✗ Connection failed")
+        print("✗ Connection failed", file=out)
         return None
 
-def test_database_info(connector):
+@pytest.fixture
+def connector(redis_connector):
+    """The session-wide Redis connector from conftest.py"""
+    return redis_connector
+
+@buffered_output
+def test_database_info(connector, out=None):
     """Test 2: Database information"""
-    print_section("TEST 2: Database Information")
+    print_section("TEST 2: Database Information", out)
     
     stats = connector.get_stats()
     
-    print(f"\n📊 Redis Statistics:")
-    print(f"  Redis Version: {stats.get('redis_version')}")
-    print(f"  Total Keys: {stats.get('total_keys'):,}")
-    print(f"  Memory Used: {stats.get('used_memory')}")
-    print(f"  Connected Clients: {stats.get('connected_clients')}")
-    print(f"  Commands Processed: {stats.get('total_commands_processed'):,}")
-    print(f"  Hit Rate: {stats.get('hit_rate')}")
+    print(f"\n📊 Redis Statistics:", file=out)
+    print(f"  Redis Version: {stats.get('redis_version')}", file=out)
+    print(f"  Total Keys: {stats.get('total_keys'):,}", file=out)
+    print(f"  Memory Used: {stats.get('used_memory')}", file=out)
+    print(f"  Connected Clients: {stats.get('connected_clients')}", file=out)
+    print(f"  Commands Processed: {stats.get('total_commands_processed'):,}", file=out)
+    print(f"  Hit Rate: {stats.get('hit_rate')}", file=out)
 
-def test_string_operations(connector):
+@buffered_output
+def test_string_operations(connector, out=None):
     """Test 3: String operations"""
-    print_section("TEST 3: String Operations")
-    
-    # SET
-    print("\n➕ Setting keys:")
-    connector.set('test:string', 'Hello Redis!')
-    connector.set('test:number', '42')
-    connector.set('test:temp', 'Expires soon', ex=60)
-    print("  ✓ Set 3 keys")
+    print_section("TEST 3: String Operations", out)
+    
+    # SET, all three in one round-trip
+    print("\n➕ Setting keys:", file=out)
+    pipe = connector.pipeline()
+    pipe.set('test:string', 'Hello Redis!')
+    pipe.set('test:number', '42')
+    pipe.set('test:temp', 'Expires soon', ex=60)
+    pipe.execute()
+    print("  ✓ Set 3 keys", file=out)
+    
+    # GET, EXISTS and TTL, read back in one round-trip
+    pipe = connector.pipeline()
+    pipe.get('test:string')
+    pipe.get('test:number')
+    pipe.exists('test:string', 'test:nonexistent')
+    pipe.ttl('test:temp')
+    val1, val2, exists, ttl = pipe.execute()
     
     # GET
-    print("\n📖 Getting keys:")
-    val1 = connector.get('test:string')
-    val2 = connector.get('test:number')
-    print(f"  test:string = {val1}")
-    print(f"  test:number = {val2}")
+    print("\n📖 Getting keys:", file=out)
+    print(f"  test:string = {val1}", file=out)
+    print(f"  test:number = {val2}", file=out)
     
     # EXISTS
-    print("\n🔍 Checking existence:")
-    exists = connector.exists('test:string', 'test:nonexistent')
-    print(f"  {exists} key(s) exist")
+    print("\n🔍 Checking existence:", file=out)
+    print(f"  {exists} key(s) exist", file=out)
     
     # TTL
-    print("\n⏱️ Checking TTL:")
-    ttl = connector.ttl('test:temp')
-    print(f"  test:temp expires in {ttl} seconds")
+    print("\n⏱️ Checking TTL:", file=out)
+    print(f"  test:temp expires in {ttl} seconds", file=out)
     
     # DELETE
-    print("\n🗑️ Deleting keys:")
+    print("\n🗑️ Deleting keys:", file=out)
     deleted = connector.delete('test:string', 'test:number', 'test:temp')
-    print(f"  ✓ Deleted {deleted} key(s)")
+    print(f"  ✓ Deleted {deleted} key(s)", file=out)
 
-def test_hash_operations(connector):
+@buffered_output
+def test_hash_operations(connector, out=None):
     """Test 4: Hash operations"""
-    print_section("TEST 4: Hash Operations")
+    print_section("TEST 4: Hash Operations", out)
     
-    # HSET
-    print("\n➕ Creating hash:")
-    connector.hset('user:1', mapping={
+    user = {
         'name': 'John Doe',
         'email': 'john@example.com',
         'age': '30',
         'city': 'Paris'
-    })
-    print("  ✓ Created user:1 hash")
+    }
+    
+    # HSET, HGET, HMGET, HEXISTS and DEL in one round-trip; HMGET fetches
+    # just the fields printed below instead of the whole hash
+    pipe = connector.pipeline()
+    pipe.hset('user:1', mapping=user)
+    pipe.hget('user:1', 'name')
+    pipe.hmget('user:1', list(user))
+    pipe.hexists('user:1', 'email')
+    pipe.delete('user:1')
+    _, name, values, exists, _ = pipe.execute()
+    
+    # HSET
+    print("\n➕ Creating hash:", file=out)
+    print("  ✓ Created user:1 hash", file=out)
     
     # HGET
-    print("\n📖 Getting hash field:")
-    name = connector.hget('user:1', 'name')
-    print(f"  name = {name}")
+    print("\n📖 Getting hash field:", file=out)
+    print(f"  name = {name}", file=out)
     
-    # HGETALL
-    print("\n📖 Getting entire hash:")
-    user = connector.hgetall('user:1')
-    for field, value in user.items():
-        print(f"  {field}: {value}")
+    # HMGET
+    print("\n📖 Getting hash fields:", file=out)
+    for field, value in zip(user, values):
+        print(f"  {field}: {value}", file=out)
     
     # HEXISTS
-    print("\n🔍 Checking field existence:")
-    exists = connector.hexists('user:1', 'email')
-    print(f"  email field exists: {exists}")
-    
-    # HDEL
-    print("\n🗑️ Deleting hash:")
-    connector.delete('user:1')
-    print("  ✓ Deleted user:1")
+    print("\n🔍 Checking field existence:", file=out)
+    print(f"  email field exists: {exists}", file=out)
+    
+    # DEL
+    print("\n🗑️ Deleting hash:", file=out)
+    print("  ✓ Deleted user:1", file=out)
 
-def test_list_operations(connector):
+@buffered_output
+def test_list_operations(connector, out=None):
     """Test 5: List operations"""
-    print_section("TEST 5: List Operations")
+    print_section("TEST 5: List Operations", out)
+    
+    # Every list command in one round-trip
+    pipe = connector.pipeline()
+    pipe.rpush('movies:recent', 'Inception', 'Interstellar', 'The Prestige')
+    pipe.lrange('movies:recent', 0, -1)
+    pipe.llen('movies:recent')
+    pipe.lpush('movies:recent', 'Tenet')
+    pipe.lrange('movies:recent', 0, -1)
+    pipe.rpop('movies:recent')
+    pipe.delete('movies:recent')
+    _, movies, length, _, movies_after_push, removed, _ = pipe.execute()
     
     # RPUSH
-    print("\n➕ Creating list:")
-    connector.rpush('movies:recent', 'Inception', 'Interstellar', 'The Prestige')
-    print("  ✓ Added 3 movies")
+    print("\n➕ Creating list:", file=out)
+    print("  ✓ Added 3 movies", file=out)
     
     # LRANGE
-    print("\n📖 Getting list:")
-    movies = connector.lrange('movies:recent', 0, -1)
-    print(f"  Movies: {', '.join(movies)}")
+    print("\n📖 Getting list:", file=out)
+    print(f"  Movies: {', '.join(movies)}", file=out)
     
     # LLEN
-    print("\n📏 List length:")
-    length = connector.llen('movies:recent')
-    print(f"  Length: {length}")
+    print("\n📏 List length:", file=out)
+    print(f"  Length: {length}", file=out)
     
     # LPUSH
-    print("\n➕ Adding to front:")
-    connector.lpush('movies:recent', 'Tenet')
-    movies = connector.lrange('movies:recent', 0, -1)
-    print(f"  Movies: {', '.join(movies)}")
+    print("\n➕ Adding to front:", file=out)
+    print(f"  Movies: {', '.join(movies_after_push)}", file=out)
     
     # RPOP
-    print("\n📤 Removing from end:")
-    removed = connector.rpop('movies:recent')
-    print(f"  Removed: {removed}")
-    
-    # Cleanup
-    connector.delete('movies:recent')
+    print("\n📤 Removing from end:", file=out)
+    print(f"  Removed: {removed}", file=out)
 
-def test_set_operations(connector):
+@buffered_output
+def test_set_operations(connector, out=None):
     """Test 6: Set operations"""
-    print_section("TEST 6: Set Operations")
+    print_section("TEST 6: Set Operations", out)
+    
+    # Every set command in one round-trip
+    pipe = connector.pipeline()
+    pipe.sadd('genres', 'Action', 'Drama', 'Comedy', 'Thriller')
+    pipe.smembers('genres')
+    pipe.sismember('genres', 'Action')
+    pipe.scard('genres')
+    pipe.srem('genres', 'Comedy')
+    pipe.smembers('genres')
+    pipe.delete('genres')
+    _, genres, is_member, size, _, remaining, _ = pipe.execute()
     
     # SADD
-    print("\n➕ Creating set:")
-    connector.sadd('genres', 'Action', 'Drama', 'Comedy', 'Thriller')
-    print("  ✓ Added 4 genres")
+    print("\n➕ Creating set:", file=out)
+    print("  ✓ Added 4 genres", file=out)
     
     # SMEMBERS
-    print("\n📖 Getting set members:")
-    genres = connector.smembers('genres')
-    print(f"  Genres: {', '.join(sorted(genres))}")
+    print("\n📖 Getting set members:", file=out)
+    print(f"  Genres: {', '.join(sorted(genres))}", file=out)
     
     # SISMEMBER
-    print("\n🔍 Checking membership:")
-    is_member = connector.sismember('genres', 'Action')
-    print(f"  'Action' in set: {is_member}")
+    print("\n🔍 Checking membership:", file=out)
+    print(f"  'Action' in set: {bool(is_member)}", file=out)
     
     # SCARD
-    print("\n📏 Set size:")
-    size = connector.scard('genres')
-    print(f"  Size: {size}")
+    print("\n📏 Set size:", file=out)
+    print(f"  Size: {size}", file=out)
     
     # SREM
-    print("\n➖ Removing member:")
-    connector.srem('genres', 'Comedy')
-    genres = connector.smembers('genres')
-    print(f"  Remaining: {', '.join(sorted(genres))}")
-    
-    # Cleanup
-    connector.delete('genres')
+    print("\n➖ Removing member:", file=out)
+    print(f"  Remaining: {', '.join(sorted(remaining))}", file=out)
 
-def test_sorted_set_operations(connector):
+@buffered_output
+def test_sorted_set_operations(connector, out=None):
     """Test 7: Sorted set operations"""
-    print_section("TEST 7: Sorted Set Operations")
+    print_section("TEST 7: Sorted Set Operations", out)
     
-    # ZADD
-    print("\n➕ Creating sorted set (movie ratings):")
-    connector.zadd('top_movies', {
+    # Every sorted set command in one round-trip
+    pipe = connector.pipeline()
+    pipe.zadd('top_movies', {
         'The Shawshank Redemption': 9.3,
         'The Godfather': 9.2,
         'The Dark Knight': 9.0,
         'Inception': 8.8,
         'Interstellar': 8.6
     })
-    print("  ✓ Added 5 movies with ratings")
+    pipe.zrevrange('top_movies', 0, 2, withscores=True)
+    pipe.zscore('top_movies', 'Inception')
+    pipe.zcard('top_movies')
+    pipe.delete('top_movies')
+    _, top_3, score, size, _ = pipe.execute()
+    
+    # ZADD
+    print("\n➕ Creating sorted set (movie ratings):", file=out)
+    print("  ✓ Added 5 movies with ratings", file=out)
     
     # ZREVRANGE (highest to lowest)
-    print("\n🏆 Top 3 movies:")
-    top_3 = connector.zrevrange('top_movies', 0, 2, withscores=True)
-    for i, (movie, score) in enumerate(top_3, 1):
-        print(f"  {i}. {movie}: {score}")
+    print("\n🏆 Top 3 movies:", file=out)
+    for i, (movie, score_value) in enumerate(top_3, 1):
+        print(f"  {i}. {movie}: {score_value}", file=out)
     
     # ZSCORE
-    print("\n⭐ Getting specific score:")
-    score = connector.zscore('top_movies', 'Inception')
-    print(f"  Inception rating: {score}")
+    print("\n⭐ Getting specific score:", file=out)
+    print(f"  Inception rating: {score}", file=out)
     
     # ZCARD
-    print("\n📏 Sorted set size:")
-    size = connector.zcard('top_movies')
-    print(f"  Total movies: {size}")
-    
-    # Cleanup
-    connector.delete('top_movies')
+    print("\n📏 Sorted set size:", file=out)
+    print(f"  Total movies: {size}", file=out)
 
-def test_json_operations(connector):
+@buffered_output
+def test_json_operations(connector, out=None):
     """Test 8: JSON operations"""
-    print_section("TEST 8: JSON Operations")
+    print_section("TEST 8: JSON Operations", out)
     
     # Store JSON
-    print("\n➕ Storing JSON object:")
+    print("\n➕ Storing JSON object:", file=out)
     movie = {
         'title': 'Inception',
         'year': 2010,
@@ -232,87 +289,93 @@ def test_json_operations(connector):
         'rating': 8.8
     }
     connector.set_json('movie:json:1', movie)
-    print("  ✓ Stored movie as JSON")
+    print("  ✓ Stored movie as JSON", file=out)
     
     # Retrieve JSON
-    print("\n📖 Retrieving JSON object:")
+    print("\n📖 Retrieving JSON object:", file=out)
     retrieved = connector.get_json('movie:json:1')
     if retrieved:
-        print(f"  Title: {retrieved['title']}")
-        print(f"  Year: {retrieved['year']}")
-        print(f"  Cast: {', '.join(retrieved['cast'])}")
+        print(f"  Title: {retrieved['title']}", file=out)
+        print(f"  Year: {retrieved['year']}", file=out)
+        print(f"  Cast: {', '.join(retrieved['cast'])}", file=out)
     
     # Cleanup
     connector.delete('movie:json:1')
 
-def test_movie_data(connector):
+@buffered_output
+def test_movie_data(connector, out=None):
     """Test 9: Query loaded movie data"""
-    print_section("TEST 9: Query Movie Data")
+    print_section("TEST 9: Query Movie Data", out)
     
     # Check if data is loaded
     total_movies = connector.get('stats:total_movies')
     
     if not total_movies:
-        print("\n⚠️  No movie data found!")
-        print("  Run: python data/load_redis_movies.py")
+        print("\n⚠️  No movie data found!", file=out)
+        print("  Run: python data/load_redis_movies.py", file=out)
         return
     
-    print(f"\n📊 Total movies in Redis: {total_movies}")
+    print(f"\n📊 Total movies in Redis: {total_movies}", file=out)
     
-    # Get a sample movie
-    print("\n🎬 Sample Movie:")
-    keys = connector.keys('movie:*')
-    if keys:
-        # Get first movie hash
-        movie_keys = [k for k in keys if ':' in k and k.count(':') == 1]
-        if movie_keys:
-            movie_data = connector.hgetall(movie_keys[0])
-            print(f"  Key: {movie_keys[0]}")
-            for field, value in list(movie_data.items())[:5]:
-                print(f"  {field}: {value}")
+    # Get a sample movie, scanning only until the first movie hash
+    print("\n🎬 Sample Movie:", file=out)
+    movie_key = next((k for k in connector.scan_iter('movie:*') if k.count(':') == 1), None)
+    if movie_key:
+        movie_data = connector.hgetall(movie_key)
+        print(f"  Key: {movie_key}", file=out)
+        for field, value in list(movie_data.items())[:5]:
+            print(f"  {field}: {value}", file=out)
     
     # Top rated movies
-    print("\n⭐ Top 5 Rated Movies:")
-    top_rated = connector.zrevrange('movies:by_rating', 0, 4, withscores=True)
-    for movie_id, rating in top_rated:
-        movie_key = f"movie:{movie_id}"
-        movie = connector.hgetall(movie_key)
-        title = movie.get('title', 'Unknown')
-        print(f"  - {title}: {rating}")
+    print("\n⭐ Top 5 Rated Movies:", file=out)
+    # Ids, ratings and titles come back from one server-side script call
+    for movie_id, rating, title in connector.top_rated_titles('movies:by_rating', 5):
+        print(f"  - {title or 'Unknown'}: {rating}", file=out)
     
     # Genre statistics
-    print("\n🎭 Genres:")
-    genre_keys = connector.keys('genre:*:movies')
-    genre_counts = []
-    for key in genre_keys[:5]:  # Show first 5
-        genre = key.split(':')[1]
-        count = connector.scard(key)
-        genre_counts.append((genre, count))
-    
-    for genre, count in sorted(genre_counts, key=lambda x: x[1], reverse=True):
-        print(f"  - {genre}: {count} movies")
+    print("\n🎭 Genres:", file=out)
+    genre_keys = list(islice(connector.scan_iter('genre:*:movies'), 5))  # Show first 5
+    pipe = connector.pipeline()
+    for key in genre_keys:
+        pipe.scard(key)
+    genre_counts = [(key.split(':')[1], count) for key, count in zip(genre_keys, pipe.execute())]
+    
+    for genre, count in sorted(genre_counts, key=itemgetter(1), reverse=True):
+        print(f"  - {genre}: {count} movies", file=out)
 
-def test_utility_operations(connector):
+@buffered_output
+def test_utility_operations(connector, out=None):
     """Test 10: Utility operations"""
-    print_section("TEST 10: Utility Operations")
+    print_section("TEST 10: Utility Operations", out)
     
-    # Get all keys
-    print("\n🔑 Key patterns:")
-    all_keys = connector.keys('*')
-    print(f"  Total keys: {len(all_keys)}")
+    # Count keys with DBSIZE and sample them with SCAN instead of KEYS *
+    print("\n🔑 Key patterns:", file=out)
+    total_keys = connector.dbsize()
+    print(f"  Total keys: {total_keys}", file=out)
     
     # Group by pattern
-    patterns = {}
-    for key in all_keys[:100]:  # Sample first 100
-        pattern = key.split(':')[0] if ':' in key else 'other'
-        patterns[pattern] = patterns.get(pattern, 0) + 1
+    patterns = Counter(
+        key.split(':', 1)[0] if ':' in key else 'other'
+        for key in islice(connector.scan_iter('*'), 100)  # Sample first 100
+    )
     
-    print("\n  Key types:")
-    for pattern, count in sorted(patterns.items(), key=lambda x: x[1], reverse=True)[:10]:
-        print(f"    {pattern}: {count}")
+    print("\n  Key types:", file=out)
+    for pattern, count in patterns.most_common(10):
+        print(f"    {pattern}: {count}", file=out)
     
     # Database size
-    print(f"\n📏 Database size: {connector.dbsize()} keys")
+    print(f"\n📏 Database size: {total_keys} keys", file=out)
+
+# Tests that each work on their own keys and can run side by side
+INDEPENDENT_TESTS = [
+    test_string_operations,
+    test_hash_operations,
+    test_list_operations,
+    test_set_operations,
+    test_sorted_set_operations,
+    test_json_operations,
+    test_movie_data,
+]
 
 def run_all_tests():
     """Run all tests"""
@@ -331,13 +394,20 @@ def run_all_tests():
     
     try:
         test_database_info(connector)
-        test_string_operations(connector)
-        test_hash_operations(connector)
-        test_list_operations(connector)
-        test_set_operations(connector)
-        test_sorted_set_operations(connector)
-        test_json_operations(connector)
-        test_movie_data(connector)
+        
+        # These tests touch disjoint keys, so run them concurrently over the
+        # client's connection pool; each writes its report to its own buffer,
+        # and the reports are printed in INDEPENDENT_TESTS order
+        buffers = [io.StringIO() for _ in INDEPENDENT_TESTS]
+        try:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                list(executor.map(lambda test, out: test(connector, out=out),
+                                  INDEPENDENT_TESTS, buffers))
+        finally:
+            for out in buffers:
+                sys.stdout.write(out.getvalue())
+        
+        # Key sampling and DBSIZE would otherwise see the other tests' keys
         test_utility_operations(connector)
         
         print("\n" + "="*70)
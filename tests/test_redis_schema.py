@@ -5,7 +5,11 @@ Test Redis Schema Explorer
 import sys
 import os
 
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pytest
+
+SRC_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src'))
+if SRC_DIR not in sys.path:
+    sys.path.append(SRC_DIR)
 
 from connectors.redis_connector import RedisConnector
 from schema.redis_schema_explorer import RedisSchemaExplorer
@@ -15,15 +19,15 @@ def print_section(title):
     print(f" {title}")
     print("="*70)
 
-def test_key_patterns():
+@pytest.fixture(scope="module")
+def explorer(redis_connector):
+    """One explorer over the session-wide Redis connector from conftest.py"""
+    return RedisSchemaExplorer(redis_connector)
+
+def test_key_patterns(explorer):
     """Test key pattern detection"""
     print_section("TEST 1: Key Pattern Detection")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     print("\n🔑 Detecting key patterns...")
     patterns = explorer.get_key_patterns(sample_size=500)
     
@@ -31,18 +35,11 @@ def test_key_patterns():
     for pattern, keys in list(patterns.items())[:10]:
         print(f"  {pattern}: {len(keys)} keys")
         print(f"    Examples: {keys[:3]}")
-    
-    connector.disconnect()
 
-def test_pattern_analysis():
+def test_pattern_analysis(explorer):
     """Test individual pattern analysis"""
     print_section("TEST 2: Pattern Analysis")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     # Get first pattern
     patterns = explorer.get_key_patterns(sample_size=500)
     if patterns:
@@ -64,18 +61,11 @@ def test_pattern_analysis():
                 print(f"  Fields: {', '.join(info['field_names'][:10])}")
             if info.get('sample_values'):
                 print(f"  Sample: {info['sample_values'][0]}")
-    
-    connector.disconnect()
 
-def test_database_schema():
+def test_database_schema(explorer):
     """Test complete database schema"""
     print_section("TEST 3: Complete Database Schema")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     print("\n📊 Analyzing entire database...")
     print("(This may take a minute...)")
     
@@ -91,51 +81,32 @@ def test_database_schema():
         print("\nMetadata:")
         for key, value in metadata.items():
             print(f"  {key}: {value}")
-    
-    connector.disconnect()
 
-def test_schema_summary():
+def test_schema_summary(explorer):
     """Test schema summary generation"""
     print_section("TEST 4: Schema Summary")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     print("\n📄 Generating schema summary...")
     schema = explorer.get_database_schema(sample_size=500)
-    summary = explorer.generate_schema_summary(schema)
-    
-    print("\n" + summary)
     
-    connector.disconnect()
+    print()
+    explorer.generate_schema_summary(schema, sink=sys.stdout)
 
-def test_llm_context():
+def test_llm_context(explorer):
     """Test LLM context generation"""
     print_section("TEST 5: LLM Context Generation")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     print("\n🤖 Generating LLM-optimized context...")
-    llm_context = explorer.generate_llm_context()
-    
-    print("\n" + llm_context)
-    
-    connector.disconnect()
+    # Same sample size as the schema tests, so the explorer's cached schema
+    # is reused instead of analyzing the database again
+    schema = explorer.get_database_schema(sample_size=500)
+    print()
+    explorer.generate_llm_context(sink=sys.stdout, schema=schema)
 
-def test_relationships():
+def test_relationships(explorer):
     """Test relationship inference"""
     print_section("TEST 6: Relationship Inference")
     
-    connector = RedisConnector()
-    connector.connect()
-    
-    explorer = RedisSchemaExplorer(connector)
-    
     print("\n🔗 Inferring relationships...")
     relationships = explorer.infer_relationships()
     
@@ -145,8 +116,6 @@ def test_relationships():
             print(f"  {rel['from_pattern']} -> {rel['to_pattern']}")
     else:
         print("\nNo relationships detected")
-    
-    connector.disconnect()
 
 def run_all_tests():
     """Run all tests"""
@@ -154,13 +123,22 @@ def run_all_tests():
     print(" "*15 + "REDIS SCHEMA EXPLORER TESTS")
     print("="*70)
     
+    # One connection and one explorer shared by every test, so the key
+    # pattern scan cached by the explorer is reused instead of repeated
+    connector = RedisConnector()
+    if not connector.connect():
+        print("\n✗ Connection failed. Cannot continue tests.")
+        return
+    
+    explorer = RedisSchemaExplorer(connector)
+    
     try:
-        test_key_patterns()
-        test_pattern_analysis()
-        test_database_schema()
-        test_schema_summary()
-        test_llm_context()
-        test_relationships()
+        test_key_patterns(explorer)
+        test_pattern_analysis(explorer)
+        test_database_schema(explorer)
+        test_schema_summary(explorer)
+        test_llm_context(explorer)
+        test_relationships(explorer)
         
         print("\n" + "="*70)
         print("✅ ALL TESTS COMPLETED")
@@ -170,6 +148,9 @@ def run_all_tests():
         print(f"\n✗ Test failed: {e}")
         import traceback
         traceback.print_exc()
+    
+    finally:
+        connector.disconnect()
 
 if __name__ == "__main__":
     run_all_tests()
\ No newline at end of file